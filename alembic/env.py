@@ -27,6 +27,8 @@ from app.models.base_model import base_model
 from app.models.bucket import Bucket
 from app.models.user import User
 from app.models.object import Object
+from app.models.multipart_upload import MultipartUpload, MultipartUploadPart
+from app.models.upload_session import UploadSession
 target_metadata = base_model.metadata
 
 def run_migrations_offline() -> None:
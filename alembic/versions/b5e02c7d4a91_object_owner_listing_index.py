@@ -0,0 +1,28 @@
+"""Add owner listing index on object
+
+Revision ID: b5e02c7d4a91
+Revises: d83c5e1a9f42
+Create Date: 2026-10-18 20:05:13.902871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e02c7d4a91'
+down_revision: Union[str, None] = 'd83c5e1a9f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # object_key уже в COLLATE "C", индекс наследует её: порядок совпадает с ORDER BY листинга
+    op.create_index('ix_object_owner_name_bucket_id_object_key', 'object',
+                    ['owner_name', 'bucket_id', 'object_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_object_owner_name_bucket_id_object_key', table_name='object')
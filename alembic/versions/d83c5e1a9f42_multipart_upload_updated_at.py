@@ -0,0 +1,31 @@
+"""Track last activity of multipart uploads
+
+Revision ID: d83c5e1a9f42
+Revises: f6b3d0a82c57
+Create Date: 2026-10-18 19:12:44.610327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83c5e1a9f42'
+down_revision: Union[str, None] = 'f6b3d0a82c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Для уже начатых загрузок последней активностью считается время создания.
+    op.add_column('multipart_upload', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE multipart_upload SET updated_at = created_at")
+    op.alter_column('multipart_upload', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index(op.f('ix_multipart_upload_updated_at'), 'multipart_upload', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_multipart_upload_updated_at'), table_name='multipart_upload')
+    op.drop_column('multipart_upload', 'updated_at')
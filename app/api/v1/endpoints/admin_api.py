@@ -0,0 +1,27 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+
+from ....core.loop_monitor import get_loop_stalls
+from ....core.slow_queries import clear_slow_queries, get_slow_queries
+from ....schemas.loop_monitor_schema import LoopStallResponse
+from ....schemas.slow_query_schema import SlowQueryResponse
+from ....schemas.user_schema import UserResponse
+from ....services.auth_service import get_current_admin
+
+admin_router = APIRouter()
+
+@admin_router.get("/slow-queries", response_model=List[SlowQueryResponse])
+async def list_slow_queries(current_admin: UserResponse = Depends(get_current_admin)):
+    """Slow statements captured by this worker process, newest first."""
+    return get_slow_queries()
+
+@admin_router.delete("/slow-queries")
+async def reset_slow_queries(current_admin: UserResponse = Depends(get_current_admin)):
+    clear_slow_queries()
+    return {"detail": "Slow query log cleared"}
+
+@admin_router.get("/loop-stalls", response_model=List[LoopStallResponse])
+async def list_loop_stalls(current_admin: UserResponse = Depends(get_current_admin)):
+    """Event loop stalls caught by this worker's blocking-call detector, newest first."""
+    return get_loop_stalls()
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 
-from ....core.security import create_access_token, verify_password, get_password_hash
+from ....core.security import create_access_token, verify_password_async, get_password_hash_async
 
 from ....schemas.user_schema import UserCreate, Token, UserResponse
 from ....repositories.user_repository import UserRepository, get_user_repository
@@ -15,7 +15,7 @@ async def register_user(user: UserCreate, user_repo: UserRepository = Depends(ge
     existing_user = await user_repo.get_user(user.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already taken")
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = await user_repo.create_user(user.username, user.email, hashed_password)
     access_token = create_access_token(data={"sub": new_user.username})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -23,7 +23,7 @@ async def register_user(user: UserCreate, user_repo: UserRepository = Depends(ge
 @auth_router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), user_repo: UserRepository = Depends(get_user_repository)):
     user = await user_repo.get_user(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
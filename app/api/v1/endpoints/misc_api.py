@@ -8,6 +8,8 @@ import psutil
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
+from app.services.health_service import get_health_snapshot
+
 misc_router = APIRouter()
 
 class DatabaseUnavailableError(Exception):
@@ -114,7 +116,24 @@ async def check_no_errors() -> None:
         logging.error(f"Errors found: {errors}")
         raise ErrorsPresentError("Errors found")
 
-@misc_router.get("/healthcheck")
+@misc_router.get("/livez")
+async def livez() -> JSONResponse:
+    """Liveness probe: the process is up and the event loop answers requests."""
+    return JSONResponse({"status": "OK"}, status_code=HTTPStatus.OK)
+
+@misc_router.get("/readyz")
+async def readyz() -> JSONResponse:
+    """
+    Readiness probe.
+
+    Returns the snapshot refreshed in the background by run_health_monitor
+    (database, storage root, event loop lag), so a probe performs no I/O.
+    """
+    snapshot = get_health_snapshot()
+    status_code = HTTPStatus.OK if snapshot["ready"] else HTTPStatus.SERVICE_UNAVAILABLE
+    return JSONResponse(snapshot, status_code=status_code)
+
+@misc_router.get("/healthcheck", deprecated=True)
 async def healthcheck() -> JSONResponse:
     # TODO healthcheck
     try:
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import pathlib
+import uuid
+from typing import List
+from urllib.parse import urljoin
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from loguru import logger
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from ....repositories.bucket_repository import BucketRepository, get_bucket_repository
+from ....repositories.multipart_upload_repository import MultipartUploadRepository, get_multipart_upload_repository
+from ....repositories.object_repository import ObjectRepository, get_object_repository
+from ....schemas.multipart_upload_schema import (MultipartUploadResponse, MultipartUploadPartResponse,
+                                                  CompleteMultipartUpload)
+from ....schemas.user_schema import UserResponse
+from ....services.auth_service import get_current_user
+from ....services.object_service import (save_request_stream, get_multipart_staging_dir, get_multipart_part_path,
+                                         get_multipart_receive_path)
+from ....storage import delete_legacy_copy, get_storage_backend, object_storage_key
+from ....storage.files import create_directory, move_file, remove_directory
+from .objects_api import ACCESS_KEY, SECRET_KEY, DEFAULT_EXPIRATION_MINUTES, generate_presigned_url
+
+multipart_upload_router = APIRouter()
+
+
+async def check_bucket_owner(bucket_name: str, bucket_repo: BucketRepository, current_user: UserResponse):
+    bucket = await bucket_repo.get_bucket_by_name(bucket_name)
+    if bucket is None or bucket.owner_name != current_user.username:
+        raise HTTPException(status_code=403, detail="You do not have permission to upload to this bucket")
+    return bucket
+
+
+async def get_upload_or_404(upload_id: str, bucket_name: str, object_key: str,
+                            multipart_repo: MultipartUploadRepository, current_user: UserResponse):
+    upload = await multipart_repo.get_upload(upload_id, bucket_name, object_key, current_user.username)
+    if upload is None:
+        raise HTTPException(status_code=404, detail=f"Multipart upload '{upload_id}' not found")
+    return upload
+
+
+@multipart_upload_router.post("/{bucket_name}/{object_key}/uploads", response_model=MultipartUploadResponse)
+async def initiate_multipart_upload(bucket_name: str, object_key: str,
+                                    current_user: UserResponse = Depends(get_current_user),
+                                    bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                                    multipart_repo: MultipartUploadRepository = Depends(get_multipart_upload_repository)):
+    bucket = await check_bucket_owner(bucket_name, bucket_repo, current_user)
+
+    _, extension_with_dot = os.path.splitext(object_key)
+    upload_id = uuid.uuid4().hex
+    await create_directory(get_multipart_staging_dir(upload_id))
+    return await multipart_repo.create_upload(upload_id, bucket.id, bucket_name, object_key,
+                                              current_user.id, current_user.username, extension_with_dot[1:])
+
+
+@multipart_upload_router.put("/{bucket_name}/{object_key}/uploads/{upload_id}/parts/{part_number}",
+                             response_model=MultipartUploadPartResponse)
+async def upload_part(bucket_name: str, object_key: str, upload_id: str, request: Request,
+                      part_number: int = Path(..., ge=1, le=10000),
+                      current_user: UserResponse = Depends(get_current_user),
+                      multipart_repo: MultipartUploadRepository = Depends(get_multipart_upload_repository)):
+    """
+    Загружает одну часть: тело запроса (application/octet-stream) пишется прямо в файл части.
+
+    Части независимы, поэтому клиент может слать их параллельно в нескольких соединениях;
+    повторная загрузка части с тем же номером заменяет предыдущую. ETag части — MD5 её
+    содержимого, как в S3: клиент может сверить его с тем, что отправил.
+    """
+    upload = await get_upload_or_404(upload_id, bucket_name, object_key, multipart_repo, current_user)
+    upload_pk = upload.id
+
+    # часть принимается в уникальный файл и переименовывается в имя с ETag, и только потом
+    # записывается в БД: при параллельной загрузке одной части ETag и файл в записи не разойдутся
+    received_path = get_multipart_receive_path(upload_id, part_number)
+    md5 = hashlib.md5(usedforsecurity=False)
+    size = await save_request_stream(request, received_path, hasher=md5)
+    etag = md5.hexdigest()
+    path = get_multipart_part_path(upload_id, part_number, etag)
+    await move_file(received_path, path)
+    await multipart_repo.save_part(upload_pk, part_number, etag, size, str(path))
+    return MultipartUploadPartResponse(part_number=part_number, etag=etag, size=size)
+
+
+@multipart_upload_router.get("/{bucket_name}/{object_key}/uploads/{upload_id}",
+                             response_model=List[MultipartUploadPartResponse])
+async def list_parts(bucket_name: str, object_key: str, upload_id: str,
+                     current_user: UserResponse = Depends(get_current_user),
+                     multipart_repo: MultipartUploadRepository = Depends(get_multipart_upload_repository)):
+    upload = await get_upload_or_404(upload_id, bucket_name, object_key, multipart_repo, current_user)
+    parts = await multipart_repo.get_parts(upload.id)
+    return [MultipartUploadPartResponse.model_validate(part) for part in parts]
+
+
+@multipart_upload_router.post("/{bucket_name}/{object_key}/uploads/{upload_id}/complete")
+async def complete_multipart_upload(bucket_name: str, object_key: str, upload_id: str,
+                                    body: CompleteMultipartUpload, request: Request,
+                                    current_user: UserResponse = Depends(get_current_user),
+                                    multipart_repo: MultipartUploadRepository = Depends(get_multipart_upload_repository),
+                                    object_repo: ObjectRepository = Depends(get_object_repository)):
+    upload = await get_upload_or_404(upload_id, bucket_name, object_key, multipart_repo, current_user)
+    upload_pk, extension, bucket_id = upload.id, upload.extension, upload.bucket_id
+    stored_parts = {part.part_number: (part.etag, part.file_storage_path)
+                    for part in await multipart_repo.get_parts(upload_pk)}
+
+    part_numbers = [part.part_number for part in body.parts]
+    if part_numbers != sorted(set(part_numbers)):
+        raise HTTPException(status_code=400, detail="Parts must be listed in ascending order without duplicates")
+    for part in body.parts:
+        if part.part_number not in stored_parts or stored_parts[part.part_number][0] != part.etag.strip('"'):
+            raise HTTPException(status_code=400, detail=f"Part {part.part_number} was not uploaded or its ETag does not match")
+
+    storage_key = object_storage_key(bucket_name, object_key)
+    size = await get_storage_backend().put_parts(
+        storage_key, [pathlib.Path(stored_parts[number][1]) for number in part_numbers])
+
+    url_ = urljoin(str(request.base_url), f"api/v1/presigned/{bucket_name}/{object_key}")
+    download_url = generate_presigned_url(url_, ACCESS_KEY, SECRET_KEY, "GET", bucket_name, object_key,
+                                          DEFAULT_EXPIRATION_MINUTES)
+    await object_repo.create_object(bucket_id, bucket_name, object_key, current_user.id, current_user.username,
+                                    extension, storage_key, download_url, size)
+    await delete_legacy_copy(bucket_name, object_key)
+    await multipart_repo.delete_upload(upload_pk)
+    await remove_directory(get_multipart_staging_dir(upload_id))
+
+    object_metadata = {
+        "Download-URL": download_url,
+        "Bucket-Name": bucket_name,
+        "Object-Key": object_key
+    }
+    logger.info(f"Multipart upload '{upload_id}' completed into '{object_key}' in bucket '{bucket_name}' ({size} bytes).")
+    return JSONResponse(content=object_metadata, status_code=200, headers=object_metadata)
+
+
+@multipart_upload_router.delete("/{bucket_name}/{object_key}/uploads/{upload_id}")
+async def abort_multipart_upload(bucket_name: str, object_key: str, upload_id: str,
+                                 current_user: UserResponse = Depends(get_current_user),
+                                 multipart_repo: MultipartUploadRepository = Depends(get_multipart_upload_repository)):
+    upload = await get_upload_or_404(upload_id, bucket_name, object_key, multipart_repo, current_user)
+    await multipart_repo.delete_upload(upload.id)
+    await remove_directory(get_multipart_staging_dir(upload_id))
+    return {"detail": f"Multipart upload '{upload_id}' aborted."}
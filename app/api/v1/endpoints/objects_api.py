@@ -1,29 +1,34 @@
 import base64
 import hashlib
 import hmac
+import json
 import os.path
-import pathlib
 import re
 from datetime import datetime, timedelta
-from typing import List
+from typing import AsyncIterator, List, Literal, Optional, Sequence
 from urllib.parse import urlencode, urljoin, parse_qs, urlparse
 
 from loguru import logger
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.datastructures import UploadFile
 from starlette.requests import Request
-from starlette.responses import FileResponse, Response, JSONResponse
+from starlette.responses import Response, JSONResponse, StreamingResponse
 
 
 from ....core.config import settings
 from ....repositories.bucket_repository import BucketRepository, get_bucket_repository
-from ....repositories.object_repository import get_object_repository, ObjectRepository
-from ....schemas.object_schema import ObjectResponse
+from ....repositories.object_repository import get_object_repository, ObjectRepository, ListMarker, stream_object_rows
+from ....schemas.object_schema import ObjectResponse, ListObjectsResponse
 from ....schemas.user_schema import UserResponse
 from ....services.auth_service import get_current_user
+from ....storage import ObjectStat, delete_legacy_copy, get_storage_backend, object_storage_key
 
 ACCESS_KEY = settings.presigned_url.access_key
 SECRET_KEY = settings.presigned_url.secret_key
 DEFAULT_EXPIRATION_MINUTES = settings.presigned_url.expiration_minutes
+MAX_KEYS = 1000
+STREAM_BATCH_SIZE = 1000
+StreamFormat = Literal["ndjson", "json"]
 
 def generate_signature(secret_key, method, path, expires, headers=None):
     """Генерирует подпись для предподписанного URL."""
@@ -61,21 +66,31 @@ def generate_presigned_url(base_url, access_key, secret_key, method, bucket_name
 
 object_router = APIRouter()
 
-root_dir = settings.fileStorage.root_dir
+async def locate_object(bucket_id: int, object_key: str,
+                        object_repo: ObjectRepository) -> Optional[tuple[str, ObjectStat]]:
+    """
+    Ключ в хранилище и stat содержимого объекта или None, если его нет.
 
-
-def create_dirs(path):
-    dir_path = pathlib.Path(path).expanduser().parent
-    if not dir_path.exists():
-        # Создайте все директории в пути
-        dir_path.mkdir(parents=True)
+    Ключ берётся из Object.file_storage_path, а не вычисляется по имени: так читаются и объекты,
+    сохранённые до появления хранилищ (там абсолютный путь), а промах стоит одного stat.
+    """
+    storage_key = await object_repo.get_storage_path(bucket_id, object_key)
+    if storage_key is None:
+        return None
+    stat_result = await get_storage_backend().stat(storage_key)
+    if stat_result is None:
+        logger.warning(f"Object '{object_key}' has a database record but no content at '{storage_key}'")
+        return None
+    return storage_key, stat_result
 
 
 # Эндпойнт для доступа по предподписанному URL
 
 @object_router.get("/presigned/{bucket_name}/{object_key}")
 async def download_object_presigned(bucket_name: str, object_key: str, request: Request,
-                                    access_key_id:str, expires:str, signature_version:str, signature_method:str, signature:str):
+                                    access_key_id:str, expires:str, signature_version:str, signature_method:str, signature:str,
+                                    bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                                    object_repo: ObjectRepository = Depends(get_object_repository)):
 
     """Обрабатывает запросы по предподписанному URL."""
     # query_params = parse_qs(urlparse(str(request.url)).query)
@@ -109,15 +124,15 @@ async def download_object_presigned(bucket_name: str, object_key: str, request:
     if calculated_signature_b64 != signature:
         raise HTTPException(status_code=403, detail="Invalid signature")
 
-    path = pathlib.Path(os.path.join(root_dir,bucket_name, object_key)).expanduser()
-    if not os.path.exists(path) or not os.path.isfile(path):
+    bucket = await bucket_repo.get_bucket_by_name(bucket_name)
+    located = await locate_object(bucket.id, object_key, object_repo) if bucket is not None else None
+    if located is None:
         raise HTTPException(status_code=404, detail=f"Object '{object_key}' in bucket '{bucket_name}' not found")
-    return FileResponse(path)
+    return get_storage_backend().response(*located)
 
 @object_router.put("/{bucket_name}/{object_key}")
 async def upload_object (bucket_name: str,
                          object_key: str,
-                         file: UploadFile = File(...),
                          current_user: UserResponse = Depends(get_current_user),
                          bucket_repo: BucketRepository = Depends(get_bucket_repository),
                          object_repo: ObjectRepository = Depends(get_object_repository),
@@ -129,13 +144,27 @@ async def upload_object (bucket_name: str,
     if bucket is None or bucket.owner_name != current_user.username:
         raise HTTPException(status_code=403, detail="You do not have permission to upload to this bucket")
 
-    full_uploaded_filename_with_extension = file.filename
+    # Браузерные формы присылают multipart/form-data, остальные клиенты могут слать
+    # тело как есть (application/octet-stream) — тогда оно пишется на диск напрямую из сокета.
+    # Форму разбираем сами и только для multipart: иначе FastAPI прочитал бы тело раньше обработчика
+    media_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    if media_type == "application/x-www-form-urlencoded":
+        raise HTTPException(status_code=415, detail="Send the object as multipart/form-data or as a raw request body")
+
+    storage = get_storage_backend()
+    storage_key = object_storage_key(bucket_name, object_key)
+    if media_type == "multipart/form-data":
+        async with request.form() as form:
+            file = form.get("file")
+            if not isinstance(file, UploadFile):
+                raise HTTPException(status_code=400, detail="Multipart upload must contain a 'file' field")
+            full_uploaded_filename_with_extension = file.filename or object_key
+            size = await storage.put_upload(storage_key, file)
+    else:
+        full_uploaded_filename_with_extension = object_key
+        size = await storage.put(storage_key, request.stream())
     base_name, extension_with_dot = os.path.splitext(full_uploaded_filename_with_extension)
     extension_without_dot = extension_with_dot[1:] if extension_with_dot else ""
-    path = pathlib.Path(os.path.join(root_dir, bucket_name, object_key)).expanduser()
-    create_dirs(path)
-    with open(path, "wb") as f:
-        f.write(await file.read())
 
     host = str(request.base_url)
     url_ = urljoin(host, f"api/v1/presigned/{bucket_name}/{object_key}")
@@ -150,8 +179,9 @@ async def upload_object (bucket_name: str,
             object_key,
             DEFAULT_EXPIRATION_MINUTES
         )
-    size = os.path.getsize(path)
-    await object_repo.create_object(bucket_name, object_key, current_user.username, extension_without_dot, str(path), Temporary_download_URL, size)
+    await object_repo.create_object(bucket.id, bucket_name, object_key, current_user.id, current_user.username,
+                                    extension_without_dot, storage_key, Temporary_download_URL, size)
+    await delete_legacy_copy(bucket_name, object_key)
 
 
    #Temporary_download_URL = f"{request.base_url}api/v1/{bucket_name}/{object_key}"
@@ -161,7 +191,7 @@ async def upload_object (bucket_name: str,
         "Bucket-Name": bucket_name,
         "Object-Key": object_key
     }
-    logger.info(f"Object '{object_key}' in bucket '{bucket_name}' uploaded successfully. Path to uploaded file: {path}")
+    logger.info("Object '{}' in bucket '{}' uploaded successfully. Storage key: {}", object_key, bucket_name, storage_key)
     return JSONResponse(content=object_metadata, status_code=200, headers=object_metadata)
 
 
@@ -169,7 +199,8 @@ async def upload_object (bucket_name: str,
 async def download_object (bucket_name: str,
                            object_key: str,
                            current_user: UserResponse = Depends(get_current_user),
-                           bucket_repo: BucketRepository = Depends(get_bucket_repository)
+                           bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                           object_repo: ObjectRepository = Depends(get_object_repository)
                            ):
     # check if bucket is owned by current user
     bucket = await bucket_repo.get_bucket_by_name(bucket_name)
@@ -177,16 +208,18 @@ async def download_object (bucket_name: str,
     if bucket is None or bucket.owner_name != current_user.username:
         raise HTTPException(status_code=403, detail="You do not have permission to download from this bucket")
 
-    path = pathlib.Path(os.path.join(root_dir,bucket_name, object_key)).expanduser()
-    if not os.path.exists(path) or not os.path.isfile(path):
+    located = await locate_object(bucket.id, object_key, object_repo)
+    if located is None:
         raise HTTPException(status_code=404, detail=f"Object '{object_key}' in bucket '{bucket_name}' not found")
-    return FileResponse(path)
+    return get_storage_backend().response(*located)
 
 @object_router.head("/{bucket_name}/{object_key}/metadata", response_description="Get metadata for a specific object")
 async def get_object_metadata(bucket_name: str, object_key: str, response: Response,
-                              current_user: UserResponse = Depends(get_current_user)):
+                              current_user: UserResponse = Depends(get_current_user),
+                              bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                              object_repo: ObjectRepository = Depends(get_object_repository)):
     # Вызываем общую функцию и добавляем метаданные в заголовки
-    metadata = await get_obj_metadata(bucket_name, object_key)
+    metadata = await get_obj_metadata(bucket_name, object_key, bucket_repo, object_repo)
 
     # Добавляем метаданные в заголовки ответа
     response.headers["X-File-Name"] = metadata["name"]
@@ -196,50 +229,120 @@ async def get_object_metadata(bucket_name: str, object_key: str, response: Respo
 
     return None
 
-@object_router.get("/{bucket_name}", response_description="Get metadata for all objects in a bucket")
+@object_router.get("/{bucket_name}", response_description="Get metadata for objects in a bucket, page by page")
 async def get_objects_metadata(bucket_name: str,
-                                current_user: UserResponse = Depends(get_current_user),
-                                bucket_repo: BucketRepository = Depends(get_bucket_repository),
-                                object_repo: ObjectRepository = Depends(get_object_repository)
-                               ) -> List[ObjectResponse]:
+                               prefix: str = "",
+                               delimiter: Optional[str] = None,
+                               max_keys: int = Query(MAX_KEYS, alias="max-keys", ge=1, le=MAX_KEYS),
+                               continuation_token: Optional[str] = Query(None, alias="continuation-token"),
+                               stream: Optional[StreamFormat] = Query(
+                                   None, description="Stream the whole listing as NDJSON or a JSON array"
+                               ),
+                               current_user: UserResponse = Depends(get_current_user),
+                               bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                               object_repo: ObjectRepository = Depends(get_object_repository)
+                               ) -> ListObjectsResponse:
+    # Получить информацию о бакете
+    bucket = await bucket_repo.get_bucket_by_name(bucket_name)
+    # Проверить, принадлежит ли бакет текущему пользователю
+    if bucket is None or bucket.owner_name != current_user.username:
+        raise HTTPException(status_code=403, detail="You do not have permission to access this bucket")
+    if stream:
+        return stream_objects_response(current_user.username, bucket.id, prefix, delimiter, continuation_token, stream)
     try:
-        # Получить информацию о бакете
-        bucket = await bucket_repo.get_bucket_by_name(bucket_name)
-        # Проверить, принадлежит ли бакет текущему пользователю
-        if bucket is None or bucket.owner_name != current_user.username:
-            raise HTTPException(status_code=403, detail="You do not have permission to access this bucket")
-        bucket_path = pathlib.Path(os.path.join(root_dir, bucket_name)).expanduser()
-        objects =  await object_repo.get_all_objects(bucket_name, current_user.username)
-        return objects
+        return await list_objects_page(object_repo, current_user.username, bucket_name, bucket.id,
+                                       prefix, delimiter, max_keys, continuation_token)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading files in bucket '{bucket_name}': {e}")
 
-# Helper function to get file metadata
-def get_file_metadata(file_path: pathlib.Path) -> dict:
+async def list_objects_page(object_repo: ObjectRepository, username: str, bucket_name: Optional[str],
+                            bucket_id: Optional[int], prefix: str, delimiter: Optional[str], max_keys: int,
+                            continuation_token: Optional[str]) -> ListObjectsResponse:
+    """Собирает страницу ListObjectsV2 из continuation token и результата репозитория."""
     try:
-        return {
-            "name": file_path.name,
-            "size_KB": (file_path.stat().st_size // 1024) if file_path.stat().st_size > 1024 else file_path.stat().st_size,
-            "created": datetime.fromtimestamp(file_path.stat().st_ctime).isoformat(),
-            "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting metadata for {file_path.name}: {e}")
+        marker = ListMarker.from_token(continuation_token) if continuation_token else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid continuation token")
+    contents, common_prefixes, next_marker = await object_repo.list_objects(
+        username, bucket_id=bucket_id, prefix=prefix, delimiter=delimiter, max_keys=max_keys, marker=marker
+    )
+    return ListObjectsResponse(
+        name=bucket_name,
+        prefix=prefix,
+        delimiter=delimiter,
+        max_keys=max_keys,
+        key_count=len(contents) + len(common_prefixes),
+        is_truncated=next_marker is not None,
+        contents=contents,
+        common_prefixes=common_prefixes,
+        continuation_token=continuation_token,
+        next_continuation_token=next_marker.to_token() if next_marker else None,
+    )
+
+def stream_objects_response(username: str, bucket_id: Optional[int], prefix: str, delimiter: Optional[str],
+                            continuation_token: Optional[str], stream_format: StreamFormat) -> StreamingResponse:
+    """
+    Отдаёт весь листинг потоком, читая строки серверным курсором.
+
+    Память не зависит от числа объектов; постраничные параметры в этом режиме не поддерживаются.
+    """
+    if delimiter or continuation_token:
+        raise HTTPException(status_code=400,
+                            detail="delimiter and continuation-token are not supported in streaming mode")
+    partitions = stream_object_rows(username, bucket_id=bucket_id, prefix=prefix, batch_size=STREAM_BATCH_SIZE)
+    if stream_format == "ndjson":
+        return StreamingResponse(ndjson_chunks(partitions), media_type="application/x-ndjson")
+    return StreamingResponse(json_array_chunks(partitions), media_type="application/json")
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _dump_row(row) -> str:
+    return json.dumps(dict(row), default=_json_default, ensure_ascii=False)
+
+async def ndjson_chunks(partitions: AsyncIterator[Sequence]) -> AsyncIterator[str]:
+    """Одна строка JSON на объект, один чанк на пачку курсора."""
+    async for rows in partitions:
+        yield "".join(_dump_row(row) + "\n" for row in rows)
+
+async def json_array_chunks(partitions: AsyncIterator[Sequence]) -> AsyncIterator[str]:
+    """JSON-массив по частям: открывающая скобка уходит сразу, затем по чанку на пачку курсора."""
+    yield "["
+    separator = ""
+    async for rows in partitions:
+        yield separator + ",".join(_dump_row(row) for row in rows)
+        separator = ","
+    yield "]"
 
-async def get_obj_metadata(bucket_name: str, object_key: str) -> dict:
-    # Логирование пути к объекту
-    object_path = pathlib.Path(os.path.join(root_dir, bucket_name, object_key)).expanduser()
-    logger.info(f"Fetching metadata for: {object_path}")
+# Helper function to get file metadata
+def get_file_metadata(name: str, stat_result: ObjectStat) -> dict:
+    return {
+        "name": name,
+        "size_KB": (stat_result.st_size // 1024) if stat_result.st_size > 1024 else stat_result.st_size,
+        "created": datetime.fromtimestamp(stat_result.st_ctime).isoformat(),
+        "modified": datetime.fromtimestamp(stat_result.st_mtime).isoformat()
+    }
+
+async def get_obj_metadata(bucket_name: str, object_key: str,
+                           bucket_repo: BucketRepository, object_repo: ObjectRepository) -> dict:
+    logger.info("Fetching metadata for: {}/{}", bucket_name, object_key)
 
-    if not os.path.exists(object_path) or not os.path.isfile(object_path):
+    # один stat в хранилище вместо exists/isfile и четырёх stat() в event loop
+    bucket = await bucket_repo.get_bucket_by_name(bucket_name)
+    located = await locate_object(bucket.id, object_key, object_repo) if bucket is not None else None
+    if located is None:
         logger.warning(f"Object '{object_key}' in bucket '{bucket_name}' not found")
         raise HTTPException(status_code=404, detail=f"Object '{object_key}' in bucket '{bucket_name}' not found")
 
     # Получение метаданных
-    metadata = get_file_metadata(pathlib.Path(object_path))
+    metadata = get_file_metadata(object_key, located[1])
 
     # Логирование метаданных
-    logger.info(f"Metadata: {metadata}")
+    logger.info("Metadata: {}", metadata)
 
     return metadata
 
@@ -251,21 +354,20 @@ async def delete_object(bucket_name: str, object_key: str,
     if re.search(r'[<>:"/\\|?*]', bucket_name) or re.search(r'[<>:"/\\|?*]', object_key):
         raise HTTPException(status_code=400, detail="Invalid characters in bucket name or object key")
 
-    path_file_to_delete = pathlib.Path(os.path.join(root_dir, bucket_name, object_key)).expanduser()
-
     try:
         object_record = await object_repo.read_object(bucket_name, object_key, current_user.username)
         if not object_record:
             raise HTTPException(status_code=404, detail=f"Object '{object_key}' in bucket '{bucket_name}' not found in database.")
+        # ключ в хранилище (или путь объекта, сохранённого до появления хранилищ); читается до коммита удаления
+        storage_key = object_record.file_storage_path
 
         deleted = await object_repo.delete_object(bucket_name, object_key, current_user.username)
         if not deleted:
             raise HTTPException(status_code=500, detail=f"Failed to delete object '{object_key}' in bucket '{bucket_name}' from database.")
 
-        logger.info(f"Object '{object_key}' in bucket '{bucket_name}' deleted from database.")
+        logger.info("Object '{}' in bucket '{}' deleted from database.", object_key, bucket_name)
 
-        if os.path.exists(path_file_to_delete) and os.path.isfile(path_file_to_delete):
-            os.remove(path_file_to_delete)
+        await get_storage_backend().delete(storage_key)
 
         return {"detail": f"Object '{object_key}' in bucket '{bucket_name}' deleted successfully."}
 
@@ -0,0 +1,175 @@
+import os
+import pathlib
+import uuid
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+from fastapi import APIRouter, Depends, HTTPException, Header
+from loguru import logger
+from starlette.requests import Request
+from starlette.responses import Response, JSONResponse
+
+from ....core.config import settings
+from ....exceptions.upload_error import UploadConflictError, UploadLengthExceededError, UploadNotFoundError
+from ....repositories.bucket_repository import BucketRepository, get_bucket_repository
+from ....repositories.object_repository import ObjectRepository, get_object_repository
+from ....repositories.upload_session_repository import UploadSessionRepository, get_upload_session_repository
+from ....schemas.user_schema import UserResponse
+from ....services.auth_service import get_current_user
+from ....services.object_service import (append_request_stream, create_empty_file, get_resumable_upload_path,
+                                         lock_upload_file)
+from ....storage import delete_legacy_copy, get_storage_backend, object_storage_key
+from ....storage.files import remove_file
+from .objects_api import ACCESS_KEY, SECRET_KEY, DEFAULT_EXPIRATION_MINUTES, generate_presigned_url
+
+TUS_VERSION = "1.0.0"
+SESSION_TTL = timedelta(minutes=settings.fileStorage.upload_session_ttl_minutes)
+PATCH_CONTENT_TYPES = ("application/offset+octet-stream", "application/octet-stream")
+
+resumable_upload_router = APIRouter()
+
+
+def session_headers(upload_offset: int, upload_length: int, expires_at: datetime) -> dict:
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(upload_offset),
+        "Upload-Length": str(upload_length),
+        "Upload-Expires": format_datetime(expires_at.astimezone(), usegmt=True),
+        "Cache-Control": "no-store",
+    }
+
+
+async def get_active_session(session_id: str, bucket_name: str, object_key: str,
+                             session_repo: UploadSessionRepository, current_user: UserResponse):
+    upload_session = await session_repo.get_session(session_id, bucket_name, object_key, current_user.username)
+    if upload_session is None:
+        raise HTTPException(status_code=404, detail=f"Upload session '{session_id}' not found")
+    if upload_session.expires_at < datetime.now():
+        raise HTTPException(status_code=HTTPStatus.GONE, detail=f"Upload session '{session_id}' has expired")
+    return upload_session
+
+
+@resumable_upload_router.post("/{bucket_name}/{object_key}/resumable", status_code=201)
+async def create_upload_session(bucket_name: str, object_key: str, request: Request,
+                                upload_length: int = Header(..., ge=0),
+                                current_user: UserResponse = Depends(get_current_user),
+                                bucket_repo: BucketRepository = Depends(get_bucket_repository),
+                                session_repo: UploadSessionRepository = Depends(get_upload_session_repository)):
+    """Открывает сессию возобновляемой загрузки (tus creation): размер объекта передаётся в Upload-Length."""
+    bucket = await bucket_repo.get_bucket_by_name(bucket_name)
+    if bucket is None or bucket.owner_name != current_user.username:
+        raise HTTPException(status_code=403, detail="You do not have permission to upload to this bucket")
+
+    session_id = uuid.uuid4().hex
+    path = get_resumable_upload_path(session_id)
+    await create_empty_file(path)
+    _, extension_with_dot = os.path.splitext(object_key)
+    upload_session = await session_repo.create_session(session_id, bucket.id, bucket_name, object_key,
+                                                       current_user.id, current_user.username, extension_with_dot[1:],
+                                                       upload_length, str(path), datetime.now() + SESSION_TTL)
+
+    location = urljoin(str(request.base_url), f"api/v1/{bucket_name}/{object_key}/resumable/{session_id}")
+    headers = session_headers(0, upload_length, upload_session.expires_at)
+    headers["Location"] = location
+    return JSONResponse(content=upload_session.model_dump(mode="json"), status_code=201, headers=headers)
+
+
+@resumable_upload_router.head("/{bucket_name}/{object_key}/resumable/{session_id}")
+async def get_upload_offset(bucket_name: str, object_key: str, session_id: str,
+                            current_user: UserResponse = Depends(get_current_user),
+                            session_repo: UploadSessionRepository = Depends(get_upload_session_repository)):
+    """Возвращает подтверждённое сервером смещение, с которого клиент должен продолжить загрузку."""
+    upload_session = await get_active_session(session_id, bucket_name, object_key, session_repo, current_user)
+    return Response(status_code=200, headers=session_headers(upload_session.upload_offset,
+                                                             upload_session.upload_length,
+                                                             upload_session.expires_at))
+
+
+@resumable_upload_router.patch("/{bucket_name}/{object_key}/resumable/{session_id}")
+async def append_upload(bucket_name: str, object_key: str, session_id: str, request: Request,
+                        upload_offset: int = Header(..., ge=0),
+                        current_user: UserResponse = Depends(get_current_user),
+                        session_repo: UploadSessionRepository = Depends(get_upload_session_repository),
+                        object_repo: ObjectRepository = Depends(get_object_repository)):
+    """
+    Дописывает тело запроса к загрузке начиная с Upload-Offset.
+
+    Смещение должно совпадать с подтверждённым сервером, иначе 409 — клиент должен
+    сначала спросить его через HEAD. Когда получены все Upload-Length байт, файл
+    переносится на место объекта и сессия закрывается.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in PATCH_CONTENT_TYPES:
+        raise HTTPException(status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Content-Type must be one of {', '.join(PATCH_CONTENT_TYPES)}")
+
+    upload_session = await get_active_session(session_id, bucket_name, object_key, session_repo, current_user)
+    partial_path = pathlib.Path(upload_session.file_storage_path)
+    try:
+        async with lock_upload_file(partial_path):
+            return await append_locked_upload(bucket_name, object_key, session_id, request, upload_offset,
+                                              current_user, session_repo, object_repo)
+    except UploadNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Upload session '{session_id}' not found")
+    except UploadConflictError as e:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=str(e))
+
+
+async def append_locked_upload(bucket_name: str, object_key: str, session_id: str, request: Request,
+                               upload_offset: int, current_user: UserResponse,
+                               session_repo: UploadSessionRepository, object_repo: ObjectRepository) -> Response:
+    # сессия перечитывается под блокировкой: смещение мог сдвинуть только что завершившийся запрос
+    upload_session = await get_active_session(session_id, bucket_name, object_key, session_repo, current_user)
+    session_pk = upload_session.id
+    upload_length, extension = upload_session.upload_length, upload_session.extension
+    bucket_id = upload_session.bucket_id
+    partial_path = pathlib.Path(upload_session.file_storage_path)
+    if upload_offset != upload_session.upload_offset:
+        raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                            detail=f"Upload-Offset {upload_offset} does not match the committed offset "
+                                   f"{upload_session.upload_offset}")
+
+    try:
+        written, completed = await append_request_stream(request, partial_path, upload_offset,
+                                                         upload_length - upload_offset)
+    except UploadLengthExceededError as e:
+        raise HTTPException(status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    new_offset = upload_offset + written
+    expires_at = datetime.now() + SESSION_TTL
+    if not await session_repo.update_offset(session_pk, upload_offset, new_offset, expires_at):
+        raise HTTPException(status_code=HTTPStatus.CONFLICT,
+                            detail=f"Upload-Offset {upload_offset} was already committed by another request")
+    if new_offset == upload_length:
+        storage_key = object_storage_key(bucket_name, object_key)
+        url_ = urljoin(str(request.base_url), f"api/v1/presigned/{bucket_name}/{object_key}")
+        download_url = generate_presigned_url(url_, ACCESS_KEY, SECRET_KEY, "GET", bucket_name, object_key,
+                                              DEFAULT_EXPIRATION_MINUTES)
+        # сначала запись в БД, потом перенос файла: если упадёт любой из шагов, сессия и частичный файл
+        # остаются, и повторный PATCH с тем же Upload-Offset завершает загрузку заново
+        await object_repo.create_object(bucket_id, bucket_name, object_key, current_user.id, current_user.username,
+                                        extension, storage_key, download_url, upload_length)
+        await get_storage_backend().put_staged_file(storage_key, partial_path)
+        await delete_legacy_copy(bucket_name, object_key)
+        await session_repo.delete_session(session_pk)
+        logger.info(f"Upload session '{session_id}' completed into '{object_key}' in bucket '{bucket_name}'.")
+    elif not completed:
+        logger.info(f"Upload session '{session_id}' interrupted at offset {new_offset} of {upload_length}.")
+
+    return Response(status_code=HTTPStatus.NO_CONTENT, headers=session_headers(new_offset, upload_length, expires_at))
+
+
+@resumable_upload_router.delete("/{bucket_name}/{object_key}/resumable/{session_id}",
+                                status_code=HTTPStatus.NO_CONTENT)
+async def terminate_upload(bucket_name: str, object_key: str, session_id: str,
+                           current_user: UserResponse = Depends(get_current_user),
+                           session_repo: UploadSessionRepository = Depends(get_upload_session_repository)):
+    upload_session = await session_repo.get_session(session_id, bucket_name, object_key, current_user.username)
+    if upload_session is None:
+        raise HTTPException(status_code=404, detail=f"Upload session '{session_id}' not found")
+    session_pk, partial_path = upload_session.id, pathlib.Path(upload_session.file_storage_path)
+    await session_repo.delete_session(session_pk)
+    await remove_file(partial_path)
+    return Response(status_code=HTTPStatus.NO_CONTENT, headers={"Tus-Resumable": TUS_VERSION})
@@ -2,13 +2,19 @@ from fastapi import APIRouter
 
 from .auth_api import auth_router
 from .objects_api import object_router
+from .multipart_uploads_api import multipart_upload_router
+from .resumable_uploads_api import resumable_upload_router
 from .buckets_api import bucket_router
 from .users_api import user_router
 from .misc_api import misc_router
+from .admin_api import admin_router
 
 api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["Authorization"])
 api_router.include_router(user_router, prefix="/users", tags=["Users"])
 api_router.include_router(misc_router, tags=["Misc"])
+api_router.include_router(admin_router, prefix="/admin", tags=["Admin"])
 api_router.include_router(bucket_router, tags=["Buckets"])
+api_router.include_router(multipart_upload_router, tags=["Objects"])
+api_router.include_router(resumable_upload_router, tags=["Objects"])
 api_router.include_router(object_router, tags=["Objects"])
@@ -1,11 +1,14 @@
 from urllib.parse import urljoin
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 from starlette.requests import Request
 
 from ....repositories.object_repository import ObjectRepository, get_object_repository
-from ....schemas.object_schema import ObjectLink
-from .objects_api import download_object, ACCESS_KEY, SECRET_KEY, DEFAULT_EXPIRATION_MINUTES, generate_presigned_url
+from ....schemas.object_schema import ObjectLink, ListObjectsResponse
+from .objects_api import download_object, ACCESS_KEY, SECRET_KEY, DEFAULT_EXPIRATION_MINUTES, generate_presigned_url, \
+    list_objects_page, stream_objects_response, MAX_KEYS, StreamFormat
 from ....schemas.user_schema import UserResponse
 from ....services.auth_service import get_current_user
 
@@ -25,10 +28,20 @@ async def get_current_user_objects_links(current_user: UserResponse = Depends(ge
     return object_links
 
 @user_router.get("/me/objects")
-async def get_current_user_objects_metadata(current_user: UserResponse = Depends(get_current_user),
-                                            obj_repo: ObjectRepository = Depends(get_object_repository)):
-    objects = await obj_repo.get_all_objects(bucket_name=None, username=current_user.username)
-    return objects
+async def get_current_user_objects_metadata(prefix: str = "",
+                                            delimiter: Optional[str] = None,
+                                            max_keys: int = Query(MAX_KEYS, alias="max-keys", ge=1, le=MAX_KEYS),
+                                            continuation_token: Optional[str] = Query(None, alias="continuation-token"),
+                                            stream: Optional[StreamFormat] = Query(
+                                                None, description="Stream the whole listing as NDJSON or a JSON array"
+                                            ),
+                                            current_user: UserResponse = Depends(get_current_user),
+                                            obj_repo: ObjectRepository = Depends(get_object_repository)
+                                            ) -> ListObjectsResponse:
+    if stream:
+        return stream_objects_response(current_user.username, None, prefix, delimiter, continuation_token, stream)
+    return await list_objects_page(obj_repo, current_user.username, None, None,
+                                   prefix, delimiter, max_keys, continuation_token)
 
 @user_router.get("/me")
 async def get_current_user_data(current_user: UserResponse = Depends(get_current_user)):
@@ -1,10 +1,11 @@
 from fastapi import FastAPI
 from app.api.v1.endpoints.routes import api_router
+from app.core.responses import TimedJSONResponse
 
 def setup_routes(app: FastAPI) -> None:
     app.include_router(api_router)
 
 def get_app() -> FastAPI:
-    app = FastAPI(title="NeoBitCloud")
+    app = FastAPI(title="NeoBitCloud", default_response_class=TimedJSONResponse)
     setup_routes(app)
     return app
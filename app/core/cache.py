@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from .config import settings
+from .metrics import record_cache_lookup
+
+
+# кэши процесса по имени: шина инвалидации находит по нему, из какого кэша удалять запись
+_registry: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """
+    LRU-кэш в памяти процесса с ограничением размера и временем жизни записей.
+
+    Рассчитан на использование из одного event loop, поэтому без блокировок.
+    Каждое обращение через get учитывается в метриках app_cache_requests_total и app_cache_hit_ratio.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _registry[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        record_cache_lookup(self.name, entry is not None, self.hits / (self.hits + self.misses), len(self._entries))
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def get_registered_cache(name: str) -> Optional[TTLCache]:
+    return _registry.get(name)
+
+
+def clear_all_caches():
+    for cache in _registry.values():
+        cache.clear()
+
+
+# проверенные пользователи get_current_user по username
+principal_cache = TTLCache("principal", settings.cache.principal_cache_size, settings.cache.principal_cache_ttl_seconds)
+# бакеты по имени для проверки владельца в обработчиках объектов
+bucket_cache = TTLCache("bucket", settings.cache.bucket_cache_size, settings.cache.bucket_cache_ttl_seconds)
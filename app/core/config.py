@@ -10,6 +10,24 @@ class DBConfig(BaseModel):
     db_password: str
     db_host: str
     db_port: int
+    echo: bool = False
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    # отладка N+1: off | log | raise при превышении max_queries_per_request (0 — без лимита) и ленивой загрузке связей
+    query_debug: str = "off"
+    max_queries_per_request: int = 0
+    # число и время SQL-запросов на HTTP-запрос (QueryStatsMiddleware)
+    track_request_queries: bool = True
+    # журнал медленных запросов (0 — выключен) и их планы EXPLAIN
+    slow_query_threshold_ms: int = 500
+    slow_query_log_size: int = 100
+    slow_query_explain: bool = True
+    slow_query_explain_cooldown_seconds: int = 60
+    slow_query_explain_timeout_ms: int = 5000
 
     @property
     def db_url(self):
@@ -22,20 +40,72 @@ class APPConfig(BaseModel):
     app_name: str
     app_mount: str
     environment: str
+    password_hash_workers: int = 2
+    workers: int = 1
+    loop: str = "auto"
+    http: str = "auto"
+    timeout_graceful_shutdown: int = 30
+    timeout_keep_alive: int = 5
+    # пользователи с доступом к /admin/*
+    admin_usernames: list[str] = []
 
 class FileStorageConfig(BaseModel):
     root_dir: str
+    chunk_size: int = 1024 * 1024
+    staging_dir: str = ".staging"
+    upload_session_ttl_minutes: int = 24 * 60
+    upload_gc_interval_seconds: int = 600
+    io_workers: int = 16
+    backend: str = "local"
+    objects_dir: str = ".objects"
+    delete_legacy_copies: bool = True
 
 class PresignedUrlConfig(BaseModel):
     access_key: str
     secret_key: str
     expiration_minutes: int
 
+class CacheConfig(BaseModel):
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: int = 60
+    bucket_cache_size: int = 10000
+    bucket_cache_ttl_seconds: int = 30
+
+class LoggingConfig(BaseModel):
+    level: str = "INFO"
+    json_logs: bool = True
+    enqueue: bool = True
+    # имя логгера (модуль) -> пропускать одно из N сообщений уровня ниже WARNING
+    sampling: dict[str, int] = {}
+
+class HealthConfig(BaseModel):
+    refresh_interval_seconds: float = 5
+    db_timeout_seconds: float = 2
+    min_free_disk_mb: int = 1024
+    max_loop_lag_seconds: float = 1
+    stale_after_seconds: float = 30
+
+class TimingConfig(BaseModel):
+    enabled: bool = True
+    server_timing_header: bool = False
+
+class LoopMonitorConfig(BaseModel):
+    lag_sample_interval_seconds: float = 0.5
+    blocking_detector: bool = False
+    blocking_threshold_ms: int = 100
+    probe_interval_ms: int = 50
+    stall_log_size: int = 50
+
 class Settings(BaseModel):
     app: APPConfig
     db: DBConfig
     fileStorage: FileStorageConfig
     presigned_url: PresignedUrlConfig
+    cache: CacheConfig = CacheConfig()
+    logging: LoggingConfig = LoggingConfig()
+    health: HealthConfig = HealthConfig()
+    timing: TimingConfig = TimingConfig()
+    loop_monitor: LoopMonitorConfig = LoopMonitorConfig()
 
 dyna_settings = Dynaconf(
     settings_files=["settings.toml"],
@@ -44,7 +114,12 @@ dyna_settings = Dynaconf(
 settings = Settings(app=dyna_settings["app_settings"],
                     db=dyna_settings["db_settings"],
                     fileStorage=dyna_settings["file_storage_settings"],
-                    presigned_url=dyna_settings["presigned_url_settings"])
+                    presigned_url=dyna_settings["presigned_url_settings"],
+                    cache=dyna_settings.get("cache_settings", {}),
+                    logging=dyna_settings.get("logging_settings", {}),
+                    health=dyna_settings.get("health_settings", {}),
+                    timing=dyna_settings.get("timing_settings", {}),
+                    loop_monitor=dyna_settings.get("loop_monitor_settings", {}))
 #переопределить значение settings.toml, если переменная окружения DB_HOST определена
 settings.db.db_host = os.environ.get("DB_HOST") or settings.db.db_host
 
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .config import settings
+from .metrics import record_fs_operation, set_fs_pool_usage
+from .timing import FS_STAGE, span
+
+# Файловые операции выполняются в собственном пуле ограниченного размера: зависший диск (например, NFS)
+# занимает только эти потоки, а event loop и общий threadpool starlette продолжают обслуживать запросы
+_fs_executor = ThreadPoolExecutor(max_workers=settings.fileStorage.io_workers, thread_name_prefix="fs-io")
+_usage_lock = threading.Lock()
+_queued = 0
+_running = 0
+
+
+def _update_usage(queued_delta: int, running_delta: int):
+    global _queued, _running
+    with _usage_lock:
+        _queued += queued_delta
+        _running += running_delta
+        set_fs_pool_usage(_queued, _running)
+
+
+def _timed_fs_operation(submitted_at: float, func, args, kwargs):
+    started = time.perf_counter()
+    _update_usage(-1, 1)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _update_usage(0, -1)
+        record_fs_operation(getattr(func, "__name__", "unknown"), started - submitted_at, time.perf_counter() - started)
+
+
+def _forget_cancelled(future: Future):
+    # задача отменена до начала выполнения — из очереди она ушла, но _timed_fs_operation не вызывался
+    if future.cancelled():
+        _update_usage(-1, 0)
+
+
+async def run_fs(func, *args, **kwargs):
+    """
+    Выполняет блокирующую файловую операцию в пуле fs-io.
+
+    Время ожидания и выполнения относится к этапу fs запроса; глубина очереди и число занятых
+    потоков видны в метриках app_fs_queue_depth и app_fs_active_operations.
+    """
+    with span(FS_STAGE):
+        _update_usage(1, 0)
+        future = _fs_executor.submit(_timed_fs_operation, time.perf_counter(), func, args, kwargs)
+        future.add_done_callback(_forget_cancelled)
+        return await asyncio.wrap_future(future)
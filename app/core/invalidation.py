@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import Hashable, Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import clear_all_caches, get_registered_cache
+
+# Шина инвалидации кэшей между воркерами и хостами на Postgres LISTEN/NOTIFY.
+# Репозитории публикуют событие в своей транзакции (NOTIFY уходит только после COMMIT),
+# каждый процесс слушает канал на отдельном соединении и удаляет запись из своего кэша.
+CHANNEL = "cache_invalidation"
+HEALTHCHECK_INTERVAL_SECONDS = 10
+# на полуоткрытом TCP-соединении SELECT 1 без таймаута ждёт вечно, и переподключения не происходит
+HEALTHCHECK_TIMEOUT_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 1
+MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+def invalidation_payload(cache_name: str, key: Optional[Hashable]) -> str:
+    return json.dumps({"cache": cache_name, "key": key})
+
+
+def notify_invalidation(cache_name: str, key: Optional[Hashable]):
+    """Выражение pg_notify для события; key=None сбрасывает кэш целиком."""
+    return func.pg_notify(CHANNEL, invalidation_payload(cache_name, key))
+
+
+async def publish_invalidation(session: AsyncSession, cache_name: str, key: Optional[Hashable]):
+    """Ставит событие в текущую транзакцию сессии; при откате оно не отправляется."""
+    await session.execute(select(notify_invalidation(cache_name, key)))
+
+
+def apply_invalidation(payload: str):
+    try:
+        event = json.loads(payload)
+        cache_name, key = event["cache"], event["key"]
+    except (ValueError, TypeError, KeyError):
+        logger.warning(f"Malformed cache invalidation event: {payload!r}")
+        return
+    cache = get_registered_cache(cache_name)
+    if cache is None:
+        return
+    if key is None:
+        cache.clear()
+    else:
+        cache.invalidate(key)
+
+
+def _on_notification(connection, pid, channel, payload):
+    apply_invalidation(payload)
+
+
+async def run_invalidation_listener(connect=None):
+    """
+    Слушает канал инвалидации, пока задачу не отменят.
+
+    Соединение проверяется раз в HEALTHCHECK_INTERVAL_SECONDS; при разрыве или зависшей проверке переподключается
+    с экспоненциальной задержкой. После каждой подписки все кэши процесса сбрасываются:
+    пока соединения не было, события могли быть потеряны.
+    """
+    if connect is None:
+        from ..db import create_listener_connection as connect
+
+    delay = RECONNECT_DELAY_SECONDS
+    while True:
+        connection = None
+        try:
+            connection = await connect()
+            lost = asyncio.Event()
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(CHANNEL, _on_notification)
+            clear_all_caches()
+            logger.info("Cache invalidation listener connected.")
+            delay = RECONNECT_DELAY_SECONDS
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=HEALTHCHECK_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    await asyncio.wait_for(connection.execute("SELECT 1"), timeout=HEALTHCHECK_TIMEOUT_SECONDS)
+            logger.warning("Cache invalidation listener connection lost.")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener error: {e}")
+        finally:
+            if connection is not None and not connection.is_closed():
+                try:
+                    await connection.close(timeout=1)
+                except Exception:
+                    connection.terminate()
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
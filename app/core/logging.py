@@ -1,14 +1,41 @@
 from loguru import logger
 import sys
 import os
-from typing import Union
+from collections import Counter
+from typing import Optional, Union
 import logging
 
+
+class LogSampler:
+    """
+    Фильтр Loguru: для указанных логгеров пропускает одно из N сообщений уровня ниже WARNING.
+
+    Предупреждения и ошибки проходят всегда. Фильтр выполняется в потоке, вызвавшем логгер,
+    до постановки сообщения в очередь, поэтому отброшенные сообщения ничего не стоят обработчику.
+    """
+
+    def __init__(self, rates: dict[str, int]):
+        self.rates = rates
+        self.counters: Counter[str] = Counter()
+
+    def __call__(self, record) -> bool:
+        if record["level"].no >= logging.WARNING:
+            return True
+        name = record["name"]
+        rate = self.rates.get(name)
+        if rate is None or rate <= 1:
+            return True
+        self.counters[name] += 1
+        return self.counters[name] % rate == 1
+
+
 def configure_logger(
     enable_json_logs: bool = False,
     enable_sql_logs: bool = False,
     level: Union[int, str] = "INFO",
     log_file: str = "logs/app.log",
+    enqueue: bool = True,
+    sampling: Optional[dict[str, int]] = None,
 ) -> None:
     """
     Настройка логирования с использованием Loguru.
@@ -17,10 +44,14 @@ def configure_logger(
     :param enable_sql_logs: Включить логирование SQLAlchemy.
     :param level: Уровень логирования (например, "INFO", "DEBUG").
     :param log_file: Путь к файлу логов.
+    :param enqueue: Писать в обработчики из фонового потока (сериализация и запись не в event loop).
+    :param sampling: Имя логгера -> писать одно из N сообщений уровня ниже WARNING.
     """
 
     # Удаляем стандартный обработчик Loguru, чтобы избежать дублирования
     logger.remove()
+    # у каждого обработчика свой счётчик: фильтр вызывается отдельно для каждого из них
+    sampling = sampling or {}
 
     # Создаем директорию для логов, если она не существует
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -32,6 +63,8 @@ def configure_logger(
             format="{time} - {level} - {message}",
             level=level,
             serialize=True,
+            enqueue=enqueue,
+            filter=LogSampler(sampling),
         )
         logger.add(
             log_file,
@@ -39,6 +72,8 @@ def configure_logger(
             level=level,
             rotation="10 MB",
             serialize=True,
+            enqueue=enqueue,
+            filter=LogSampler(sampling),
         )
     else:
         # Добавляем стандартное форматирование для консоли
@@ -47,6 +82,8 @@ def configure_logger(
             format="{time} - {level} - {message}",
             level=level,
             colorize=True,
+            enqueue=enqueue,
+            filter=LogSampler(sampling),
         )
         # Добавляем файл логов с ротацией
         logger.add(
@@ -56,6 +93,8 @@ def configure_logger(
             rotation="10 MB",
             retention="10 days",
             compression="zip",
+            enqueue=enqueue,
+            filter=LogSampler(sampling),
         )
 
     # Настройка логирования для SQLAlchemy
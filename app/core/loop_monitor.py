@@ -0,0 +1,103 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from loguru import logger
+
+from .config import settings
+from .metrics import record_loop_lag, record_loop_stall
+
+LAG_SAMPLE_INTERVAL_SECONDS = settings.loop_monitor.lag_sample_interval_seconds
+
+# последняя измеренная задержка event loop (её же показывает /readyz)
+_last_lag = 0.0
+# последние зафиксированные блокировки event loop со стеком, на котором loop стоял
+_stalls: deque[dict] = deque(maxlen=settings.loop_monitor.stall_log_size)
+
+
+def get_loop_lag() -> float:
+    return _last_lag
+
+
+def get_loop_stalls() -> list[dict]:
+    """Журнал блокировок event loop, самые новые первыми."""
+    return list(reversed(_stalls))
+
+
+async def run_loop_lag_monitor(interval_seconds: float = LAG_SAMPLE_INTERVAL_SECONDS) -> None:
+    """Раз в interval_seconds измеряет, насколько позже срока просыпается sleep, и пишет это в гистограмму."""
+    global _last_lag
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval_seconds)
+        _last_lag = max(0.0, time.perf_counter() - start - interval_seconds)
+        record_loop_lag(_last_lag)
+
+
+class BlockingCallDetector:
+    """
+    Сторожевой поток, который находит вызовы, блокирующие event loop.
+
+    Раз в probe_interval_seconds поток ставит в loop пустой callback через call_soon_threadsafe.
+    Если loop не выполнил его за threshold_seconds, поток снимает стек потока loop — это стек
+    блокирующего вызова в момент блокировки — и после разблокировки записывает его в журнал.
+    Создавать нужно из потока event loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold_seconds: float, probe_interval_seconds: float):
+        self.loop = loop
+        self.threshold_seconds = threshold_seconds
+        self.probe_interval_seconds = probe_interval_seconds
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-loop-watchdog", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join(timeout=self.threshold_seconds + self.probe_interval_seconds)
+
+    def _run(self):
+        while not self._stopped.wait(self.probe_interval_seconds):
+            answered = threading.Event()
+            sent_at = time.perf_counter()
+            try:
+                self.loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                # loop уже закрыт
+                return
+            if answered.wait(self.threshold_seconds):
+                continue
+            stack = self._capture_loop_stack()
+            while not answered.wait(self.threshold_seconds):
+                if self._stopped.is_set():
+                    return
+            report_loop_stall(time.perf_counter() - sent_at, stack)
+
+    def _capture_loop_stack(self) -> Optional[str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        return "".join(traceback.format_stack(frame)) if frame is not None else None
+
+
+def report_loop_stall(duration: float, stack: Optional[str]):
+    _stalls.append({"captured_at": datetime.now(), "duration_seconds": round(duration, 6), "stack": stack})
+    record_loop_stall(duration)
+    logger.warning("Event loop was blocked for {:.3f}s at:\n{}", duration, stack)
+
+
+def start_blocking_call_detector() -> Optional[BlockingCallDetector]:
+    """Запускает детектор, если он включён в loop_monitor_settings; вызывать из event loop."""
+    if not settings.loop_monitor.blocking_detector:
+        return None
+    detector = BlockingCallDetector(asyncio.get_running_loop(),
+                                    settings.loop_monitor.blocking_threshold_ms / 1000,
+                                    settings.loop_monitor.probe_interval_ms / 1000)
+    detector.start()
+    return detector
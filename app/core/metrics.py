@@ -1,15 +1,119 @@
-from prometheus_client import Counter, Histogram, start_http_server, make_asgi_app
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app, multiprocess
+
+# при запуске нескольких воркеров каждый пишет значения в файлы этого каталога (задаёт cli.py)
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
 
 # Метрики
 REQUEST_COUNT = Counter("app_requests_total", "Общее количество запросов", ['method', 'endpoint', 'status_code'])
 REQUEST_LATENCY = Histogram("app_request_latency_seconds", "Время обработки запросов", ['method', 'endpoint'])
+REQUEST_BYTES = Counter("app_request_bytes_total", "Объём тел запросов в байтах", ['method', 'endpoint'])
+RESPONSE_BYTES = Counter("app_response_bytes_total", "Объём тел ответов в байтах", ['method', 'endpoint'])
+REQUEST_STAGE_DURATION = Histogram("app_request_stage_duration_seconds", "Время этапов обработки запроса (auth, db, fs, serialize)",
+                                   ['stage'], buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+
+DB_POOL_CHECKOUT_LATENCY = Histogram("app_db_pool_checkout_seconds", "Время получения соединения из пула БД",
+                                     buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30))
+DB_POOL_CHECKOUT_TIMEOUTS = Counter("app_db_pool_checkout_timeouts_total", "Количество таймаутов ожидания соединения из пула БД")
+DB_POOL_CHECKED_OUT = Gauge("app_db_pool_checked_out_connections", "Количество выданных из пула соединений",
+                            multiprocess_mode="livesum")
+DB_POOL_CONNECTIONS_OPENED = Counter("app_db_pool_connections_opened_total", "Количество новых соединений с БД, открытых пулом")
+DB_POOL_CAPACITY = Gauge("app_db_pool_capacity_connections", "Максимальное количество соединений пула (pool_size + max_overflow)",
+                         multiprocess_mode="livesum")
+DB_QUERY_DURATION = Histogram("app_db_query_duration_seconds", "Время выполнения SQL-запроса по отпечатку запроса", ['fingerprint'],
+                              buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+DB_REQUEST_QUERIES = Histogram("app_db_queries_per_request", "Количество SQL-запросов за один HTTP-запрос", ['method', 'endpoint'],
+                               buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100))
+DB_REQUEST_DURATION = Histogram("app_db_time_per_request_seconds", "Суммарное время SQL-запросов за один HTTP-запрос", ['method', 'endpoint'],
+                                buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+EVENT_LOOP_LAG = Histogram("app_event_loop_lag_seconds", "Задержка event loop: насколько позже срока просыпается sleep",
+                           buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5))
+EVENT_LOOP_STALLS = Counter("app_event_loop_stalls_total", "Количество блокировок event loop дольше порога детектора")
+EVENT_LOOP_STALL_DURATION = Histogram("app_event_loop_stall_seconds", "Длительность блокировок event loop",
+                                      buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30))
+FS_QUEUE_DEPTH = Gauge("app_fs_queue_depth", "Файловые операции, ожидающие свободного потока пула fs-io",
+                       multiprocess_mode="livesum")
+FS_ACTIVE_OPERATIONS = Gauge("app_fs_active_operations", "Файловые операции, выполняющиеся в пуле fs-io",
+                             multiprocess_mode="livesum")
+FS_QUEUE_TIME = Histogram("app_fs_queue_seconds", "Время ожидания свободного потока пула fs-io",
+                          buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+FS_OPERATION_DURATION = Histogram("app_fs_operation_seconds", "Время выполнения файловой операции", ['operation'],
+                                  buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30))
+
+CACHE_REQUESTS = Counter("app_cache_requests_total", "Количество обращений к кэшам в памяти процесса", ['cache', 'result'])
+CACHE_HIT_RATIO = Gauge("app_cache_hit_ratio", "Доля попаданий в кэш с момента запуска процесса", ['cache'],
+                        multiprocess_mode="liveall")
+CACHE_ENTRIES = Gauge("app_cache_entries", "Количество записей в кэше", ['cache'], multiprocess_mode="livesum")
+
+PASSWORD_HASH_QUEUE_TIME = Histogram("app_password_hash_queue_seconds", "Время ожидания свободного потока для bcrypt", ['operation'])
+PASSWORD_HASH_DURATION = Histogram("app_password_hash_duration_seconds", "Время хэширования или проверки пароля", ['operation'])
 
-metrics_app = make_asgi_app()
+def create_metrics_app():
+    """ASGI-приложение /metrics; в режиме нескольких воркеров агрегирует значения всех процессов."""
+    if MULTIPROC_DIR_ENV in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
 
-def start_metrics_server(port=8001):
-    start_http_server(port)
-    print(f"Metrics server started on port {port}")
+metrics_app = create_metrics_app()
 
-def record_request_metrics(method: str, endpoint: str, status_code: int, duration: float):
+def mark_metrics_process_dead(pid: int):
+    """Убирает live-gauge завершившегося воркера из агрегированных метрик."""
+    if MULTIPROC_DIR_ENV in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+def record_request_metrics(method: str, endpoint: str, status_code: int, duration: float,
+                           request_bytes: int = 0, response_bytes: int = 0):
     REQUEST_COUNT.labels(method=method, endpoint=endpoint, status_code=status_code).inc()
     REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration)
+    REQUEST_BYTES.labels(method=method, endpoint=endpoint).inc(request_bytes)
+    RESPONSE_BYTES.labels(method=method, endpoint=endpoint).inc(response_bytes)
+
+def record_db_pool_wait(duration: float):
+    DB_POOL_CHECKOUT_LATENCY.observe(duration)
+
+def record_db_pool_checkout():
+    DB_POOL_CHECKED_OUT.inc()
+
+def record_db_pool_checkin():
+    DB_POOL_CHECKED_OUT.dec()
+
+def record_db_pool_connect():
+    DB_POOL_CONNECTIONS_OPENED.inc()
+
+def record_db_query(fingerprint: str, duration: float):
+    DB_QUERY_DURATION.labels(fingerprint=fingerprint).observe(duration)
+
+def record_request_queries(method: str, endpoint: str, count: int, duration: float):
+    DB_REQUEST_QUERIES.labels(method=method, endpoint=endpoint).observe(count)
+    DB_REQUEST_DURATION.labels(method=method, endpoint=endpoint).observe(duration)
+
+def record_loop_lag(lag: float):
+    EVENT_LOOP_LAG.observe(lag)
+
+def record_loop_stall(duration: float):
+    EVENT_LOOP_STALLS.inc()
+    EVENT_LOOP_STALL_DURATION.observe(duration)
+
+def set_fs_pool_usage(queued: int, running: int):
+    FS_QUEUE_DEPTH.set(queued)
+    FS_ACTIVE_OPERATIONS.set(running)
+
+def record_fs_operation(operation: str, queue_time: float, duration: float):
+    FS_QUEUE_TIME.observe(queue_time)
+    FS_OPERATION_DURATION.labels(operation=operation).observe(duration)
+
+def record_cache_lookup(cache: str, hit: bool, hit_ratio: float, entries: int):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+    CACHE_HIT_RATIO.labels(cache=cache).set(hit_ratio)
+    CACHE_ENTRIES.labels(cache=cache).set(entries)
+
+def record_password_hash(operation: str, queue_time: float, duration: float):
+    PASSWORD_HASH_QUEUE_TIME.labels(operation=operation).observe(queue_time)
+    PASSWORD_HASH_DURATION.labels(operation=operation).observe(duration)
+
+def record_stage_durations(timings: dict[str, float]):
+    for stage, duration in timings.items():
+        REQUEST_STAGE_DURATION.labels(stage=stage).observe(duration)
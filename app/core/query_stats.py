@@ -0,0 +1,146 @@
+import hashlib
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+from .metrics import record_db_query, record_request_queries
+from .slow_queries import SLOW_QUERY_THRESHOLD_SECONDS, capture_slow_query
+from ..exceptions.query_error import LazyLoadError, QueryBudgetExceededError
+from ..middlwares.metrics_middleware import get_route_template
+
+# Режим отладки запросов: off — только метрики, log — предупреждение в лог, raise — исключение
+QUERY_DEBUG_OFF = "off"
+QUERY_DEBUG_LOG = "log"
+QUERY_DEBUG_RAISE = "raise"
+
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|'(?:[^']|'')*'|\b\d+\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+\"?(\w+)", re.IGNORECASE)
+
+
+class RequestQueryStats:
+    """SQL-запросы одного HTTP-запроса: количество, суммарное время и (в режиме отладки) отпечатки."""
+
+    __slots__ = ("count", "duration", "fingerprints", "budget_reported")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter[str] = Counter()
+        self.budget_reported = False
+
+
+_request_queries: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_queries", default=None)
+
+
+@contextmanager
+def track_request_queries():
+    """Считает SQL-запросы, выполненные внутри блока (в том числе в greenlet'ах SQLAlchemy)."""
+    stats = RequestQueryStats()
+    token = _request_queries.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_queries.reset(token)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI-middleware учёта SQL-запросов: число и суммарное время запросов к БД на один HTTP-запрос
+    (гистограммы по шаблону маршрута) и проверка бюджета max_queries_per_request.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_prefixes: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        with track_request_queries() as queries:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                record_request_queries(scope["method"], get_route_template(scope, root_path),
+                                       queries.count, queries.duration)
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(statement: str) -> str:
+    """
+    Отпечаток SQL без значений параметров, например "SELECT bucket 1a2b3c4d".
+
+    Используется как метка гистограммы: число отпечатков ограничено числом разных запросов в коде.
+    """
+    normalized = _PARAMETER.sub("?", " ".join(statement.split()))
+    normalized = _PARAMETER_LIST.sub("(?)", normalized)
+    verb = normalized.split(" ", 1)[0].upper()
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:8]
+    table = _TABLE.search(normalized)
+    return f"{verb} {table.group(1)} {digest}" if table else f"{verb} {digest}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = perf_counter()
+    stats = _request_queries.get()
+    if stats is None:
+        return
+    stats.count += 1
+    if settings.db.query_debug == QUERY_DEBUG_OFF:
+        return
+    stats.fingerprints[statement_fingerprint(statement)] += 1
+    budget = settings.db.max_queries_per_request
+    if budget and stats.count > budget and not stats.budget_reported:
+        stats.budget_reported = True
+        _report(QueryBudgetExceededError(
+            f"Request ran more than {budget} queries; most frequent: {stats.fingerprints.most_common(3)}"))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = perf_counter() - context._query_start_time
+    fingerprint = statement_fingerprint(statement)
+    record_db_query(fingerprint, duration)
+    if SLOW_QUERY_THRESHOLD_SECONDS and duration >= SLOW_QUERY_THRESHOLD_SECONDS:
+        capture_slow_query(fingerprint, statement, parameters, executemany, duration)
+    stats = _request_queries.get()
+    if stats is not None:
+        stats.duration += duration
+
+
+def _do_orm_execute(orm_execute_state: ORMExecuteState):
+    parent_state = orm_execute_state.lazy_loaded_from
+    if parent_state is None or settings.db.query_debug == QUERY_DEBUG_OFF:
+        return
+    target = orm_execute_state.bind_mapper
+    relationships = [relationship.key for relationship in parent_state.mapper.relationships
+                     if target is not None and relationship.mapper is target]
+    attribute = relationships[0] if len(relationships) == 1 else f"<{target.class_.__name__ if target else '?'}>"
+    _report(LazyLoadError(f"Lazy load of {parent_state.class_.__name__}.{attribute}; use selectinload/joinedload"))
+
+
+def _report(error: Exception):
+    if settings.db.query_debug == QUERY_DEBUG_RAISE:
+        raise error
+    logger.warning(str(error))
+
+
+def instrument_engine(engine: Engine):
+    """Подключает учёт запросов к движку и обнаружение ленивых загрузок к сессиям ORM."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(Session, "do_orm_execute", _do_orm_execute):
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
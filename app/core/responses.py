@@ -0,0 +1,214 @@
+import os
+from email.utils import parsedate_to_datetime
+from secrets import token_hex
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from .timing import SERIALIZE_STAGE, span
+
+ZEROCOPY_SEND_EXTENSION = "http.response.zerocopysend"
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse, время кодирования которого относится к этапу serialize запроса."""
+
+    def render(self, content) -> bytes:
+        with span(SERIALIZE_STAGE):
+            return super().render(content)
+
+
+def parse_byte_ranges(http_range: str, file_size: int) -> list[tuple[int, int]]:
+    """
+    Диапазоны [start, end) из заголовка Range, упорядоченные и слитые.
+
+    ValueError — заголовок не разобрать (400); пустой список — ни один диапазон не попадает в файл (416).
+    """
+    units, _, spec = http_range.partition("=")
+    if units.strip().lower() != "bytes":
+        raise ValueError("Only bytes ranges are supported")
+    ranges = []
+    for part in spec.split(","):
+        first, separator, last = part.strip().partition("-")
+        if not separator or not (first or last) or not all(value.isdigit() for value in (first, last) if value):
+            raise ValueError("Malformed range header")
+        if not first:
+            # суффикс: последние last байт
+            if int(last) > 0 and file_size > 0:
+                ranges.append((max(file_size - int(last), 0), file_size))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            raise ValueError("Range start must not exceed its end")
+        if start < file_size:
+            ranges.append((start, min(int(last) + 1, file_size) if last else file_size))
+
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ObjectFileResponse(FileResponse):
+    """
+    Ответ с содержимым объекта, поддерживающий условные и частичные запросы.
+
+    От FileResponse берутся только конструктор и заголовки stat; Range, If-Range,
+    If-None-Match / If-Modified-Since (ответ 304), multipart/byteranges и отдача через sendfile
+    (если ASGI-сервер поддерживает расширение http.response.zerocopysend) реализованы здесь,
+    без закрытых методов Starlette, которые меняются от версии к версии.
+    С диска читаются только запрошенные байты.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            self.set_stat_headers(self.stat_result)
+        self.headers.setdefault("accept-ranges", "bytes")
+
+        file_size = self.stat_result.st_size
+        request_headers = Headers(scope=scope)
+        method = scope["method"].upper()
+        send_header_only = method == "HEAD"
+        self._zerocopy = ZEROCOPY_SEND_EXTENSION in scope.get("extensions", {})
+
+        if method in ("GET", "HEAD") and self.is_not_modified(request_headers):
+            not_modified_headers = {
+                name: self.headers[name] for name in ("etag", "last-modified", "cache-control") if name in self.headers
+            }
+            await Response(status_code=304, headers=not_modified_headers)(scope, receive, send)
+            return
+
+        http_range = request_headers.get("range")
+        if http_range is None or not self.if_range_matches(request_headers.get("if-range")):
+            await self._send_whole_file(send, file_size, send_header_only)
+        else:
+            try:
+                ranges = parse_byte_ranges(http_range, file_size)
+            except ValueError as e:
+                await PlainTextResponse(str(e), status_code=400)(scope, receive, send)
+                return
+            if not ranges:
+                await PlainTextResponse(status_code=416, headers={"content-range": f"bytes */{file_size}"})(
+                    scope, receive, send)
+                return
+            if len(ranges) == 1:
+                await self._send_range(send, *ranges[0], file_size, send_header_only)
+            else:
+                await self._send_ranges(send, ranges, file_size, send_header_only)
+
+        if self.background is not None:
+            await self.background()
+
+    def is_not_modified(self, request_headers: Headers) -> bool:
+        """Проверяет валидаторы запроса по RFC 9110: If-None-Match имеет приоритет над If-Modified-Since."""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = self.headers["etag"].removeprefix("W/")
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                return parsedate_to_datetime(self.headers["last-modified"]) <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+    def if_range_matches(self, if_range: Optional[str]) -> bool:
+        """Без If-Range диапазон отдаётся всегда; с ним — только если объект не менялся."""
+        return if_range is None or if_range in (self.headers["etag"], self.headers["last-modified"])
+
+    async def _send_whole_file(self, send: Send, file_size: int, send_header_only: bool) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif self._zerocopy:
+            await self._zerocopy_send(send, 0, file_size)
+        else:
+            await self._send_file_range(send, 0, file_size)
+
+    async def _send_range(self, send: Send, start: int, end: int, file_size: int, send_header_only: bool) -> None:
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif self._zerocopy:
+            await self._zerocopy_send(send, start, end - start)
+        else:
+            await self._send_file_range(send, start, end)
+
+    async def _send_file_range(self, send: Send, start: int, end: int) -> None:
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await self._send_file_chunks(send, file, start, end)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _send_file_chunks(self, send: Send, file, start: int, end: int) -> None:
+        """Отдаёт байты [start, end) открытого файла; если файл укоротили после stat, останавливается на EOF."""
+        await file.seek(start)
+        while start < end:
+            chunk = await file.read(min(self.chunk_size, end - start))
+            if not chunk:
+                break
+            start += len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+    async def _send_ranges(
+        self, send: Send, ranges: list[tuple[int, int]], file_size: int, send_header_only: bool
+    ) -> None:
+        boundary = token_hex(13)
+        part_content_type = self.headers["content-type"]
+        parts = [
+            (start, end, (
+                f"--{boundary}\r\nContent-Type: {part_content_type}\r\n"
+                f"Content-Range: bytes {start}-{end - 1}/{file_size}\r\n\r\n"
+            ).encode("latin-1"))
+            for start, end in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode("latin-1")
+        content_length = sum(len(header) + (end - start) + 2 for start, end, header in parts) + len(closing)
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        if send_header_only:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            for start, end, header in parts:
+                await send({"type": "http.response.body", "body": header, "more_body": True})
+                if self._zerocopy:
+                    await send({
+                        "type": ZEROCOPY_SEND_EXTENSION,
+                        "file": file.wrapped,
+                        "offset": start,
+                        "count": end - start,
+                        "more_body": True,
+                    })
+                else:
+                    await self._send_file_chunks(send, file, start, end)
+                await send({"type": "http.response.body", "body": b"\r\n", "more_body": True})
+            await send({"type": "http.response.body", "body": closing, "more_body": False})
+
+    async def _zerocopy_send(self, send: Send, offset: int, count: int) -> None:
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            await send({
+                "type": ZEROCOPY_SEND_EXTENSION,
+                "file": file,
+                "offset": offset,
+                "count": count,
+                "more_body": False,
+            })
+        finally:
+            await anyio.to_thread.run_sync(file.close)
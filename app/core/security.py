@@ -1,21 +1,52 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from passlib.context import CryptContext
 
+from .config import settings
+from .metrics import record_password_hash
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = "v*s)cbb^rxswc^!6w&cexvkc^5k%#mz*4%_dnl)+$g!pr4c7@g"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# bcrypt занимает сотни миллисекунд CPU; отдельный ограниченный пул не даёт волне логинов
+# занять ни event loop, ни общий threadpool, через который идут файловые операции
+_password_executor = ThreadPoolExecutor(max_workers=settings.app.password_hash_workers,
+                                        thread_name_prefix="password-hash")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def _timed_password_operation(operation: str, submitted_at: float, func, *args):
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        record_password_hash(operation, started - submitted_at, time.perf_counter() - started)
+
+async def _run_password_operation(operation: str, func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, _timed_password_operation,
+                                      operation, time.perf_counter(), func, *args)
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """verify_password в пуле bcrypt — для async-обработчиков."""
+    return await _run_password_operation("verify", verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    """get_password_hash в пуле bcrypt — для async-обработчиков."""
+    return await _run_password_operation("hash", get_password_hash, password)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
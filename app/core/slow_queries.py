@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Sequence
+
+from loguru import logger
+
+from .config import settings
+
+SLOW_QUERY_THRESHOLD_SECONDS = settings.db.slow_query_threshold_ms / 1000
+EXPLAIN_COOLDOWN_SECONDS = settings.db.slow_query_explain_cooldown_seconds
+EXPLAIN_TIMEOUT_MS = settings.db.slow_query_explain_timeout_ms
+
+# Медленные запросы процесса, новые в конце; при переполнении вытесняются самые старые.
+# В режиме нескольких воркеров у каждого процесса свой журнал.
+_slow_queries: deque[dict] = deque(maxlen=settings.db.slow_query_log_size)
+# отпечаток -> время последнего EXPLAIN: один и тот же запрос не разбирается чаще раза в cooldown
+_last_explained: dict[str, float] = {}
+_explain_tasks: set[asyncio.Task] = set()
+# запросы самого EXPLAIN не должны попадать в журнал
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+# строковые литералы в плане: custom plan подставляет в него реальные значения параметров
+_PLAN_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_READ_ONLY_SELECT = re.compile(r"^\s*SELECT\b(?!.*\bFOR\s+(?:UPDATE|SHARE|NO\s+KEY\s+UPDATE|KEY\s+SHARE)\b)",
+                               re.IGNORECASE | re.DOTALL)
+
+
+def redact_parameter(value: Any) -> Any:
+    """Числа, bool и None остаются как есть, остальные значения заменяются типом и длиной."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    try:
+        return f"<{type(value).__name__} len={len(value)}>"
+    except TypeError:
+        return f"<{type(value).__name__}>"
+
+
+def redact_plan(plan: str) -> str:
+    """Убирает из плана строковые литералы (Filter: (owner_name = 'alice'::text)); числа остаются, как в параметрах."""
+    return _PLAN_LITERAL.sub("'<redacted>'", plan)
+
+
+def redact_parameters(parameters: Any, executemany: bool) -> list:
+    if not parameters:
+        return []
+    if executemany:
+        return [f"<{len(parameters)} parameter sets>"]
+    if isinstance(parameters, dict):
+        return [f"{name}={redact_parameter(value)}" for name, value in parameters.items()]
+    return [redact_parameter(value) for value in parameters]
+
+
+def capture_slow_query(fingerprint: str, statement: str, parameters: Any, executemany: bool, duration: float):
+    """Записывает запрос в журнал и, если возможно, запускает для него EXPLAIN в фоне."""
+    if _explaining.get():
+        return
+    entry = {
+        "captured_at": datetime.now(),
+        "fingerprint": fingerprint,
+        "duration_seconds": round(duration, 6),
+        "statement": statement,
+        "parameters": redact_parameters(parameters, executemany),
+        "plan": None,
+        "plan_error": None,
+    }
+    _slow_queries.append(entry)
+    logger.warning("Slow query {} took {:.3f}s", fingerprint, duration)
+
+    if not settings.db.slow_query_explain or executemany:
+        return
+    now = time.monotonic()
+    if now - _last_explained.get(fingerprint, float("-inf")) < EXPLAIN_COOLDOWN_SECONDS:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # синхронный движок (CLI, миграции): запускать EXPLAIN негде
+        return
+    _last_explained[fingerprint] = now
+    # пустой контекст: иначе задача унаследует учёт запросов и таймингов исходного запроса,
+    # и её SET LOCAL и EXPLAIN попадут в его счётчики и бюджет max_queries_per_request
+    task = loop.create_task(explain_slow_query(entry, statement, parameters), context=contextvars.Context())
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def explain_slow_query(entry: dict, statement: str, parameters: Sequence, timeout_ms: int = EXPLAIN_TIMEOUT_MS):
+    """
+    Дописывает в запись журнала план запроса.
+
+    EXPLAIN (ANALYZE, BUFFERS) выполняет запрос, поэтому так разбираются только SELECT без блокировок;
+    для остальных берётся план без выполнения. Транзакция всегда откатывается. Запрос выполняется
+    с настоящими значениями параметров, поэтому строковые литералы из плана и ошибки вырезаются.
+    """
+    from ..db import engine
+
+    _explaining.set(True)
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if _READ_ONLY_SELECT.match(statement) else "EXPLAIN "
+    try:
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+            result = await connection.exec_driver_sql(prefix + statement, tuple(parameters or ()))
+            entry["plan"] = redact_plan("\n".join(row[0] for row in result))
+            await connection.rollback()
+    except Exception as e:
+        entry["plan_error"] = redact_plan(str(e))
+        logger.warning(f"EXPLAIN of slow query {entry['fingerprint']} failed: {entry['plan_error']}")
+
+
+def get_slow_queries() -> list[dict]:
+    """Журнал медленных запросов, самые новые первыми."""
+    return list(reversed(_slow_queries))
+
+
+def clear_slow_queries():
+    _slow_queries.clear()
+    _last_explained.clear()
@@ -0,0 +1,109 @@
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+from .metrics import record_stage_durations
+
+# Этапы обработки запроса, по которым считается время
+AUTH_STAGE = "auth"
+DB_STAGE = "db"
+FS_STAGE = "fs"
+SERIALIZE_STAGE = "serialize"
+
+# Суммарное время по этапам текущего запроса (этап -> секунды).
+# None вне запроса или при выключенном учёте — тогда span ничего не измеряет.
+_request_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("request_timings", default=None)
+# Этап, который измеряется сейчас: вложенный span того же этапа не считается повторно
+_current_stage: ContextVar[Optional[str]] = ContextVar("current_stage", default=None)
+
+
+@contextmanager
+def span(stage: str):
+    """Добавляет время выполнения блока к этапу stage текущего запроса."""
+    timings = _request_timings.get()
+    if timings is None or _current_stage.get() == stage:
+        yield
+        return
+    token = _current_stage.set(stage)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + perf_counter() - start
+        _current_stage.reset(token)
+
+
+def timed(stage: str):
+    """Декоратор корутины: всё время её выполнения относится к этапу stage."""
+    def decorator(func):
+        if not settings.timing.enabled:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_methods(stage: str):
+    """Декоратор класса: оборачивает в timed(stage) все его корутины (например, методы репозитория)."""
+    def decorator(cls):
+        for name, attribute in list(vars(cls).items()):
+            if inspect.iscoroutinefunction(attribute) and not name.startswith("__"):
+                setattr(cls, name, timed(stage)(attribute))
+        return cls
+
+    return decorator
+
+
+def format_server_timing(timings: dict[str, float], total: float) -> str:
+    """Значение заголовка Server-Timing, длительности в миллисекундах."""
+    metrics = [f"{stage};dur={duration * 1000:.2f}" for stage, duration in timings.items()]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI-middleware, собирающее время этапов запроса.
+
+    Итоги по этапам пишутся в гистограмму app_request_stage_duration_seconds, а при
+    expose_header=True ещё и в заголовок Server-Timing. Время, потраченное после отправки
+    заголовков (тело потокового ответа), в заголовок попасть не может и учитывается только в метриках.
+    """
+
+    def __init__(self, app: ASGIApp, expose_header: bool = False) -> None:
+        self.app = app
+        self.expose_header = expose_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        timings: dict[str, float] = {}
+        token = _request_timings.set(timings)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.expose_header:
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", format_server_timing(timings, perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            record_stage_durations(timings)
@@ -1,23 +1,85 @@
 import asyncio
+import functools
 import os
 from pathlib import Path
+from time import perf_counter
 from typing import Generator, AsyncGenerator
 
+import asyncpg
 from alembic import command
 from alembic.config import Config as AlembicConfig
-from sqlalchemy import NullPool
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from .core.config import settings, get_alembic_cfg_path, get_project_root
+from .core.metrics import (record_db_pool_checkout, record_db_pool_checkin, record_db_pool_connect, record_db_pool_wait,
+                           DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CAPACITY)
+from .core.query_stats import instrument_engine
 from loguru import logger
 from .models.base_model import mapper_registry
 
+
+def instrument_pool(sync_engine: Engine):
+    """
+    Отдаёт в Prometheus время ожидания соединения из пула, число выданных и открытых соединений.
+
+    Используются только публичные средства SQLAlchemy: события пула checkout / checkin / connect
+    и замер вокруг Engine.connect(), через который соединение берут и сессии, и engine.connect().
+    """
+    pool = sync_engine.pool
+    event.listen(pool, "checkout", lambda dbapi_connection, record, proxy: record_db_pool_checkout())
+    event.listen(pool, "checkin", lambda dbapi_connection, record: record_db_pool_checkin())
+    event.listen(pool, "connect", lambda dbapi_connection, record: record_db_pool_connect())
+
+    connect = sync_engine.connect
+
+    @functools.wraps(connect)
+    def timed_connect():
+        start = perf_counter()
+        try:
+            connection = connect()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        record_db_pool_wait(perf_counter() - start)
+        return connection
+
+    sync_engine.connect = timed_connect
+
+
 db_url = settings.db.db_url
-# подключение к базе
-engine = create_async_engine(url=db_url, echo=True, poolclass=NullPool)
+# подключение к базе: соединения переиспользуются между запросами
+engine = create_async_engine(
+    url=db_url,
+    echo=settings.db.echo,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    connect_args={
+        # кэш asyncpg и кэш подготовленных выражений адаптера SQLAlchemy
+        "statement_cache_size": settings.db.statement_cache_size,
+        "prepared_statement_cache_size": settings.db.statement_cache_size,
+    },
+)
+DB_POOL_CAPACITY.set(settings.db.pool_size + settings.db.max_overflow)
+instrument_engine(engine.sync_engine)
+instrument_pool(engine.sync_engine)
 async_session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=True)
 mapper_registry.configure()
 
+async def create_listener_connection() -> asyncpg.Connection:
+    """Отдельное соединение asyncpg вне пула: LISTEN держит его всё время работы процесса."""
+    return await asyncpg.connect(
+        user=settings.db.db_user,
+        password=settings.db.db_password,
+        host=settings.db.db_host,
+        port=settings.db.db_port,
+        database=settings.db.db_name,
+    )
+
 async def init_alembic():
     # Сохраняем текущую рабочую директорию
     current_working_directory = Path.cwd()
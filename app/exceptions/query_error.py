@@ -0,0 +1,14 @@
+class QueryDebugError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class QueryBudgetExceededError(QueryDebugError):
+    """Запрос выполнил больше SQL-запросов, чем db_settings.max_queries_per_request."""
+
+
+class LazyLoadError(QueryDebugError):
+    """Связь ORM загружена лениво (отдельным запросом при обращении к атрибуту)."""
@@ -0,0 +1,18 @@
+class UploadError(Exception):
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+class UploadConflictError(UploadError):
+    """Другой запрос уже дописывает эту загрузку."""
+
+
+class UploadNotFoundError(UploadError):
+    """Частичного файла загрузки уже нет: её завершил или отменил другой запрос."""
+
+
+class UploadLengthExceededError(UploadError):
+    """Клиент прислал больше байт, чем объявил в Upload-Length."""
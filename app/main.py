@@ -4,17 +4,26 @@ import sys
 
 import uvicorn
 from fastapi import FastAPI
+from loguru import logger
 from fastapi.middleware.cors import CORSMiddleware
 
 from .application import get_app
 from .core.config import settings
+from .core.invalidation import run_invalidation_listener
 from .core.logging import configure_logger
-from .core.metrics import start_metrics_server, metrics_app
+from .core.loop_monitor import run_loop_lag_monitor, start_blocking_call_detector
+from .core.metrics import mark_metrics_process_dead, metrics_app
+from .core.query_stats import QueryStatsMiddleware
+from .core.timing import RequestTimingMiddleware
 from .models.bucket import Bucket
 from .models.object import Object
+from .models.multipart_upload import MultipartUpload, MultipartUploadPart
+from .models.upload_session import UploadSession
 from .models.user import User
 from .db import init_alembic, mapper_registry
 from .middlwares.metrics_middleware import MetricsMiddleware
+from .services.health_service import run_health_monitor
+from .services.upload_cleanup_service import run_upload_garbage_collector
 
 # Add the project root to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -22,7 +31,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 async def configure_app() -> None:
     print("Configuring logger...")
-    configure_logger(enable_json_logs=True, enable_sql_logs=False, level="INFO")
+    configure_logger(enable_json_logs=settings.logging.json_logs, enable_sql_logs=False, level=settings.logging.level,
+                     enqueue=settings.logging.enqueue, sampling=settings.logging.sampling)
     print("Logger configured")
 
     print("Configuring database...")
@@ -34,13 +44,34 @@ async def configure_app() -> None:
 
 async def startup():
     await configure_app()
+    print("Starting upload garbage collector...")
+    app.state.upload_gc_task = asyncio.create_task(run_upload_garbage_collector())
+    print("Starting cache invalidation listener...")
+    app.state.invalidation_task = asyncio.create_task(run_invalidation_listener())
+    print("Starting event loop monitor...")
+    app.state.loop_lag_task = asyncio.create_task(run_loop_lag_monitor())
+    app.state.blocking_detector = start_blocking_call_detector()
+    print("Starting health monitor...")
+    app.state.health_task = asyncio.create_task(run_health_monitor())
     print("starting app...")
 
+async def shutdown():
+    app.state.upload_gc_task.cancel()
+    app.state.invalidation_task.cancel()
+    app.state.health_task.cancel()
+    app.state.loop_lag_task.cancel()
+    if app.state.blocking_detector is not None:
+        app.state.blocking_detector.stop()
+    mark_metrics_process_dead(os.getpid())
+    # дописать сообщения, оставшиеся в очереди фонового обработчика
+    await logger.complete()
+
 app = FastAPI(
     docs_url="/docs",
     openapi_url="/openapi.json",
     redoc_url="/redoc",
     on_startup=[startup],
+    on_shutdown=[shutdown],
     title="NeoBitCloud",
     version="1.0.0"
 )
@@ -64,11 +95,16 @@ print("Add metrics middleware...")
 app.add_middleware(MetricsMiddleware)
 print("Metrics middleware added")
 
+if settings.db.track_request_queries:
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.timing.enabled:
+    app.add_middleware(RequestTimingMiddleware, expose_header=settings.timing.server_timing_header)
+
 print("Mounting FastAPI app...")
 app.mount(settings.app.app_mount, get_app())
 print("FastAPI app mounted")
 
-print("Starting metrics server...")
-start_metrics_server()
+print("Mounting metrics app...")
 app.mount("/metrics", metrics_app)
-print("Metrics server started")
+print("Metrics app mounted")
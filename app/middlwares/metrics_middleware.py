@@ -1,29 +1,69 @@
-from time import time
+from time import perf_counter
 
-from loguru import logger
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
-from starlette.routing import Match
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.metrics import record_request_metrics
 
+# метка для запросов, не попавших ни в один маршрут: иначе каждый неизвестный путь — новый временной ряд
+UNMATCHED_ROUTE = "<unmatched>"
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        start_time = time()
+def get_route_template(scope: Scope, root_path: str) -> str:
+    """
+    Шаблон маршрута вместе с префиксом Mount, например /api/v1/{bucket_name}/{object_key}.
 
-        # Исключаем эндпоинт /metrics из метрик
-        if any(request.url.path == "/metrics" for route in request.app.routes if isinstance(route, Match)):
-            return await call_next(request)
+    FastAPI кладёт совпавший маршрут в scope["route"], а Mount дописывает свой префикс
+    в scope["root_path"]; исходный root_path сервера отбрасывается.
+    """
+    route = scope.get("route")
+    route_path = getattr(route, "path", None)
+    if route_path is None:
+        return UNMATCHED_ROUTE
+    mount_prefix = scope.get("root_path", "")[len(root_path):]
+    return mount_prefix + route_path
 
-        response = await call_next(request)
-        process_time = time() - start_time
 
-        record_request_metrics(request.method, request.url.path, response.status_code, process_time)
+class MetricsMiddleware:
+    """
+    ASGI-middleware метрик запросов: число, время, объём тела запроса и ответа.
 
-        return response
+    Работает поверх receive/send, поэтому не буферизует потоковые ответы и тела загрузок.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_prefixes: tuple[str, ...] = ("/metrics",)) -> None:
+        self.app = app
+        self.excluded_prefixes = excluded_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = perf_counter()
+        root_path = scope.get("root_path", "")
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            elif message["type"] == "http.response.zerocopysend":
+                response_bytes += message.get("count") or 0
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            record_request_metrics(scope["method"], get_route_template(scope, root_path), status_code,
+                                   perf_counter() - start_time, request_bytes, response_bytes)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from .base_model import base_model
@@ -6,11 +6,14 @@ from .base_model import base_model
 class Bucket(base_model):
     __tablename__ = 'bucket'
     id = Column(Integer, primary_key=True,autoincrement=True)
-    bucket_name = Column(String, nullable=False)
-    owner_name = Column(String, nullable=False)
+    bucket_name = Column(String, nullable=False, unique=True, index=True)
+    owner_name = Column(String, nullable=False, index=True)
     owner_id = Column(Integer, ForeignKey("user.id"))
     created_at = Column(DateTime, nullable=False)
     updated_at = Column(DateTime, nullable=True)
+    # статистика обновляется в той же транзакции, что и записи object
+    file_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_size = Column(BigInteger, nullable=False, default=0, server_default="0")
 
     owner = relationship("User", back_populates="buckets")
     objects = relationship("Object", back_populates="bucket")
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from .base_model import base_model
+
+class MultipartUpload(base_model):
+    __tablename__ = 'multipart_upload'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    upload_id = Column(String, unique=True, index=True, nullable=False)
+    object_key = Column(String, nullable=False)
+    owner_name = Column(String, nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"))
+    bucket_name = Column(String, nullable=False)
+    bucket_id = Column(Integer, ForeignKey("bucket.id", ondelete="CASCADE"))
+    extension = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    # время последней активности (создание или загрузка части), от него отсчитывается TTL
+    updated_at = Column(DateTime, nullable=False, index=True)
+
+    parts = relationship("MultipartUploadPart", back_populates="upload", cascade="all, delete-orphan",
+                         passive_deletes=True)
+
+class MultipartUploadPart(base_model):
+    __tablename__ = 'multipart_upload_part'
+    __table_args__ = (UniqueConstraint("upload_id", "part_number"),)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    upload_id = Column(Integer, ForeignKey("multipart_upload.id", ondelete="CASCADE"), nullable=False)
+    part_number = Column(Integer, nullable=False)
+    etag = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    file_storage_path = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    upload = relationship("MultipartUpload", back_populates="parts")
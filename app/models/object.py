@@ -1,12 +1,21 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from .base_model import base_model
 
 class Object(base_model):
     __tablename__ = 'object'
+    __table_args__ = (
+        # один ключ в бакете — одна запись; по этому же индексу ищется объект при перезаписи
+        Index("ux_object_bucket_id_object_key", "bucket_id", "object_key", unique=True),
+        # read_object / delete_object / get_all_objects фильтруют по владельцу, бакету и ключу
+        Index("ix_object_owner_name_bucket_name_object_key", "owner_name", "bucket_name", "object_key"),
+        # листинг всех объектов владельца: фильтр по owner_name, keyset-порядок (bucket_id, object_key)
+        Index("ix_object_owner_name_bucket_id_object_key", "owner_name", "bucket_id", "object_key"),
+    )
     id = Column(Integer, primary_key=True,autoincrement=True)
-    object_key = Column(String, nullable=False)
+    # побайтовая сортировка: листинг по префиксу и keyset-пагинация идут по индексу
+    object_key = Column(String(collation="C"), nullable=False)
     file_storage_path = Column(String, nullable=False)
     owner_name = Column(String, nullable=False)
     owner_id = Column(Integer, ForeignKey("user.id"))
@@ -16,7 +25,7 @@ class Object(base_model):
     updated_at = Column(DateTime, nullable=False)
     extension = Column(String, nullable=True)
     download_url = Column(String, nullable=False)
-    size = Column(Integer, nullable=False)
+    size = Column(BigInteger, nullable=False)
 
     owner = relationship("User", back_populates="objects")
     bucket = relationship("Bucket", back_populates="objects")
\ No newline at end of file
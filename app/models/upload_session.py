@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+
+from .base_model import base_model
+
+class UploadSession(base_model):
+    __tablename__ = 'upload_session'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, unique=True, index=True, nullable=False)
+    object_key = Column(String, nullable=False)
+    owner_name = Column(String, nullable=False)
+    owner_id = Column(Integer, ForeignKey("user.id"))
+    bucket_name = Column(String, nullable=False)
+    bucket_id = Column(Integer, ForeignKey("bucket.id", ondelete="CASCADE"))
+    extension = Column(String, nullable=True)
+    upload_length = Column(BigInteger, nullable=False)
+    upload_offset = Column(BigInteger, nullable=False, default=0)
+    file_storage_path = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,22 +1,26 @@
-import os
 from datetime import datetime
-from pathlib import Path
 from typing import List, Optional
 
 from loguru import logger
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, update
 from sqlalchemy.future import select
 
 from ..db import get_db
+from ..core.cache import bucket_cache
 from ..core.config import settings
+from ..core.invalidation import publish_invalidation
+from ..core.timing import DB_STAGE, timed_methods
 from ..exceptions.sql_error import SqlError
 from ..models.bucket import Bucket
+from ..models.object import Object
 from ..repositories.user_repository import UserRepository, get_user_repository
 from ..schemas import BucketResponse
 
 root_dir = settings.fileStorage.root_dir
 
+@timed_methods(DB_STAGE)
 class BucketRepository:
     def __init__(self, session: AsyncSession, user_repo: UserRepository):
         self.session = session
@@ -35,7 +39,9 @@ class BucketRepository:
                 self.session.add(existing_bucket)
                 await self.session.flush()
                 bucket_schema = BucketResponse.model_validate(existing_bucket)
+                await publish_invalidation(self.session, bucket_cache.name, bucket_name)
                 await self.session.commit()
+                bucket_cache.invalidate(bucket_name)
 
                 logger.info(f"Bucket '{bucket_name}' updated successfully.")
                 return bucket_schema
@@ -52,7 +58,9 @@ class BucketRepository:
                 self.session.add(new_bucket)
                 await self.session.flush()
                 bucket_schema = BucketResponse.model_validate(new_bucket)
+                await publish_invalidation(self.session, bucket_cache.name, bucket_name)
                 await self.session.commit()
+                bucket_cache.invalidate(bucket_name)
                 logger.info(f"Bucket '{bucket_name}' created successfully.")
                 return bucket_schema
         except Exception as e:
@@ -73,7 +81,9 @@ class BucketRepository:
 
             if bucket:
                 await self.session.delete(bucket)
+                await publish_invalidation(self.session, bucket_cache.name, bucket_name)
                 await self.session.commit()
+                bucket_cache.invalidate(bucket_name)
                 logger.info(f"Bucket '{bucket_name}' deleted successfully by '{owner_username}'.")
                 return True
             else:
@@ -115,12 +125,26 @@ class BucketRepository:
             logger.error(f"Error reading bucket: {e}")
             raise SqlError(f"Error reading bucket: {e}")
 
-    async def get_bucket_by_name(self, bucket_name: str) -> BucketResponse:
+    async def get_bucket_by_name(self, bucket_name: str) -> Optional[BucketResponse]:
+        """
+        Бакет по имени через кэш: обработчики объектов проверяют по нему владельца.
+
+        Запись сбрасывается create_bucket / delete_bucket во всех процессах; file_count и size
+        в ответе могут отставать на время жизни записи — актуальные отдаёт get_buckets_by_owner.
+        """
+        cached_bucket = bucket_cache.get(bucket_name)
+        if cached_bucket is not None:
+            return cached_bucket.model_copy()
         try:
             result = await self.session.execute(select(Bucket).where(Bucket.bucket_name == bucket_name))
             bucket = result.scalars().first()
+            if bucket is None:
+                logger.warning(f"Bucket '{bucket_name}' not found.")
+                return None
+            bucket_schema = BucketResponse.model_validate(bucket)
+            bucket_cache.set(bucket_name, bucket_schema)
             logger.info(f"Bucket '{bucket_name}' found successfully.")
-            return BucketResponse.model_validate(bucket)
+            return bucket_schema.model_copy()
         except Exception as e:
             await self.session.rollback()
             logger.error(f"Error getting bucket by name: {e}")
@@ -132,13 +156,6 @@ class BucketRepository:
             result = await self.session.execute(select(Bucket).where(Bucket.owner_name == owner_username))
             buckets = result.scalars().all()
             bucket_schemas = [BucketResponse.model_validate(bucket) for bucket in buckets]
-            for bucket_schema in bucket_schemas:
-                bucket_schema.file_count = 0
-                bucket_schema.size = 0
-                path = Path(os.path.join(root_dir, bucket_schema.bucket_name)).expanduser()
-                if path.exists():
-                    bucket_schema.file_count = count_files_recursive(path)
-                    bucket_schema.size = get_directory_size(path)
             logger.info(f"Buckets by owner '{owner_username}' found successfully.")
             return bucket_schemas
         except Exception as e:
@@ -146,25 +163,34 @@ class BucketRepository:
             logger.error(f"Error getting buckets by owner: {e}")
             raise SqlError(f"Error getting buckets by owner: {e}")
 
+    async def recompute_statistics(self, bucket_name: Optional[str] = None) -> int:
+        """
+        Пересчитывает file_count и total_size по таблице object.
+
+        Нужен, если счётчики разошлись с данными (ручные правки БД, старые записи).
+        Возвращает количество обновлённых бакетов.
+        """
+        try:
+            object_count = (
+                select(func.count(Object.id)).where(Object.bucket_id == Bucket.id).scalar_subquery()
+            )
+            object_size = (
+                select(func.coalesce(func.sum(Object.size), 0)).where(Object.bucket_id == Bucket.id).scalar_subquery()
+            )
+            statement = update(Bucket).values(file_count=object_count, total_size=object_size)
+            if bucket_name is not None:
+                statement = statement.where(Bucket.bucket_name == bucket_name)
+            result = await self.session.execute(statement)
+            await self.session.commit()
+            logger.info(f"Statistics recomputed for {result.rowcount} buckets.")
+            return result.rowcount
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error recomputing bucket statistics: {e}")
+            raise SqlError(f"Error recomputing bucket statistics: {e}")
+
 async def get_bucket_repository(
     session: AsyncSession = Depends(get_db),
     user_repo: UserRepository = Depends(get_user_repository)
 ) -> BucketRepository:
     return BucketRepository(session=session, user_repo=user_repo)
-
-def count_files_recursive(directory):
-    """Считает количество файлов в указанной директории, включая вложенные папки."""
-    count = 0
-    for root, _, files in os.walk(directory):
-        count += len(files)
-    return count
-
-
-def get_directory_size(directory):
-    """Считает размер директории, включая все вложенные файлы и папки."""
-    total_size = 0
-    for root, _, files in os.walk(directory):
-        for file in files:
-            file_path = os.path.join(root, file)
-            total_size += os.path.getsize(file_path)
-    return total_size
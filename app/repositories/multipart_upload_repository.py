@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import Depends
+from loguru import logger
+from sqlalchemy import select, delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.timing import DB_STAGE, timed_methods
+from ..db import get_db
+from ..exceptions.sql_error import SqlError
+from ..models.multipart_upload import MultipartUpload, MultipartUploadPart
+from ..schemas.multipart_upload_schema import MultipartUploadResponse
+
+
+@timed_methods(DB_STAGE)
+class MultipartUploadRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_upload(self, upload_id: str, bucket_id: int, bucket_name: str, object_key: str,
+                            owner_id: int, owner_name: str, extension: str) -> MultipartUploadResponse:
+        try:
+            upload = MultipartUpload(
+                upload_id=upload_id,
+                bucket_id=bucket_id,
+                bucket_name=bucket_name,
+                object_key=object_key,
+                owner_id=owner_id,
+                owner_name=owner_name,
+                extension=extension,
+                created_at=datetime.now(),
+                updated_at=datetime.now()
+            )
+            self.session.add(upload)
+            await self.session.flush()
+            upload_schema = MultipartUploadResponse.model_validate(upload)
+            await self.session.commit()
+            logger.info(f"Multipart upload '{upload_id}' for '{object_key}' in bucket '{bucket_name}' initiated.")
+            return upload_schema
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error creating multipart upload: {e}")
+            raise SqlError(f"Error creating multipart upload: {e}")
+
+    async def get_upload(self, upload_id: str, bucket_name: str, object_key: str,
+                         owner_name: str) -> Optional[MultipartUpload]:
+        try:
+            result = await self.session.execute(
+                select(MultipartUpload).where(
+                    MultipartUpload.upload_id == upload_id,
+                    MultipartUpload.bucket_name == bucket_name,
+                    MultipartUpload.object_key == object_key,
+                    MultipartUpload.owner_name == owner_name
+                )
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading multipart upload: {e}")
+            raise SqlError(f"Error reading multipart upload: {e}")
+
+    async def save_part(self, upload_pk: int, part_number: int, etag: str, size: int, path: str) -> None:
+        """
+        Сохраняет часть; повторная загрузка той же части перезаписывает запись о ней.
+
+        Заодно отмечает активность загрузки, чтобы сборщик не удалил её, пока приходят части.
+        """
+        try:
+            values = dict(etag=etag, size=size, file_storage_path=path, created_at=datetime.now())
+            statement = insert(MultipartUploadPart).values(upload_id=upload_pk, part_number=part_number, **values)
+            statement = statement.on_conflict_do_update(
+                index_elements=[MultipartUploadPart.upload_id, MultipartUploadPart.part_number],
+                set_=values
+            )
+            await self.session.execute(statement)
+            await self.session.execute(
+                update(MultipartUpload).where(MultipartUpload.id == upload_pk).values(updated_at=datetime.now())
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error saving multipart upload part: {e}")
+            raise SqlError(f"Error saving multipart upload part: {e}")
+
+    async def get_parts(self, upload_pk: int) -> List[MultipartUploadPart]:
+        try:
+            result = await self.session.execute(
+                select(MultipartUploadPart)
+                .where(MultipartUploadPart.upload_id == upload_pk)
+                .order_by(MultipartUploadPart.part_number)
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading multipart upload parts: {e}")
+            raise SqlError(f"Error reading multipart upload parts: {e}")
+
+    async def delete_upload(self, upload_pk: int) -> None:
+        try:
+            await self.session.execute(delete(MultipartUpload).where(MultipartUpload.id == upload_pk))
+            await self.session.commit()
+            logger.info(f"Multipart upload #{upload_pk} removed.")
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error deleting multipart upload: {e}")
+            raise SqlError(f"Error deleting multipart upload: {e}")
+
+    async def get_stale_uploads(self, inactive_since: datetime, limit: int) -> List[Tuple[int, str]]:
+        """Возвращает (id, upload_id) незавершённых загрузок без активности с inactive_since."""
+        try:
+            result = await self.session.execute(
+                select(MultipartUpload.id, MultipartUpload.upload_id)
+                .where(MultipartUpload.updated_at < inactive_since)
+                .order_by(MultipartUpload.updated_at)
+                .limit(limit)
+            )
+            return [(row.id, row.upload_id) for row in result]
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading stale multipart uploads: {e}")
+            raise SqlError(f"Error reading stale multipart uploads: {e}")
+
+
+async def get_multipart_upload_repository(session: AsyncSession = Depends(get_db)) -> MultipartUploadRepository:
+    return MultipartUploadRepository(session)
@@ -1,12 +1,19 @@
+import base64
+import json
+from typing import AsyncIterator, NamedTuple, Optional, Sequence
+
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import RowMapping, case, func, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from loguru import logger
 
 from ..core.config import settings
-from ..db import get_db
+from ..core.timing import DB_STAGE, timed_methods
+from ..db import get_db, async_session_factory
 from ..exceptions.sql_error import SqlError
+from ..models.bucket import Bucket
 from ..models.object import Object
 from ..repositories.bucket_repository import BucketRepository, get_bucket_repository
 from ..repositories.user_repository import UserRepository, get_user_repository
@@ -14,6 +21,50 @@ from ..schemas.object_schema import ObjectResponse
 
 root_dir = settings.fileStorage.root_dir
 
+
+class ListMarker(NamedTuple):
+    """
+    Позиция keyset-пагинации листинга: последняя выданная пара (bucket_id, object_key).
+
+    При skip_prefix=True object_key — общий префикс («папка»), и всё под ним уже выдано.
+    """
+    bucket_id: int
+    object_key: str
+    skip_prefix: bool = False
+
+    def to_token(self) -> str:
+        payload = json.dumps([self.bucket_id, self.object_key, self.skip_prefix], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def from_token(cls, token: str) -> "ListMarker":
+        """Разбирает continuation token; ValueError, если токен повреждён."""
+        try:
+            bucket_id, object_key, skip_prefix = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid continuation token") from e
+        if not (isinstance(bucket_id, int) and isinstance(object_key, str) and isinstance(skip_prefix, bool)):
+            raise ValueError("Invalid continuation token")
+        return cls(bucket_id, object_key, skip_prefix)
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Наименьшая строка, которая больше всех строк с данным префиксом (в порядке COLLATE "C").
+
+    None — такой строки нет, ограничивать диапазон сверху не нужно.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+@timed_methods(DB_STAGE)
 class ObjectRepository:
     def __init__(self, session: AsyncSession, user_repo: UserRepository, bucket_repo: BucketRepository):
         self.session = session
@@ -28,9 +79,8 @@ class ObjectRepository:
             )
             objects = objects.scalars().all()
 
-            # Log each object's attributes
-            for obj in objects:
-                logger.debug(f"Object data: {vars(obj)}")
+            # Log each object's attributes (строка собирается, только если DEBUG включён)
+            logger.opt(lazy=True).debug("Objects data: {}", lambda: [vars(obj) for obj in objects])
 
             try:
                 object_schemas = [ObjectResponse.model_validate(obj) for obj in objects]
@@ -38,7 +88,7 @@ class ObjectRepository:
                 logger.error(f"Validation error: {e}")
                 raise
 
-            logger.info(f"Objects in bucket '{bucket_name}' found successfully.")
+            logger.info("Objects in bucket '{}' found successfully.", bucket_name)
             return object_schemas
 
         except Exception as e:
@@ -47,27 +97,77 @@ class ObjectRepository:
             raise SqlError(f"Error getting all objects: {e}")
 
 
-    async def create_object(self, bucket_name: str, object_key: str, owner_name: str, extension_without_dot: str,
-                            path: str, download_url:str, size: int):
+    async def list_objects(self, username: str, bucket_id: Optional[int] = None, prefix: str = "",
+                           delimiter: Optional[str] = None, max_keys: int = 1000,
+                           marker: Optional[ListMarker] = None
+                           ) -> tuple[list[ObjectResponse], list[str], Optional[ListMarker]]:
+        """
+        Постраничный листинг в стиле ListObjectsV2 с keyset-пагинацией по (bucket_id, object_key).
+
+        Ключи, у которых после prefix встречается delimiter, сворачиваются в общие префиксы;
+        каждый префикс занимает одно место из max_keys. Возвращает объекты, общие префиксы
+        и позицию следующей страницы (None, если листинг закончен).
+        """
         try:
-            user= await self.user_repo.get_user(owner_name)
-            bucket = await self.bucket_repo.read_bucket(bucket_name)
-            new_object = Object(
-                bucket_id=bucket.id,
-                bucket_name=bucket_name,
-                object_key=object_key,
-                owner_id=user.id,
-                owner_name=user.username,
-                file_storage_path=path,
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
-                download_url=download_url,
-                size=size,
-                extension=extension_without_dot
+            contents: list[ObjectResponse] = []
+            common_prefixes: list[str] = []
+            while True:
+                limit = max_keys - len(contents) - len(common_prefixes) + 1
+                rows = await self._fetch_objects_after(username, bucket_id, prefix, marker, limit)
+                for obj in rows:
+                    if (marker is not None and marker.skip_prefix and obj.bucket_id == marker.bucket_id
+                            and obj.object_key.startswith(marker.object_key)):
+                        continue
+                    if len(contents) + len(common_prefixes) == max_keys:
+                        return contents, common_prefixes, marker
+
+                    rest = obj.object_key[len(prefix):]
+                    if delimiter and delimiter in rest:
+                        common_prefix = prefix + rest[:rest.index(delimiter) + len(delimiter)]
+                        if common_prefix not in common_prefixes:
+                            common_prefixes.append(common_prefix)
+                        marker = ListMarker(obj.bucket_id, common_prefix, skip_prefix=True)
+                    else:
+                        contents.append(ObjectResponse.model_validate(obj))
+                        marker = ListMarker(obj.bucket_id, obj.object_key)
+
+                if len(rows) < limit:
+                    return contents, common_prefixes, None
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error listing objects: {e}")
+            raise SqlError(f"Error listing objects: {e}")
+
+    async def _fetch_objects_after(self, username: str, bucket_id: Optional[int], prefix: str,
+                                   marker: Optional[ListMarker], limit: int) -> list[Object]:
+        query = select(Object).where(*object_listing_filters(username, bucket_id, prefix))
+        if marker is not None:
+            position = tuple_(Object.bucket_id, Object.object_key)
+            if not marker.skip_prefix:
+                query = query.where(position > tuple_(marker.bucket_id, marker.object_key))
+            elif (upper := prefix_upper_bound(marker.object_key)) is not None:
+                query = query.where(position >= tuple_(marker.bucket_id, upper))
+            else:
+                query = query.where(Object.bucket_id > marker.bucket_id)
+
+        result = await self.session.execute(query.order_by(Object.bucket_id, Object.object_key).limit(limit))
+        return list(result.scalars().all())
+
+    async def create_object(self, bucket_id: int, bucket_name: str, object_key: str, owner_id: int, owner_name: str,
+                            extension_without_dot: str, path: str, download_url: str, size: int):
+        """
+        Записывает объект одним запросом и одним коммитом.
+
+        Пользователь и бакет уже известны вызывающему коду, поэтому повторно не читаются.
+        Запись — upsert по (bucket_id, object_key); в том же запросе сдвигается статистика бакета.
+        """
+        try:
+            await self.session.execute(
+                build_object_upsert(bucket_id, bucket_name, object_key, owner_id, owner_name,
+                                    extension_without_dot, path, download_url, size)
             )
-            self.session.add(new_object)
             await self.session.commit()
-            logger.info(f"Object '{object_key}' in bucket '{bucket_name}' created successfully.")
+            logger.info("Object '{}' in bucket '{}' saved successfully.", object_key, bucket_name)
         except Exception as e:
             await self.session.rollback()
             logger.error(f"Error creating object: {e}")
@@ -91,6 +191,18 @@ class ObjectRepository:
             logger.error(f"Error reading object: {e}")
             raise SqlError(f"Error reading object: {e}")
 
+    async def get_storage_path(self, bucket_id: int, object_key: str) -> Optional[str]:
+        """Ключ содержимого объекта в хранилище (file_storage_path) — одна строка по ux_object_bucket_id_object_key."""
+        try:
+            result = await self.session.execute(
+                select(Object.file_storage_path).where(Object.bucket_id == bucket_id, Object.object_key == object_key)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading object storage path: {e}")
+            raise SqlError(f"Error reading object storage path: {e}")
+
     async def update_object(self, bucket_name: str, object_key: str, content: str):
         try:
             object_to_update = await self.session.execute(
@@ -102,7 +214,7 @@ class ObjectRepository:
                 object.content = content
                 object.updated_at = datetime.now()
                 await self.session.commit()
-                logger.info(f"Object '{object_key}' in bucket '{bucket_name}' updated successfully.")
+                logger.info("Object '{}' in bucket '{}' updated successfully.", object_key, bucket_name)
             else:
                 logger.warning(f"Object '{object_key}' in bucket '{bucket_name}' not found.")
         except Exception as e:
@@ -123,9 +235,10 @@ class ObjectRepository:
             object_record = object_record.scalar_one_or_none()
 
             if object_record:
+                await self._update_bucket_statistics(object_record.bucket_id, -1, -object_record.size)
                 await self.session.delete(object_record)
                 await self.session.commit()
-                logger.info(f"Object '{object_key}' in bucket '{bucket_name}' deleted from database.")
+                logger.info("Object '{}' in bucket '{}' deleted from database.", object_key, bucket_name)
                 return True
             else:
                 logger.warning(f"Object '{object_key}' not found in database.")
@@ -136,6 +249,122 @@ class ObjectRepository:
             raise SqlError(f"Error deleting object: {e}")
 
 
+    async def _update_bucket_statistics(self, bucket_id: int, file_count_delta: int, size_delta: int):
+        """Сдвигает счётчики бакета в текущей транзакции; коммит делает вызывающий метод."""
+        await self.session.execute(
+            update(Bucket)
+            .where(Bucket.id == bucket_id)
+            .values(
+                file_count=Bucket.file_count + file_count_delta,
+                total_size=Bucket.total_size + size_delta,
+            )
+        )
+
+def build_object_upsert(bucket_id: int, bucket_name: str, object_key: str, owner_id: int, owner_name: str,
+                        extension_without_dot: str, path: str, download_url: str, size: int):
+    """
+    Один оператор: WITH previous (старый размер), upserted (INSERT ... ON CONFLICT DO UPDATE)
+    UPDATE bucket — file_count растёт только при вставке, total_size сдвигается на разницу размеров.
+
+    Все части видят один снимок, поэтому previous содержит строку до перезаписи.
+    При гонке параллельных записей одного ключа статистика может разойтись —
+    её пересчитывает cli.py recompute-bucket-stats.
+    """
+    now = datetime.now()
+    previous = (
+        select(Object.size)
+        .where(Object.bucket_id == bucket_id, Object.object_key == object_key)
+        .cte("previous")
+    )
+    insert_stmt = pg_insert(Object).values(
+        bucket_id=bucket_id,
+        bucket_name=bucket_name,
+        object_key=object_key,
+        owner_id=owner_id,
+        owner_name=owner_name,
+        file_storage_path=path,
+        created_at=now,
+        updated_at=now,
+        download_url=download_url,
+        size=size,
+        extension=extension_without_dot,
+    )
+    upserted = (
+        insert_stmt.on_conflict_do_update(
+            index_elements=[Object.bucket_id, Object.object_key],
+            set_={
+                "owner_id": insert_stmt.excluded.owner_id,
+                "owner_name": insert_stmt.excluded.owner_name,
+                "file_storage_path": insert_stmt.excluded.file_storage_path,
+                "updated_at": insert_stmt.excluded.updated_at,
+                "download_url": insert_stmt.excluded.download_url,
+                "size": insert_stmt.excluded.size,
+                "extension": insert_stmt.excluded.extension,
+            },
+        )
+        # xmax = 0 только у только что вставленной строки
+        .returning(literal_column("xmax = 0").label("inserted"))
+        .cte("upserted")
+    )
+    inserted = select(upserted.c.inserted).scalar_subquery()
+    previous_size = func.coalesce(select(previous.c.size).scalar_subquery(), 0)
+    return (
+        update(Bucket)
+        .where(Bucket.id == bucket_id)
+        .values(
+            file_count=Bucket.file_count + case((inserted, 1), else_=0),
+            total_size=Bucket.total_size + size - previous_size,
+        )
+        .add_cte(previous)
+        .add_cte(upserted)
+    )
+
+
+def object_listing_filters(username: str, bucket_id: Optional[int], prefix: str) -> list:
+    filters = [Object.owner_name == username]
+    if bucket_id is not None:
+        filters.append(Object.bucket_id == bucket_id)
+    if prefix:
+        # object_key в COLLATE "C": диапазон [prefix, upper) равен LIKE 'prefix%' и идёт по индексу
+        filters.append(Object.object_key >= prefix)
+        upper = prefix_upper_bound(prefix)
+        if upper is not None:
+            filters.append(Object.object_key < upper)
+    return filters
+
+
+# столбцы ObjectResponse; при потоковой выдаче строки сериализуются напрямую, без ORM и Pydantic
+OBJECT_LISTING_COLUMNS = (
+    Object.id, Object.object_key, Object.owner_id, Object.owner_name, Object.download_url, Object.size,
+    Object.bucket_id, Object.bucket_name, Object.extension, Object.created_at, Object.updated_at,
+    Object.file_storage_path,
+)
+
+
+async def stream_object_rows(username: str, bucket_id: Optional[int] = None, prefix: str = "",
+                             batch_size: int = 1000) -> AsyncIterator[Sequence[RowMapping]]:
+    """
+    Читает объекты серверным курсором пачками по batch_size в порядке (bucket_id, object_key).
+
+    Открывает собственную сессию: зависимость get_db закрывается раньше, чем
+    StreamingResponse начинает отдавать тело ответа.
+    """
+    query = (
+        select(*OBJECT_LISTING_COLUMNS)
+        .where(*object_listing_filters(username, bucket_id, prefix))
+        .order_by(Object.bucket_id, Object.object_key)
+        .execution_options(yield_per=batch_size)
+    )
+    async with async_session_factory() as session:
+        try:
+            result = await session.stream(query)
+            async for partition in result.mappings().partitions():
+                yield partition
+        except Exception as e:
+            logger.error(f"Error streaming objects: {e}")
+            raise SqlError(f"Error streaming objects: {e}")
+
+
 async def get_object_repository(session: AsyncSession = Depends(get_db),
                                 user_repo: UserRepository = Depends(get_user_repository),
                                 bucket_repo: BucketRepository = Depends(get_bucket_repository)) -> ObjectRepository:
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from fastapi import Depends
+from loguru import logger
+from sqlalchemy import select, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.timing import DB_STAGE, timed_methods
+from ..db import get_db
+from ..exceptions.sql_error import SqlError
+from ..models.upload_session import UploadSession
+from ..schemas.upload_session_schema import UploadSessionResponse
+
+
+@timed_methods(DB_STAGE)
+class UploadSessionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_session(self, session_id: str, bucket_id: int, bucket_name: str, object_key: str,
+                             owner_id: int, owner_name: str, extension: str, upload_length: int,
+                             path: str, expires_at: datetime) -> UploadSessionResponse:
+        try:
+            upload_session = UploadSession(
+                session_id=session_id,
+                bucket_id=bucket_id,
+                bucket_name=bucket_name,
+                object_key=object_key,
+                owner_id=owner_id,
+                owner_name=owner_name,
+                extension=extension,
+                upload_length=upload_length,
+                upload_offset=0,
+                file_storage_path=path,
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                expires_at=expires_at
+            )
+            self.session.add(upload_session)
+            await self.session.flush()
+            session_schema = UploadSessionResponse.model_validate(upload_session)
+            await self.session.commit()
+            logger.info(f"Upload session '{session_id}' for '{object_key}' in bucket '{bucket_name}' created.")
+            return session_schema
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error creating upload session: {e}")
+            raise SqlError(f"Error creating upload session: {e}")
+
+    async def get_session(self, session_id: str, bucket_name: str, object_key: str,
+                          owner_name: str) -> Optional[UploadSession]:
+        try:
+            result = await self.session.execute(
+                select(UploadSession).where(
+                    UploadSession.session_id == session_id,
+                    UploadSession.bucket_name == bucket_name,
+                    UploadSession.object_key == object_key,
+                    UploadSession.owner_name == owner_name
+                ).execution_options(populate_existing=True)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading upload session: {e}")
+            raise SqlError(f"Error reading upload session: {e}")
+
+    async def update_offset(self, session_pk: int, expected_offset: int, upload_offset: int,
+                            expires_at: datetime) -> bool:
+        """Сдвигает смещение, только если в БД всё ещё expected_offset; False — его уже сдвинул другой запрос."""
+        try:
+            result = await self.session.execute(
+                update(UploadSession)
+                .where(UploadSession.id == session_pk, UploadSession.upload_offset == expected_offset)
+                .values(upload_offset=upload_offset, expires_at=expires_at, updated_at=datetime.now())
+            )
+            await self.session.commit()
+            return result.rowcount == 1
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error updating upload session offset: {e}")
+            raise SqlError(f"Error updating upload session offset: {e}")
+
+    async def delete_session(self, session_pk: int) -> None:
+        try:
+            await self.session.execute(delete(UploadSession).where(UploadSession.id == session_pk))
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error deleting upload session: {e}")
+            raise SqlError(f"Error deleting upload session: {e}")
+
+    async def get_expired_sessions(self, now: datetime, limit: int) -> List[Tuple[int, str]]:
+        """Возвращает (id, путь к частичному файлу) для просроченных сессий."""
+        try:
+            result = await self.session.execute(
+                select(UploadSession.id, UploadSession.file_storage_path)
+                .where(UploadSession.expires_at < now)
+                .order_by(UploadSession.expires_at)
+                .limit(limit)
+            )
+            return [(row.id, row.file_storage_path) for row in result]
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error reading expired upload sessions: {e}")
+            raise SqlError(f"Error reading expired upload sessions: {e}")
+
+
+async def get_upload_session_repository(session: AsyncSession = Depends(get_db)) -> UploadSessionRepository:
+    return UploadSessionRepository(session)
@@ -4,6 +4,9 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update
+from ..core.cache import principal_cache
+from ..core.invalidation import publish_invalidation
+from ..core.timing import DB_STAGE, timed_methods
 from ..models.user import User
 from ..db import get_db
 from fastapi import Depends
@@ -14,6 +17,7 @@ from ..schemas.user_schema import UserResponse
 
 logger = structlog.get_logger()
 
+@timed_methods(DB_STAGE)
 class UserRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -55,7 +59,9 @@ class UserRepository:
             if user:
                 user.email = email
                 user.password = password
+                await publish_invalidation(self.session, principal_cache.name, username)
                 await self.session.commit()
+                principal_cache.invalidate(username)
                 logger.info(f"User '{username}' updated successfully.")
                 return user
         except Exception as e:
@@ -68,7 +74,9 @@ class UserRepository:
             user = await self.get_user(username)
             if user:
                 await self.session.delete(user)
+                await publish_invalidation(self.session, principal_cache.name, username)
                 await self.session.commit()
+                principal_cache.invalidate(username)
                 logger.info(f"User '{username}' deleted successfully.")
                 return True
 
@@ -81,9 +89,14 @@ class UserRepository:
 
 
     async def revoke_user_token(self, user_id: int):
-        query = update(User).where(User.id == user_id).values(is_active=False)
-        await self.session.execute(query)
+        query = update(User).where(User.id == user_id).values(is_active=False).returning(User.username)
+        result = await self.session.execute(query)
+        username = result.scalar_one_or_none()
+        if username is not None:
+            await publish_invalidation(self.session, principal_cache.name, username)
         await self.session.commit()
+        if username is not None:
+            principal_cache.invalidate(username)
 
 
 async def get_user_repository(session: AsyncSession = Depends(get_db)) -> UserRepository:
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict
 from datetime import datetime
 
 class BucketBase(BaseModel):
@@ -26,7 +26,11 @@ class BucketMetadata(BaseModel):
 class BucketStatistics(BaseModel):
     """Model for bucket statistics."""
     file_count: Optional[int] = Field(None, description="Number of files in the bucket")
-    size: Optional[int] = Field(None, description="Total size of files in the bucket in bytes")
+    size: Optional[int] = Field(
+        None,
+        description="Total size of files in the bucket in bytes",
+        validation_alias=AliasChoices("size", "total_size"),
+    )
     model_config = ConfigDict(from_attributes=True, json_schema_extra={"description": "Bucket Statistics Model"})
 
 class BucketCreate(BucketBase):
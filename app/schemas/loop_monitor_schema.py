@@ -0,0 +1,11 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class LoopStallResponse(BaseModel):
+    """Model for an event loop stall caught by the blocking-call detector."""
+    captured_at: datetime
+    duration_seconds: float
+    stack: Optional[str] = Field(None, description="Stack of the event loop thread while it was blocked")
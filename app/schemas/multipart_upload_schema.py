@@ -0,0 +1,32 @@
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+class MultipartUploadResponse(BaseModel):
+    """Model for an initiated multipart upload."""
+    upload_id: str = Field(..., description="Identifier of the multipart upload")
+    bucket_name: str
+    object_key: str
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True, json_schema_extra={"description": "Multipart Upload Model"})
+
+
+class MultipartUploadPartResponse(BaseModel):
+    """Model for an uploaded part of a multipart upload."""
+    part_number: int = Field(..., description="Number of the part, starting from 1")
+    etag: str = Field(..., description="Entity tag of the uploaded part")
+    size: int = Field(..., description="Size of the part in bytes")
+    model_config = ConfigDict(from_attributes=True, json_schema_extra={"description": "Multipart Upload Part Model"})
+
+
+class CompletedPart(BaseModel):
+    """Model for a part referenced when completing a multipart upload."""
+    part_number: int = Field(..., ge=1, le=10000, description="Number of the part")
+    etag: str = Field(..., description="Entity tag returned when the part was uploaded")
+
+
+class CompleteMultipartUpload(BaseModel):
+    """Model for completing a multipart upload."""
+    parts: List[CompletedPart] = Field(..., min_length=1, description="Parts in ascending order of part number")
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, HttpUrl, ConfigDict, Field
 from datetime import datetime
 
@@ -39,3 +41,17 @@ class ObjectLink(BaseModel):
     object_key: str
     bucket_name: str
     download_url: HttpUrl = Field(..., description="Download URL for the object")
+
+
+class ListObjectsResponse(BaseModel):
+    """ListObjectsV2-style page of objects."""
+    name: Optional[str] = Field(None, description="Bucket name, empty when listing across all buckets")
+    prefix: str = Field("", description="Only keys starting with this prefix are listed")
+    delimiter: Optional[str] = Field(None, description="Keys containing the delimiter after the prefix are grouped")
+    max_keys: int = Field(..., description="Maximum number of objects and common prefixes in the page")
+    key_count: int = Field(..., description="Number of objects and common prefixes in the page")
+    is_truncated: bool = Field(..., description="Whether more results are available")
+    contents: List[ObjectResponse] = Field(default_factory=list)
+    common_prefixes: List[str] = Field(default_factory=list, description="Grouped key prefixes (\"folders\")")
+    continuation_token: Optional[str] = None
+    next_continuation_token: Optional[str] = Field(None, description="Pass as continuation-token to get the next page")
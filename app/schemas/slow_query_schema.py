@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SlowQueryResponse(BaseModel):
+    """Model for a captured slow SQL statement."""
+    captured_at: datetime
+    fingerprint: str = Field(..., description="Statement fingerprint, also used as the Prometheus label")
+    duration_seconds: float
+    statement: str
+    parameters: List[Any] = Field(..., description="Bind parameters with non-numeric values redacted")
+    plan: Optional[str] = Field(None, description="EXPLAIN output with string literals redacted, filled in asynchronously after capture")
+    plan_error: Optional[str] = None
+
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+class UploadSessionResponse(BaseModel):
+    """Model for a resumable upload session."""
+    session_id: str = Field(..., description="Identifier of the upload session")
+    bucket_name: str
+    object_key: str
+    upload_length: int = Field(..., description="Declared size of the object in bytes")
+    upload_offset: int = Field(..., description="Number of bytes already committed on the server")
+    expires_at: datetime = Field(..., description="Time after which the session is discarded")
+    model_config = ConfigDict(from_attributes=True, json_schema_extra={"description": "Upload Session Model"})
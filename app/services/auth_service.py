@@ -2,7 +2,10 @@ from fastapi import Depends, HTTPException, status
 from jose import JWTError
 from jose import jwt
 
+from ..core.cache import principal_cache
+from ..core.config import settings
 from ..core.security import oauth2_scheme, SECRET_KEY, ALGORITHM
+from ..core.timing import AUTH_STAGE, span
 from ..repositories.user_repository import UserRepository, get_user_repository
 from ..schemas.user_schema import UserResponse, TokenData
 
@@ -13,14 +16,21 @@ async def get_current_user(token: str = Depends(oauth2_scheme), user_repo: UserR
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    with span(AUTH_STAGE):
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            username: str = payload.get("sub")
+            if username is None:
+                raise credentials_exception
+            token_data = TokenData(username=username)
+        except JWTError as e:
             raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError as e:
-        raise credentials_exception
+
+        # кэшируются только активные пользователи; UserRepository сбрасывает запись при изменении пользователя.
+        # Обработчик получает копию, чтобы его изменения не попали в кэш для следующих запросов
+        cached_user = principal_cache.get(token_data.username)
+        if cached_user is not None:
+            return cached_user.model_copy()
 
     user = await user_repo.get_user(token_data.username)
 
@@ -31,6 +41,12 @@ async def get_current_user(token: str = Depends(oauth2_scheme), user_repo: UserR
         user_schema = UserResponse.model_validate(user)
         if not user_schema or not user_schema.is_active:
             raise credentials_exception
-        return user_schema
+        principal_cache.set(token_data.username, user_schema)
+        return user_schema.model_copy()
     except Exception as e:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+
+async def get_current_admin(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+    if current_user.username not in settings.app.admin_usernames:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Administrator access required")
+    return current_user
\ No newline at end of file
@@ -0,0 +1,91 @@
+import asyncio
+import pathlib
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import text
+
+from ..core.config import settings
+from ..core.fs import run_fs
+from ..core.loop_monitor import get_loop_lag
+from ..db import engine
+
+STORAGE_ROOT = pathlib.Path(settings.fileStorage.root_dir).expanduser()
+REFRESH_INTERVAL_SECONDS = settings.health.refresh_interval_seconds
+
+# Последний снимок готовности. /readyz только читает его, все проверки выполняет run_health_monitor.
+_snapshot: dict = {"ready": False, "checks": {}}
+_refreshed_at: Optional[float] = None
+
+
+async def _select_one():
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def check_database(timeout: float = settings.health.db_timeout_seconds) -> dict:
+    """
+    SELECT 1 через пул приложения: проверяет и базу, и то, что пул выдаёт соединения.
+
+    Таймаут покрывает и ожидание соединения в пуле, и подключение к базе, а не только сам запрос.
+    """
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_select_one(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"Database did not respond within {timeout}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e) or type(e).__name__}
+    return {"ok": True, "latency_seconds": round(time.perf_counter() - start, 4)}
+
+
+def _check_storage(root: pathlib.Path, min_free_bytes: int) -> dict:
+    try:
+        with tempfile.NamedTemporaryFile(dir=root, prefix=".readyz-"):
+            pass
+        free_bytes = shutil.disk_usage(root).free
+    except OSError as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": free_bytes >= min_free_bytes, "free_bytes": free_bytes}
+
+
+async def check_storage(root: pathlib.Path = STORAGE_ROOT,
+                        min_free_bytes: int = settings.health.min_free_disk_mb * 1024 * 1024) -> dict:
+    """Корень хранилища доступен на запись и на диске достаточно места (через тот же пул, что и запросы)."""
+    return await run_fs(_check_storage, root, min_free_bytes)
+
+
+async def refresh_health_snapshot(loop_lag_seconds: Optional[float] = None) -> dict:
+    global _snapshot, _refreshed_at
+    if loop_lag_seconds is None:
+        loop_lag_seconds = get_loop_lag()
+    database, storage = await asyncio.gather(check_database(), check_storage())
+    loop = {"ok": loop_lag_seconds <= settings.health.max_loop_lag_seconds,
+            "lag_seconds": round(loop_lag_seconds, 4)}
+    checks = {"database": database, "storage": storage, "event_loop": loop}
+    _snapshot = {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+    _refreshed_at = time.monotonic()
+    return _snapshot
+
+
+def get_health_snapshot() -> dict:
+    """Текущий снимок; устаревший или ещё не собранный снимок означает неготовность."""
+    if _refreshed_at is None:
+        return {"ready": False, "checks": {}, "error": "Health snapshot is not collected yet"}
+    age = time.monotonic() - _refreshed_at
+    if age > settings.health.stale_after_seconds:
+        return {**_snapshot, "ready": False, "age_seconds": round(age, 3), "error": "Health snapshot is stale"}
+    return {**_snapshot, "age_seconds": round(age, 3)}
+
+
+async def run_health_monitor(interval_seconds: float = REFRESH_INTERVAL_SECONDS) -> None:
+    """Периодически обновляет снимок готовности; задержку event loop берёт у run_loop_lag_monitor."""
+    while True:
+        try:
+            await refresh_health_snapshot()
+        except Exception as e:
+            logger.error(f"Health snapshot refresh failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -1 +1,134 @@
-#TODO object service
\ No newline at end of file
+import os
+import pathlib
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, Tuple
+
+from starlette.requests import ClientDisconnect, Request
+
+from ..core.config import settings
+from ..core.fs import run_fs
+from ..exceptions.upload_error import UploadConflictError, UploadLengthExceededError, UploadNotFoundError
+from ..storage.files import CHUNK_SIZE, save_stream
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STAGING_ROOT = pathlib.Path(settings.fileStorage.root_dir, settings.fileStorage.staging_dir).expanduser()
+
+
+async def save_request_stream(request: Request, path: pathlib.Path, chunk_size: int = CHUNK_SIZE,
+                              hasher=None) -> int:
+    """Сохраняет «сырое» тело запроса (application/octet-stream) на диск без разбора multipart."""
+    return await save_stream(request.stream(), path, chunk_size, hasher)
+
+
+def get_multipart_staging_dir(upload_id: str) -> pathlib.Path:
+    return STAGING_ROOT / "multipart" / upload_id
+
+
+def get_multipart_receive_path(upload_id: str, part_number: int) -> pathlib.Path:
+    """Уникальный файл, в который принимается часть, пока её ETag ещё не известен."""
+    return get_multipart_staging_dir(upload_id) / f"{part_number:05d}.{uuid.uuid4().hex}.receiving"
+
+
+def get_multipart_part_path(upload_id: str, part_number: int, etag: str) -> pathlib.Path:
+    """
+    Файл принятой части. ETag входит в имя, поэтому путь в записи о части всегда указывает
+    на содержимое с этим ETag, даже если ту же часть параллельно загружают ещё раз.
+    """
+    return get_multipart_staging_dir(upload_id) / f"{part_number:05d}.{etag}.part"
+
+
+def get_resumable_upload_path(session_id: str) -> pathlib.Path:
+    return STAGING_ROOT / "resumable" / f"{session_id}.partial"
+
+
+def _create_empty_file(path: pathlib.Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+async def create_empty_file(path: pathlib.Path) -> None:
+    await run_fs(_create_empty_file, path)
+
+
+def _lock_file(path: pathlib.Path) -> BinaryIO:
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        raise UploadNotFoundError(f"Upload '{path.name}' no longer exists")
+    if fcntl is not None:
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            raise UploadConflictError(f"Upload '{path.name}' is being written by another request")
+    return file
+
+
+@asynccontextmanager
+async def lock_upload_file(path: pathlib.Path) -> AsyncIterator[None]:
+    """
+    Эксклюзивная блокировка частичного файла загрузки на время всего PATCH.
+
+    Держится, пока новое смещение не зафиксировано в БД: иначе параллельный запрос
+    со старым смещением успевает обрезать файл и затереть уже принятые байты.
+    """
+    file = await run_fs(_lock_file, path)
+    try:
+        yield
+    finally:
+        await run_fs(file.close)
+
+
+def _open_for_append(path: pathlib.Path, offset: int) -> BinaryIO:
+    file = open(path, "r+b")
+    # всё, что лежит после подтверждённого смещения, — хвост оборванной записи
+    file.truncate(offset)
+    file.seek(offset)
+    return file
+
+
+def _flush_and_close(file: BinaryIO) -> None:
+    try:
+        file.flush()
+        os.fsync(file.fileno())
+    finally:
+        file.close()
+
+
+async def append_request_stream(request: Request, path: pathlib.Path, offset: int, limit: int,
+                                chunk_size: int = CHUNK_SIZE) -> Tuple[int, bool]:
+    """
+    Дописывает тело запроса в частичный файл начиная с offset, не больше limit байт.
+    Вызывающий держит lock_upload_file на этот файл.
+
+    Возвращает (число записанных байт, дочитано ли тело до конца). Если клиент оборвал
+    соединение, уже принятые байты сохраняются на диске, чтобы следующая попытка
+    продолжила с них, а не начинала заново.
+    """
+    destination = await run_fs(_open_for_append, path, offset)
+    written = 0
+    buffer = bytearray()
+    completed = True
+    try:
+        try:
+            async for chunk in request.stream():
+                if written + len(buffer) + len(chunk) > limit:
+                    raise UploadLengthExceededError(f"Request body exceeds the remaining {limit} bytes of the upload")
+                buffer += chunk
+                if len(buffer) >= chunk_size:
+                    await run_fs(destination.write, bytes(buffer))
+                    written += len(buffer)
+                    buffer.clear()
+        except ClientDisconnect:
+            completed = False
+        if buffer:
+            await run_fs(destination.write, bytes(buffer))
+            written += len(buffer)
+    finally:
+        await run_fs(_flush_and_close, destination)
+    return written, completed
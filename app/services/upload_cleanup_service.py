@@ -0,0 +1,53 @@
+import asyncio
+import pathlib
+from datetime import datetime, timedelta
+
+from loguru import logger
+
+from ..core.config import settings
+from ..db import async_session_factory
+from ..repositories.multipart_upload_repository import MultipartUploadRepository
+from ..repositories.upload_session_repository import UploadSessionRepository
+from .object_service import get_multipart_staging_dir
+from ..storage.files import remove_file, remove_directory
+
+SESSION_TTL = timedelta(minutes=settings.fileStorage.upload_session_ttl_minutes)
+GC_INTERVAL_SECONDS = settings.fileStorage.upload_gc_interval_seconds
+GC_BATCH_SIZE = 100
+
+
+async def collect_abandoned_uploads() -> int:
+    """
+    Удаляет просроченные возобновляемые сессии и брошенные multipart-загрузки вместе с их файлами.
+
+    Возвращает количество удалённых загрузок.
+    """
+    removed = 0
+    async with async_session_factory() as session:
+        session_repo = UploadSessionRepository(session)
+        while expired := await session_repo.get_expired_sessions(datetime.now(), GC_BATCH_SIZE):
+            for session_pk, path in expired:
+                await session_repo.delete_session(session_pk)
+                await remove_file(pathlib.Path(path))
+                removed += 1
+
+        multipart_repo = MultipartUploadRepository(session)
+        while stale := await multipart_repo.get_stale_uploads(datetime.now() - SESSION_TTL, GC_BATCH_SIZE):
+            for upload_pk, upload_id in stale:
+                await multipart_repo.delete_upload(upload_pk)
+                await remove_directory(get_multipart_staging_dir(upload_id))
+                removed += 1
+
+    if removed:
+        logger.info(f"Removed {removed} abandoned uploads.")
+    return removed
+
+
+async def run_upload_garbage_collector(interval_seconds: int = GC_INTERVAL_SECONDS) -> None:
+    """Периодически запускает collect_abandoned_uploads; ошибки логируются и не останавливают цикл."""
+    while True:
+        try:
+            await collect_abandoned_uploads()
+        except Exception as e:
+            logger.error(f"Upload garbage collection failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,4 @@
+from .base import ObjectStat, StorageBackend, object_storage_key
+from .local import LocalStorageBackend
+from .memory import MemoryStorageBackend
+from .provider import create_storage_backend, get_storage_backend, set_storage_backend, delete_legacy_copy
@@ -0,0 +1,80 @@
+import hashlib
+import pathlib
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, NamedTuple, Optional
+
+from fastapi import UploadFile
+from starlette.responses import Response, StreamingResponse
+
+from ..core.config import settings
+
+CHUNK_SIZE = settings.fileStorage.chunk_size
+
+
+class ObjectStat(NamedTuple):
+    """Размер и времена объекта; имена полей совпадают с os.stat_result."""
+    st_size: int
+    st_mtime: float
+    st_ctime: float
+
+
+def object_storage_key(bucket_name: str, object_key: str) -> str:
+    """
+    Ключ содержимого объекта в хранилище: sha256 от имени бакета и ключа объекта.
+
+    Не зависит от символов и вложенности пользовательского ключа; при перезаписи объекта
+    ключ тот же, поэтому новое содержимое атомарно замещает старое.
+    """
+    return hashlib.sha256(f"{bucket_name}/{object_key}".encode()).hexdigest()
+
+
+class StorageBackend(ABC):
+    """
+    Хранилище содержимого объектов.
+
+    Объект адресуется ключом из object_storage_key; он же сохраняется в Object.file_storage_path,
+    и чтение идёт по значению из записи объекта.
+    Части multipart- и возобновляемых загрузок лежат в локальном staging-каталоге и переносятся
+    в хранилище методами put_parts и put_staged_file.
+    """
+
+    @abstractmethod
+    async def put(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        """Сохраняет поток байтов под ключом key, возвращает размер."""
+
+    @abstractmethod
+    async def put_upload(self, key: str, file: UploadFile) -> int:
+        """Сохраняет загруженный через multipart/form-data файл, возвращает размер."""
+
+    @abstractmethod
+    async def put_parts(self, key: str, parts: list[pathlib.Path]) -> int:
+        """Склеивает локальные файлы частей в один объект, возвращает размер."""
+
+    @abstractmethod
+    async def put_staged_file(self, key: str, source: pathlib.Path) -> None:
+        """Переносит готовый локальный файл в хранилище; source после этого не существует."""
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        """Размер и времена объекта или None, если его нет."""
+
+    @abstractmethod
+    def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Содержимое объекта блоками."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Удаляет объект; отсутствие объекта ошибкой не считается."""
+
+    async def get(self, key: str) -> bytes:
+        """Содержимое объекта целиком — только для небольших объектов."""
+        return b"".join([chunk async for chunk in self.stream(key)])
+
+    def response(self, key: str, stat_result: ObjectStat) -> Response:
+        """Ответ с содержимым объекта для скачивания."""
+        return StreamingResponse(self.stream(key), media_type="application/octet-stream",
+                                 headers={"content-length": str(stat_result.st_size)})
+
+    def legacy_key(self, bucket_name: str, object_key: str) -> Optional[str]:
+        """Ключ, под которым объект мог быть сохранён до появления хранилищ, если такое размещение было."""
+        return None
@@ -0,0 +1,177 @@
+import errno
+import os
+import pathlib
+import shutil
+import stat
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional
+
+from fastapi import UploadFile
+
+from ..core.fs import run_fs
+from .base import CHUNK_SIZE
+
+# Ошибки, при которых ядро или файловая система не умеют copy_file_range и нужно копировать через Python
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL}
+
+
+def _create_temporary_file(path: pathlib.Path) -> pathlib.Path:
+    """Создаёт пустой временный файл в той же директории, что и path (та же файловая система)."""
+    fd, temporary_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".upload")
+    os.close(fd)
+    return pathlib.Path(temporary_path)
+
+
+def _remove_quietly(path: pathlib.Path) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _copy_to_path(source: BinaryIO, path: pathlib.Path, chunk_size: int) -> int:
+    """Копирует поток во временный файл блоками по chunk_size байт и атомарно переименовывает его в path."""
+    temporary_path = _create_temporary_file(path)
+    try:
+        with open(temporary_path, "wb") as destination:
+            shutil.copyfileobj(source, destination, chunk_size)
+            size = destination.tell()
+        os.replace(temporary_path, path)
+        return size
+    except BaseException:
+        _remove_quietly(temporary_path)
+        raise
+
+
+async def save_upload_file(file: UploadFile, path: pathlib.Path, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Сохраняет загруженный файл на диск, не читая его целиком в память.
+
+    Копирование выполняется в пуле потоков, поэтому event loop не блокируется,
+    а потребление памяти ограничено размером одного блока.
+    """
+    await file.seek(0)
+    return await run_fs(_copy_to_path, file.file, path, chunk_size)
+
+
+def _write_block(destination: BinaryIO, data: bytes, hasher) -> None:
+    if hasher is not None:
+        hasher.update(data)
+    destination.write(data)
+
+
+async def save_stream(chunks: AsyncIterator[bytes], path: pathlib.Path, chunk_size: int = CHUNK_SIZE,
+                      hasher=None) -> int:
+    """
+    Пишет поток байтов во временный файл рядом с path и переименовывает его на место —
+    данные записываются на диск один раз. Мелкие куски (например, из сокета) собираются
+    в буфер размером chunk_size, чтобы не уходить в пул потоков ради каждого из них.
+    Если передан hasher (например, hashlib.md5()), он обновляется теми же блоками в пуле fs-io.
+    """
+    temporary_path = await run_fs(_create_temporary_file, path)
+    try:
+        size = 0
+        buffer = bytearray()
+        destination = await run_fs(open, temporary_path, "wb")
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= chunk_size:
+                    await run_fs(_write_block, destination, bytes(buffer), hasher)
+                    size += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await run_fs(_write_block, destination, bytes(buffer), hasher)
+                size += len(buffer)
+        finally:
+            await run_fs(destination.close)
+        await run_fs(os.replace, temporary_path, path)
+        return size
+    except BaseException:
+        await run_fs(_remove_quietly, temporary_path)
+        raise
+
+
+async def read_file_chunks(path: pathlib.Path, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Читает файл блоками по chunk_size байт через пул fs-io."""
+    source = await run_fs(open, path, "rb")
+    try:
+        while chunk := await run_fs(source.read, chunk_size):
+            yield chunk
+    finally:
+        await run_fs(source.close)
+
+
+def _stat_regular_file(path: pathlib.Path) -> Optional[os.stat_result]:
+    try:
+        stat_result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+
+
+async def stat_object_file(path: pathlib.Path) -> Optional[os.stat_result]:
+    """Возвращает stat файла объекта или None, если файла нет (или это не обычный файл)."""
+    return await run_fs(_stat_regular_file, path)
+
+
+def _append_file(source_path: pathlib.Path, destination: BinaryIO, chunk_size: int) -> int:
+    """Дописывает файл в destination, по возможности через copy_file_range без копирования в user space."""
+    with open(source_path, "rb") as source:
+        remaining = os.fstat(source.fileno()).st_size
+        copied = 0
+        if hasattr(os, "copy_file_range"):
+            try:
+                while remaining > 0:
+                    written = os.copy_file_range(source.fileno(), destination.fileno(), remaining)
+                    if written == 0:
+                        break
+                    copied += written
+                    remaining -= written
+                return copied
+            except OSError as e:
+                if copied or e.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                    raise
+        shutil.copyfileobj(source, destination, chunk_size)
+        return os.fstat(source.fileno()).st_size
+
+
+def _concatenate_files(sources: list[pathlib.Path], path: pathlib.Path, chunk_size: int) -> int:
+    temporary_path = _create_temporary_file(path)
+    try:
+        size = 0
+        # без буферизации: copy_file_range и запись через Python разделяют одно смещение дескриптора
+        with open(temporary_path, "wb", buffering=0) as destination:
+            for source in sources:
+                size += _append_file(source, destination, chunk_size)
+        os.replace(temporary_path, path)
+        return size
+    except BaseException:
+        _remove_quietly(temporary_path)
+        raise
+
+
+async def concatenate_files(sources: list[pathlib.Path], path: pathlib.Path, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Склеивает файлы частей в один объект и атомарно кладёт его в path.
+
+    На Linux данные копируются внутри ядра через copy_file_range (на CoW-файловых
+    системах это вообще reflink без копирования), иначе — блоками через пул потоков.
+    """
+    return await run_fs(_concatenate_files, sources, path, chunk_size)
+
+
+async def create_directory(path: pathlib.Path) -> None:
+    await run_fs(path.mkdir, parents=True, exist_ok=True)
+
+
+async def remove_directory(path: pathlib.Path) -> None:
+    await run_fs(shutil.rmtree, path, ignore_errors=True)
+
+
+async def move_file(source: pathlib.Path, path: pathlib.Path) -> None:
+    await run_fs(os.replace, source, path)
+
+
+async def remove_file(path: pathlib.Path) -> None:
+    await run_fs(_remove_quietly, path)
@@ -0,0 +1,65 @@
+import os
+import pathlib
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+from starlette.responses import Response
+
+from ..core.responses import ObjectFileResponse
+from .files import (save_stream, save_upload_file, concatenate_files, move_file, remove_file, stat_object_file,
+                    create_directory, read_file_chunks)
+from .base import CHUNK_SIZE, ObjectStat, StorageBackend
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Объекты в локальной файловой системе, разложенные по хэшу ключа: objects_root/ab/cd/abcd….
+
+    Два уровня по 256 каталогов держат каталоги небольшими при любом числе объектов в бакете.
+    Абсолютный путь в качестве ключа — объект, сохранённый до появления хранилищ
+    в root/bucket_name/object_key; такие объекты читаются и удаляются по этому пути.
+    """
+
+    def __init__(self, root: pathlib.Path, objects_dir: str = ".objects", chunk_size: int = CHUNK_SIZE):
+        # ключи-хэши и старые ключи различаются по os.path.isabs, поэтому корень всегда абсолютный
+        self.root = pathlib.Path(root).expanduser().absolute()
+        self.objects_root = self.root / objects_dir
+        self.chunk_size = chunk_size
+
+    def path(self, key: str) -> pathlib.Path:
+        if os.path.isabs(key):
+            return pathlib.Path(key)
+        return self.objects_root / key[:2] / key[2:4] / key
+
+    async def _prepare_path(self, key: str) -> pathlib.Path:
+        path = self.path(key)
+        await create_directory(path.parent)
+        return path
+
+    async def put(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        return await save_stream(chunks, await self._prepare_path(key), self.chunk_size)
+
+    async def put_upload(self, key: str, file: UploadFile) -> int:
+        return await save_upload_file(file, await self._prepare_path(key), self.chunk_size)
+
+    async def put_parts(self, key: str, parts: list[pathlib.Path]) -> int:
+        return await concatenate_files(parts, await self._prepare_path(key), self.chunk_size)
+
+    async def put_staged_file(self, key: str, source: pathlib.Path) -> None:
+        await move_file(source, await self._prepare_path(key))
+
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        return await stat_object_file(self.path(key))
+
+    def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        return read_file_chunks(self.path(key), chunk_size)
+
+    async def delete(self, key: str) -> None:
+        await remove_file(self.path(key))
+
+    def response(self, key: str, stat_result: ObjectStat) -> Response:
+        # Range, условные запросы и sendfile
+        return ObjectFileResponse(self.path(key), stat_result=stat_result)
+
+    def legacy_key(self, bucket_name: str, object_key: str) -> Optional[str]:
+        return str(self.root / bucket_name / object_key)
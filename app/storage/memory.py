@@ -0,0 +1,52 @@
+import pathlib
+import time
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+
+from ..core.fs import run_fs
+from .base import CHUNK_SIZE, ObjectStat, StorageBackend
+from .files import remove_file
+
+
+class MemoryStorageBackend(StorageBackend):
+    """Объекты в памяти процесса — для тестов и бенчмарков без диска. Range-запросы не поддерживаются."""
+
+    def __init__(self):
+        self._objects: dict[str, tuple[bytes, float]] = {}
+
+    def _store(self, key: str, data: bytes) -> int:
+        self._objects[key] = (data, time.time())
+        return len(data)
+
+    async def put(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        return self._store(key, b"".join([chunk async for chunk in chunks]))
+
+    async def put_upload(self, key: str, file: UploadFile) -> int:
+        await file.seek(0)
+        return self._store(key, await file.read())
+
+    async def put_parts(self, key: str, parts: list[pathlib.Path]) -> int:
+        return self._store(key, b"".join([await run_fs(part.read_bytes) for part in parts]))
+
+    async def put_staged_file(self, key: str, source: pathlib.Path) -> None:
+        self._store(key, await run_fs(source.read_bytes))
+        await remove_file(source)
+
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        entry = self._objects.get(key)
+        if entry is None:
+            return None
+        data, modified_at = entry
+        return ObjectStat(len(data), modified_at, modified_at)
+
+    async def stream(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        data, _ = self._objects[key]
+        for offset in range(0, len(data), chunk_size):
+            yield data[offset:offset + chunk_size]
+
+    async def delete(self, key: str) -> None:
+        self._objects.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._objects)
@@ -0,0 +1,46 @@
+import pathlib
+from typing import Optional
+
+from ..core.config import settings
+from .base import StorageBackend
+from .local import LocalStorageBackend
+from .memory import MemoryStorageBackend
+
+_backend: Optional[StorageBackend] = None
+
+
+def create_storage_backend(name: str) -> StorageBackend:
+    if name == "local":
+        return LocalStorageBackend(pathlib.Path(settings.fileStorage.root_dir).expanduser(),
+                                   settings.fileStorage.objects_dir)
+    if name == "memory":
+        return MemoryStorageBackend()
+    raise ValueError(f"Unknown storage backend '{name}'")
+
+
+def get_storage_backend() -> StorageBackend:
+    """Хранилище процесса, выбранное в file_storage_settings.backend."""
+    global _backend
+    if _backend is None:
+        _backend = create_storage_backend(settings.fileStorage.backend)
+    return _backend
+
+
+def set_storage_backend(backend: Optional[StorageBackend]):
+    """Подменяет хранилище процесса (тесты, бенчмарки); None — вернуть выбранное в настройках."""
+    global _backend
+    _backend = backend
+
+
+async def delete_legacy_copy(bucket_name: str, object_key: str):
+    """
+    Удаляет копию объекта в размещении до появления хранилищ после того, как он записан под новым ключом.
+
+    Стоит stat на каждую запись, поэтому выключается file_storage_settings.delete_legacy_copies.
+    """
+    if not settings.fileStorage.delete_legacy_copies:
+        return
+    backend = get_storage_backend()
+    legacy_key = backend.legacy_key(bucket_name, object_key)
+    if legacy_key is not None and await backend.stat(legacy_key) is not None:
+        await backend.delete(legacy_key)
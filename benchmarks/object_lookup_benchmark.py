@@ -0,0 +1,157 @@
+"""
+Бенчмарк поиска объектов и бакетов на синтетических данных.
+
+Копирует таблицы bucket и object в отдельную схему (с индексами или без),
+заполняет их через generate_series и для каждого запроса репозиториев выводит
+EXPLAIN (ANALYZE, BUFFERS) и перцентили времени выполнения.
+
+    python -m benchmarks.object_lookup_benchmark --rows 1000000 --rows 10000000
+    python -m benchmarks.object_lookup_benchmark --rows 1000000 --without-indexes
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import asyncpg
+
+from app.core.config import settings
+from app.repositories.object_repository import prefix_upper_bound
+
+SCHEMA = "nbc_bench"
+
+# те же запросы, что выполняют ObjectRepository и BucketRepository.
+# Листинги повторяют list_objects / _fetch_objects_after: keyset-позиция (bucket_id, object_key),
+# префикс — диапазон по object_key в COLLATE "C", LIMIT — страница max_keys + 1.
+LIST_PAGE = 1001
+QUERIES = {
+    "read_object": (
+        "SELECT * FROM {schema}.object "
+        "WHERE bucket_name = $1 AND object_key = $2 AND owner_name = $3"
+    ),
+    "object_by_bucket_id_and_key": (
+        "SELECT * FROM {schema}.object WHERE bucket_id = $4 AND object_key = $2"
+    ),
+    "get_all_objects": (
+        "SELECT * FROM {schema}.object WHERE owner_name = $3"
+    ),
+    "list_objects_in_bucket": (
+        "SELECT * FROM {schema}.object WHERE owner_name = $3 AND bucket_id = $4 "
+        "ORDER BY bucket_id, object_key LIMIT " + str(LIST_PAGE)
+    ),
+    "list_objects_in_bucket_next_page": (
+        "SELECT * FROM {schema}.object WHERE owner_name = $3 AND bucket_id = $4 "
+        "AND (bucket_id, object_key) > ($4, $2) "
+        "ORDER BY bucket_id, object_key LIMIT " + str(LIST_PAGE)
+    ),
+    "list_objects_in_bucket_by_prefix": (
+        "SELECT * FROM {schema}.object WHERE owner_name = $3 AND bucket_id = $4 "
+        "AND object_key >= $5 AND object_key < $6 "
+        "ORDER BY bucket_id, object_key LIMIT " + str(LIST_PAGE)
+    ),
+    "list_owner_objects_next_page": (
+        "SELECT * FROM {schema}.object WHERE owner_name = $3 "
+        "AND (bucket_id, object_key) > ($4, $2) "
+        "ORDER BY bucket_id, object_key LIMIT " + str(LIST_PAGE)
+    ),
+    "get_bucket_by_name": (
+        "SELECT * FROM {schema}.bucket WHERE bucket_name = $1"
+    ),
+    "get_buckets_by_owner": (
+        "SELECT * FROM {schema}.bucket WHERE owner_name = $3"
+    ),
+}
+
+
+async def prepare_schema(conn: asyncpg.Connection, with_indexes: bool):
+    including = "INCLUDING DEFAULTS INCLUDING INDEXES" if with_indexes else "INCLUDING DEFAULTS"
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.bucket (LIKE public.bucket {including})")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.object (LIKE public.object {including})")
+
+
+async def seed(conn: asyncpg.Connection, rows: int, buckets: int, owners: int):
+    await conn.execute(
+        f"INSERT INTO {SCHEMA}.bucket (id, bucket_name, owner_name, owner_id, created_at, updated_at) "
+        f"SELECT b, 'bucket-' || b, 'user-' || (b % $2), NULL, now(), now() "
+        f"FROM generate_series(1, $1) AS b",
+        buckets, owners,
+    )
+    await conn.execute(
+        f"INSERT INTO {SCHEMA}.object (id, object_key, file_storage_path, download_url, size, extension, "
+        f"bucket_id, bucket_name, owner_id, owner_name, created_at, updated_at) "
+        f"SELECT o, 'key-' || o, '/data/' || o, '', 1024, 'bin', "
+        f"o % $2 + 1, 'bucket-' || (o % $2 + 1), NULL, 'user-' || ((o % $2 + 1) % $3), now(), now() "
+        f"FROM generate_series(1, $1) AS o",
+        rows, buckets, owners,
+    )
+    await conn.execute(f"ANALYZE {SCHEMA}.bucket")
+    await conn.execute(f"ANALYZE {SCHEMA}.object")
+
+
+def random_args(rows: int, buckets: int, owners: int) -> tuple:
+    object_id = random.randint(1, rows)
+    bucket_id = object_id % buckets + 1
+    # префикс 'key-12' и его верхняя граница из prefix_upper_bound
+    prefix = f"key-{str(object_id)[:2]}"
+    return (f"bucket-{bucket_id}", f"key-{object_id}", f"user-{bucket_id % owners}", bucket_id,
+            prefix, prefix_upper_bound(prefix))
+
+
+def bind(sql: str, args: tuple) -> tuple[str, tuple]:
+    """Оставляет в запросе только используемые параметры и перенумеровывает их."""
+    used = [i for i in range(1, len(args) + 1) if f"${i}" in sql]
+    for position, index in enumerate(used, start=1):
+        sql = sql.replace(f"${index}", f"$__{position}")
+    return sql.replace("$__", "$"), tuple(args[i - 1] for i in used)
+
+
+async def run_query(conn: asyncpg.Connection, name: str, rows: int, buckets: int, owners: int, iterations: int):
+    template = QUERIES[name].format(schema=SCHEMA)
+    sql, args = bind(template, random_args(rows, buckets, owners))
+    plan = await conn.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", *args)
+    print(f"\n--- {name}")
+    print("\n".join(line[0] for line in plan))
+
+    timings = []
+    for _ in range(iterations):
+        sql, args = bind(template, random_args(rows, buckets, owners))
+        started = time.perf_counter()
+        await conn.fetch(sql, *args)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{name}: p50={statistics.median(timings):.3f}ms p95={p95:.3f}ms max={timings[-1]:.3f}ms")
+
+
+async def main(args: argparse.Namespace):
+    conn = await asyncpg.connect(settings.db.db_url.replace("postgresql+asyncpg", "postgresql"))
+    try:
+        for rows in args.rows:
+            buckets = max(rows // args.objects_per_bucket, 1)
+            print(f"\n=== {rows} objects, {buckets} buckets, indexes: {not args.without_indexes}")
+            await prepare_schema(conn, with_indexes=not args.without_indexes)
+            started = time.perf_counter()
+            await seed(conn, rows, buckets, args.owners)
+            print(f"seeded in {time.perf_counter() - started:.1f}s")
+            for name in QUERIES:
+                await run_query(conn, name, rows, buckets, args.owners, args.iterations)
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Object and bucket lookup benchmark")
+    parser.add_argument("--rows", type=int, action="append", help="number of objects, can be repeated")
+    parser.add_argument("--objects-per-bucket", type=int, default=1000)
+    parser.add_argument("--owners", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--without-indexes", action="store_true", help="copy tables without indexes for comparison")
+    parser.add_argument("--keep", action="store_true", help="do not drop the benchmark schema")
+    parsed = parser.parse_args()
+    parsed.rows = parsed.rows or [1_000_000, 10_000_000]
+    asyncio.run(main(parsed))
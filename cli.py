@@ -1,9 +1,12 @@
-import time
+import asyncio
+import os
+import tempfile
 from enum import Enum
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Optional
 
 import uvicorn
-from typer import Typer, Argument
+from typer import Typer, Argument, Option
 
 from app.core.config import settings
 
@@ -13,29 +16,84 @@ class Apps(str, Enum):
     api = "api"
     background_tasks = "background_tasks"
 
+class Loops(str, Enum):
+    auto = "auto"
+    asyncio = "asyncio"
+    uvloop = "uvloop"
+
+class HttpProtocols(str, Enum):
+    auto = "auto"
+    h11 = "h11"
+    httptools = "httptools"
+
 @cli.command(help="Run API app")
 def run(
-        app: Annotated[Apps, Argument(help="App to run")] = Apps.api
+        app: Annotated[Apps, Argument(help="App to run")] = Apps.api,
+        workers: Annotated[Optional[int], Option(min=1, help="Number of worker processes")] = None,
+        loop: Annotated[Optional[Loops], Option(help="Event loop implementation")] = None,
+        http: Annotated[Optional[HttpProtocols], Option(help="HTTP protocol implementation")] = None,
+        timeout_graceful_shutdown: Annotated[Optional[int], Option(
+            help="Seconds to wait for in-flight requests on shutdown")] = None,
 ):
     print("Run command started")
     match app:
         case Apps.api:
-            print("Running API app")
+            workers = workers or settings.app.workers
+            print(f"Running API app with {workers} worker(s)")
+            if workers > 1 or "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+                prepare_multiprocess_metrics()
             uvicorn.run(
                 "app.main:app",
                 host=settings.app.app_host,
                 port=settings.app.app_port,
-                reload=False
+                reload=False,
+                workers=workers,
+                loop=(loop.value if loop else settings.app.loop),
+                http=(http.value if http else settings.app.http),
+                timeout_graceful_shutdown=(timeout_graceful_shutdown if timeout_graceful_shutdown is not None
+                                           else settings.app.timeout_graceful_shutdown),
+                timeout_keep_alive=settings.app.timeout_keep_alive,
             )
 
         case Apps.background_tasks:
             print("Running background tasks")
             run_background_tasks()
 
+def prepare_multiprocess_metrics():
+    """
+    Готовит каталог prometheus_client для режима нескольких воркеров.
+
+    Переменная окружения задаётся до запуска uvicorn (и до импорта prometheus_client, который
+    читает её при импорте), поэтому её наследуют все воркеры; файлы прошлого запуска удаляются,
+    иначе /metrics покажет значения мёртвых процессов.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="nbc-prometheus-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    for stale_file in Path(directory).glob("*.db"):
+        stale_file.unlink()
+    print(f"Prometheus multiprocess directory: {directory}")
+
 def run_background_tasks():
+    from app.services.upload_cleanup_service import run_upload_garbage_collector
+
     print("Starting background tasks...")
-    while True:
-        print("Executing periodic task...")
-        time.sleep(10)
+    asyncio.run(run_upload_garbage_collector())
+
+@cli.command(help="Recompute bucket file_count and total_size from the object table")
+def recompute_bucket_stats(
+        bucket: Annotated[Optional[str], Option(help="Bucket to recompute, all buckets by default")] = None
+):
+    updated = asyncio.run(recompute_bucket_statistics(bucket))
+    print(f"Recomputed statistics for {updated} buckets")
+
+async def recompute_bucket_statistics(bucket_name: Optional[str]) -> int:
+    from app.db import async_session_factory
+    from app.repositories.bucket_repository import BucketRepository
+
+    async with async_session_factory() as session:
+        return await BucketRepository(session, user_repo=None).recompute_statistics(bucket_name)
 
 cli()
@@ -0,0 +1,182 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache, bucket_cache, principal_cache
+from app.core.metrics import CACHE_ENTRIES, CACHE_HIT_RATIO, CACHE_REQUESTS
+from app.models.bucket import Bucket
+from app.repositories.bucket_repository import BucketRepository
+from app.core.security import create_access_token
+from app.repositories.user_repository import UserRepository
+from app.services.auth_service import get_current_user
+
+
+def lookups(cache_name, result):
+    return CACHE_REQUESTS.labels(cache=cache_name, result=result)._value.get()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache("test-lru", maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache("test-ttl", maxsize=10, ttl_seconds=5)
+    cache.set("a", 1)
+
+    now[0] = 104.9
+    assert cache.get("a") == 1
+    now[0] = 105.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_counts_hits_and_misses():
+    cache = TTLCache("test-counters", maxsize=10, ttl_seconds=60)
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+
+    assert lookups("test-counters", "hit") == 2
+    assert lookups("test-counters", "miss") == 1
+
+
+@pytest.fixture
+def user_row():
+    return SimpleNamespace(id=1, username="alice", email="alice@example.com", created_at=datetime.now(),
+                           is_active=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_is_cached(user_row):
+    user_repo = AsyncMock()
+    user_repo.get_user.return_value = user_row
+    token = create_access_token({"sub": "alice"})
+
+    first = await get_current_user(token, user_repo)
+    second = await get_current_user(token, user_repo)
+
+    assert first == second
+    user_repo.get_user.assert_awaited_once_with("alice")
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_is_not_shared_between_requests(user_row):
+    user_repo = AsyncMock()
+    user_repo.get_user.return_value = user_row
+    token = create_access_token({"sub": "alice"})
+
+    first = await get_current_user(token, user_repo)
+    first.username = "mallory"
+    second = await get_current_user(token, user_repo)
+    second.is_active = False
+
+    assert (await get_current_user(token, user_repo)).username == "alice"
+    assert principal_cache.get("alice").is_active
+
+
+@pytest.mark.asyncio
+async def test_inactive_user_is_not_cached(user_row):
+    user_row.is_active = False
+    user_repo = AsyncMock()
+    user_repo.get_user.return_value = user_row
+    token = create_access_token({"sub": "alice"})
+
+    with pytest.raises(HTTPException):
+        await get_current_user(token, user_repo)
+    assert principal_cache.get("alice") is None
+
+
+@pytest.mark.asyncio
+async def test_revoke_user_token_invalidates_principal(user_row):
+    user_repo = AsyncMock()
+    user_repo.get_user.return_value = user_row
+    await get_current_user(create_access_token({"sub": "alice"}), user_repo)
+
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = "alice"
+    session.execute.return_value = result
+    await UserRepository(session).revoke_user_token(1)
+
+    assert principal_cache.get("alice") is None
+
+
+def test_cache_exports_hit_ratio():
+    cache = TTLCache("test-ratio", maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    assert CACHE_HIT_RATIO.labels(cache="test-ratio")._value.get() == 0.75
+    assert CACHE_ENTRIES.labels(cache="test-ratio")._value.get() == 1
+
+
+@pytest.fixture
+def bucket_session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = Bucket(
+        id=3, bucket_name="photos", owner_id=1, owner_name="alice", created_at=datetime.now(),
+        updated_at=datetime.now(), file_count=0, total_size=0
+    )
+    session.execute.return_value = result
+    bucket_cache.clear()
+    yield session
+    bucket_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_get_bucket_by_name_is_cached(bucket_session):
+    repo = BucketRepository(bucket_session, user_repo=AsyncMock())
+
+    first = await repo.get_bucket_by_name("photos")
+    first.owner_name = "mutated-by-caller"
+    second = await repo.get_bucket_by_name("photos")
+
+    assert second.owner_name == "alice"
+    bucket_session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_bucket_by_name_returns_none_for_missing_bucket(bucket_session):
+    bucket_session.execute.return_value.scalars.return_value.first.return_value = None
+    repo = BucketRepository(bucket_session, user_repo=AsyncMock())
+
+    assert await repo.get_bucket_by_name("missing") is None
+    assert bucket_cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_bucket_invalidates_cached_bucket(bucket_session):
+    repo = BucketRepository(bucket_session, user_repo=AsyncMock())
+    await repo.get_bucket_by_name("photos")
+    bucket_session.execute.return_value.scalar_one_or_none.return_value = Bucket(id=3, bucket_name="photos")
+
+    assert await repo.delete_bucket("photos", "alice") is True
+
+    assert bucket_cache.get("photos") is None
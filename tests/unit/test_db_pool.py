@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import QueuePool, create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.metrics import (DB_POOL_CHECKOUT_LATENCY, DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKED_OUT,
+                              DB_POOL_CONNECTIONS_OPENED)
+from app.db import instrument_pool
+
+
+def checkout_count():
+    return next(sample.value for sample in DB_POOL_CHECKOUT_LATENCY.collect()[0].samples
+                if sample.name.endswith("_count"))
+
+
+def make_engine(pool_size, timeout=30):
+    engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=pool_size, max_overflow=0,
+                           pool_timeout=timeout)
+    instrument_pool(engine)
+    return engine
+
+
+def test_pool_reports_wait_and_checked_out_connections():
+    engine = make_engine(pool_size=2)
+    before = checkout_count()
+    checked_out = DB_POOL_CHECKED_OUT._value.get()
+
+    first = engine.connect()
+    second = engine.connect()
+    assert DB_POOL_CHECKED_OUT._value.get() == checked_out + 2
+
+    first.close()
+    second.close()
+    assert DB_POOL_CHECKED_OUT._value.get() == checked_out
+    assert checkout_count() == before + 2
+
+
+def test_pool_counts_only_new_connections():
+    engine = make_engine(pool_size=1)
+    before = DB_POOL_CONNECTIONS_OPENED._value.get()
+
+    for _ in range(3):
+        engine.connect().close()
+
+    assert DB_POOL_CONNECTIONS_OPENED._value.get() == before + 1
+
+
+def test_pool_counts_checkout_timeouts():
+    engine = make_engine(pool_size=1, timeout=0)
+    before = DB_POOL_CHECKOUT_TIMEOUTS._value.get()
+    connection = engine.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    connection.close()
+    assert DB_POOL_CHECKOUT_TIMEOUTS._value.get() == before + 1
@@ -0,0 +1,48 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core import fs
+from app.core.fs import run_fs
+from app.core.metrics import FS_ACTIVE_OPERATIONS, FS_QUEUE_DEPTH
+
+
+@pytest.mark.asyncio
+async def test_run_fs_returns_result_and_resets_gauges():
+    assert await run_fs(sum, [1, 2, 3]) == 6
+    assert FS_QUEUE_DEPTH._value.get() == 0
+    assert FS_ACTIVE_OPERATIONS._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_reports_queue_depth_without_blocking_loop():
+    workers = fs._fs_executor._max_workers
+    release = threading.Event()
+    operations = [asyncio.ensure_future(run_fs(release.wait)) for _ in range(workers + 3)]
+    await asyncio.sleep(0.05)
+
+    # event loop продолжает работать, пока все потоки пула заняты
+    assert FS_ACTIVE_OPERATIONS._value.get() == workers
+    assert FS_QUEUE_DEPTH._value.get() == 3
+
+    release.set()
+    await asyncio.gather(*operations)
+    assert FS_QUEUE_DEPTH._value.get() == 0
+    assert FS_ACTIVE_OPERATIONS._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_operation_cancelled_in_queue_leaves_queue():
+    workers = fs._fs_executor._max_workers
+    release = threading.Event()
+    running = [asyncio.ensure_future(run_fs(release.wait)) for _ in range(workers)]
+    queued = asyncio.ensure_future(run_fs(release.wait))
+    await asyncio.sleep(0.05)
+
+    queued.cancel()
+    await asyncio.sleep(0)
+    assert FS_QUEUE_DEPTH._value.get() == 0
+
+    release.set()
+    await asyncio.gather(*running)
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application import get_app
+from app.services import health_service
+
+
+@pytest.fixture
+def client():
+    return TestClient(get_app())
+
+
+@pytest.fixture(autouse=True)
+def reset_snapshot(monkeypatch):
+    monkeypatch.setattr(health_service, "_snapshot", {"ready": False, "checks": {}})
+    monkeypatch.setattr(health_service, "_refreshed_at", None)
+
+
+def test_livez_is_always_ok(client):
+    response = client.get("/livez")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "OK"}
+
+
+def test_readyz_is_unavailable_before_first_snapshot(client):
+    response = client.get("/readyz")
+
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_readyz_serves_background_snapshot_without_running_checks(client, monkeypatch):
+    check_database = AsyncMock(return_value={"ok": True, "latency_seconds": 0.001})
+    monkeypatch.setattr(health_service, "check_database", check_database)
+    monkeypatch.setattr(health_service, "check_storage", AsyncMock(return_value={"ok": True, "free_bytes": 1}))
+    await health_service.refresh_health_snapshot(loop_lag_seconds=0.01)
+
+    first = client.get("/readyz")
+    second = client.get("/readyz")
+
+    assert first.status_code == second.status_code == 200
+    assert set(first.json()["checks"]) == {"database", "storage", "event_loop"}
+    check_database.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_not_ready_when_a_check_fails_or_loop_lags(monkeypatch):
+    monkeypatch.setattr(health_service, "check_database", AsyncMock(return_value={"ok": False, "error": "down"}))
+    monkeypatch.setattr(health_service, "check_storage", AsyncMock(return_value={"ok": True, "free_bytes": 1}))
+    assert (await health_service.refresh_health_snapshot())["ready"] is False
+
+    monkeypatch.setattr(health_service, "check_database", AsyncMock(return_value={"ok": True}))
+    assert (await health_service.refresh_health_snapshot(loop_lag_seconds=60))["ready"] is False
+    assert (await health_service.refresh_health_snapshot(loop_lag_seconds=0))["ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health_service, "check_database", AsyncMock(return_value={"ok": True}))
+    monkeypatch.setattr(health_service, "check_storage", AsyncMock(return_value={"ok": True}))
+    await health_service.refresh_health_snapshot()
+    monkeypatch.setattr(health_service, "_refreshed_at", health_service._refreshed_at - 3600)
+
+    snapshot = health_service.get_health_snapshot()
+
+    assert snapshot["ready"] is False
+    assert snapshot["error"] == "Health snapshot is stale"
+
+
+@pytest.mark.asyncio
+async def test_check_storage_reports_free_space_and_missing_root(tmp_path):
+    assert (await health_service.check_storage(tmp_path, min_free_bytes=0))["ok"] is True
+    assert (await health_service.check_storage(tmp_path, min_free_bytes=1 << 62))["ok"] is False
+    assert (await health_service.check_storage(tmp_path / "missing", min_free_bytes=0))["ok"] is False
+    assert list(tmp_path.iterdir()) == []
+
+
+class HangingConnect:
+    """engine.connect(), который ждёт соединения из пула бесконечно."""
+
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_check_database_timeout_covers_connection_checkout(monkeypatch):
+    monkeypatch.setattr(health_service, "engine", SimpleNamespace(connect=HangingConnect))
+
+    result = await asyncio.wait_for(health_service.check_database(timeout=0.05), timeout=1)
+
+    assert result["ok"] is False
+    assert "0.05" in result["error"]
@@ -0,0 +1,124 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core import invalidation
+from app.core.cache import TTLCache
+from app.core.invalidation import CHANNEL, apply_invalidation, invalidation_payload, run_invalidation_listener
+from app.repositories.object_repository import build_object_upsert
+
+
+@pytest.fixture
+def cache():
+    cache = TTLCache("test-invalidation", maxsize=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    return cache
+
+
+def test_apply_invalidation_removes_key(cache):
+    apply_invalidation(invalidation_payload("test-invalidation", "a"))
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_apply_invalidation_without_key_clears_cache(cache):
+    apply_invalidation(invalidation_payload("test-invalidation", None))
+
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("payload", ["not json", "[]", '{"cache": "test-invalidation"}'])
+def test_apply_invalidation_ignores_malformed_events(cache, payload):
+    apply_invalidation(payload)
+
+    assert len(cache) == 2
+
+
+def test_object_upsert_does_not_notify_without_object_cache():
+    statement = build_object_upsert(7, "bucket", "key", 1, "testuser", "txt", "/data/key.txt", "url", 10)
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "pg_notify(" not in sql
+
+
+class FakeListenerConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+        self.execute = AsyncMock()
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def notify(self, payload):
+        self.listeners[CHANNEL](self, 1, CHANNEL, payload)
+
+    def drop(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_listener_applies_events_and_reconnects(cache, monkeypatch):
+    monkeypatch.setattr(invalidation, "RECONNECT_DELAY_SECONDS", 0)
+    connections = [FakeListenerConnection(), FakeListenerConnection()]
+    connect = AsyncMock(side_effect=connections)
+
+    task = asyncio.create_task(run_invalidation_listener(connect))
+    await asyncio.sleep(0.01)
+    # подписка сбрасывает всё, что могло устареть до подключения
+    assert len(cache) == 0
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    connections[0].notify(invalidation_payload("test-invalidation", "a"))
+    assert cache.get("a") is None and cache.get("b") == 2
+
+    connections[0].drop()
+    await asyncio.sleep(0.01)
+    assert connect.await_count >= 2
+    assert CHANNEL in connections[1].listeners
+    assert len(cache) == 0
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert connections[1].closed
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_when_healthcheck_hangs(cache, monkeypatch):
+    monkeypatch.setattr(invalidation, "RECONNECT_DELAY_SECONDS", 0)
+    monkeypatch.setattr(invalidation, "HEALTHCHECK_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(invalidation, "HEALTHCHECK_TIMEOUT_SECONDS", 0.01)
+    half_open = FakeListenerConnection()
+
+    async def hang(query):
+        await asyncio.Event().wait()
+
+    half_open.execute = hang
+    connect = AsyncMock(side_effect=[half_open, FakeListenerConnection()])
+
+    task = asyncio.create_task(run_invalidation_listener(connect))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert connect.await_count == 2
+    assert half_open.closed
@@ -0,0 +1,40 @@
+import sys
+
+from loguru import logger
+
+from app.core.logging import LogSampler
+
+
+def _record(name, level):
+    return {"name": name, "level": logger.level(level)}
+
+
+def test_sampler_keeps_one_of_n_for_configured_logger():
+    sampler = LogSampler({"app.repositories.object_repository": 10})
+
+    kept = [sampler(_record("app.repositories.object_repository", "INFO")) for _ in range(30)]
+
+    assert kept.count(True) == 3
+    assert kept[0] is True
+
+
+def test_sampler_always_passes_warnings_and_unconfigured_loggers():
+    sampler = LogSampler({"app.repositories.object_repository": 10})
+
+    assert all(sampler(_record("app.repositories.object_repository", "WARNING")) for _ in range(5))
+    assert all(sampler(_record("app.repositories.object_repository", "ERROR")) for _ in range(5))
+    assert all(sampler(_record("app.main", "INFO")) for _ in range(5))
+
+
+def test_lazy_debug_is_not_formatted_below_level():
+    calls = []
+    logger.remove()
+    logger.add(lambda message: None, level="INFO")
+    try:
+        logger.opt(lazy=True).debug("Objects data: {}", lambda: calls.append(1))
+        logger.opt(lazy=True).info("Objects data: {}", lambda: calls.append(2))
+    finally:
+        logger.remove()
+        logger.add(sys.stderr)
+
+    assert calls == [2]
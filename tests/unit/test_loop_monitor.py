@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import loop_monitor
+from app.core.loop_monitor import BlockingCallDetector, get_loop_lag, get_loop_stalls, run_loop_lag_monitor
+from app.core.metrics import EVENT_LOOP_STALLS
+
+
+def block_event_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_lag_monitor_measures_late_wakeups():
+    task = asyncio.create_task(run_loop_lag_monitor(interval_seconds=0.2))
+    await asyncio.sleep(0)
+    block_event_loop(0.3)
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert get_loop_lag() >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_detector_records_stack_of_blocking_call(monkeypatch):
+    monkeypatch.setattr(loop_monitor, "_stalls", loop_monitor.deque(maxlen=5))
+    stalls_before = EVENT_LOOP_STALLS._value.get()
+    detector = BlockingCallDetector(asyncio.get_running_loop(), threshold_seconds=0.05, probe_interval_seconds=0.01)
+    detector.start()
+    try:
+        await asyncio.sleep(0.05)
+        block_event_loop(0.3)
+        await asyncio.sleep(0.1)
+    finally:
+        detector.stop()
+
+    stall = get_loop_stalls()[0]
+    assert stall["duration_seconds"] >= 0.2
+    assert "block_event_loop" in stall["stack"]
+    assert EVENT_LOOP_STALLS._value.get() == stalls_before + 1
+
+
+@pytest.mark.asyncio
+async def test_detector_is_quiet_when_loop_is_responsive(monkeypatch):
+    monkeypatch.setattr(loop_monitor, "_stalls", loop_monitor.deque(maxlen=5))
+    detector = BlockingCallDetector(asyncio.get_running_loop(), threshold_seconds=0.05, probe_interval_seconds=0.01)
+    detector.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        detector.stop()
+
+    assert get_loop_stalls() == []
@@ -0,0 +1,37 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+
+
+def test_metrics_app_aggregates_multiprocess_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv(metrics.MULTIPROC_DIR_ENV, str(tmp_path))
+    app = FastAPI()
+    app.mount("/metrics", metrics.create_metrics_app())
+
+    response = TestClient(app).get("/metrics/")
+
+    assert response.status_code == 200
+    # в multiprocess-режиме отдаётся только содержимое каталога, без метрик текущего процесса
+    assert "app_requests_total" not in response.text
+
+
+def test_metrics_app_uses_process_registry_by_default(monkeypatch):
+    monkeypatch.delenv(metrics.MULTIPROC_DIR_ENV, raising=False)
+    app = FastAPI()
+    app.mount("/metrics", metrics.create_metrics_app())
+
+    response = TestClient(app).get("/metrics/")
+
+    assert response.status_code == 200
+    assert "app_db_pool_capacity_connections" in response.text
+
+
+def test_mark_metrics_process_dead_removes_live_gauges(tmp_path, monkeypatch):
+    monkeypatch.setenv(metrics.MULTIPROC_DIR_ENV, str(tmp_path))
+    (tmp_path / "gauge_livesum_12345.db").touch()
+    (tmp_path / "counter_12345.db").touch()
+
+    metrics.mark_metrics_process_dead(12345)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["counter_12345.db"]
@@ -0,0 +1,64 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from starlette.responses import StreamingResponse
+
+from app.middlwares.metrics_middleware import MetricsMiddleware, UNMATCHED_ROUTE
+
+
+@pytest.fixture
+def client():
+    api = FastAPI()
+
+    @api.get("/{bucket_name}/{object_key}")
+    async def download(bucket_name: str, object_key: str):
+        async def body():
+            yield b"abc"
+            yield b"defg"
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    @api.put("/{bucket_name}/{object_key}")
+    async def upload(bucket_name: str, object_key: str, request: Request):
+        return {"size": len(await request.body())}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.mount("/api/test", api)
+    return TestClient(app)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_labelled_by_route_template(client):
+    endpoint = "/api/test/{bucket_name}/{object_key}"
+    before = sample("app_requests_total", method="GET", endpoint=endpoint, status_code="200")
+
+    client.get("/api/test/bucket/one.txt")
+    client.get("/api/test/bucket/two.txt")
+
+    assert sample("app_requests_total", method="GET", endpoint=endpoint, status_code="200") == before + 2
+    assert sample("app_requests_total", method="GET", endpoint="/api/test/bucket/one.txt", status_code="200") == 0
+
+
+def test_streamed_response_and_request_bytes_are_counted(client):
+    endpoint = "/api/test/{bucket_name}/{object_key}"
+    response_before = sample("app_response_bytes_total", method="GET", endpoint=endpoint)
+    request_before = sample("app_request_bytes_total", method="PUT", endpoint=endpoint)
+
+    assert client.get("/api/test/bucket/file").content == b"abcdefg"
+    client.put("/api/test/bucket/file", content=b"x" * 1000)
+
+    assert sample("app_response_bytes_total", method="GET", endpoint=endpoint) == response_before + 7
+    assert sample("app_request_bytes_total", method="PUT", endpoint=endpoint) == request_before + 1000
+
+
+def test_unmatched_paths_share_one_label(client):
+    before = sample("app_requests_total", method="GET", endpoint=UNMATCHED_ROUTE, status_code="404")
+
+    client.get("/no/such/path")
+    client.get("/another/missing/path")
+
+    assert sample("app_requests_total", method="GET", endpoint=UNMATCHED_ROUTE, status_code="404") == before + 2
@@ -0,0 +1,180 @@
+import hashlib
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application import get_app
+from app.repositories.bucket_repository import get_bucket_repository
+from app.repositories.multipart_upload_repository import get_multipart_upload_repository
+from app.repositories.object_repository import get_object_repository
+from app.schemas import BucketResponse
+from app.schemas.multipart_upload_schema import MultipartUploadResponse
+from app.schemas.user_schema import UserResponse
+from app.services import object_service
+from app.services.auth_service import get_current_user
+from app.storage import LocalStorageBackend, object_storage_key, provider
+
+
+class FakeMultipartUploadRepository:
+    def __init__(self):
+        self.uploads = {}
+        self.parts = {}
+
+    async def create_upload(self, upload_id, bucket_id, bucket_name, object_key, owner_id, owner_name, extension):
+        upload = SimpleNamespace(id=len(self.uploads) + 1, upload_id=upload_id, bucket_id=bucket_id,
+                                 bucket_name=bucket_name,
+                                 object_key=object_key, owner_name=owner_name, extension=extension,
+                                 created_at=datetime.now())
+        self.uploads[upload_id] = upload
+        return MultipartUploadResponse.model_validate(upload)
+
+    async def get_upload(self, upload_id, bucket_name, object_key, owner_name):
+        upload = self.uploads.get(upload_id)
+        if upload and (upload.bucket_name, upload.object_key, upload.owner_name) == (bucket_name, object_key, owner_name):
+            return upload
+        return None
+
+    async def save_part(self, upload_pk, part_number, etag, size, path):
+        self.parts[(upload_pk, part_number)] = SimpleNamespace(part_number=part_number, etag=etag, size=size,
+                                                               file_storage_path=path)
+
+    async def get_parts(self, upload_pk):
+        return [part for (pk, _), part in sorted(self.parts.items()) if pk == upload_pk]
+
+    async def delete_upload(self, upload_pk):
+        self.uploads = {key: upload for key, upload in self.uploads.items() if upload.id != upload_pk}
+        self.parts = {key: part for key, part in self.parts.items() if key[0] != upload_pk}
+
+
+@pytest.fixture
+def multipart_repo():
+    return FakeMultipartUploadRepository()
+
+
+@pytest.fixture
+def object_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(provider, "_backend", LocalStorageBackend(tmp_path))
+    monkeypatch.setattr(object_service, "STAGING_ROOT", tmp_path / ".staging")
+    return tmp_path
+
+
+@pytest.fixture
+def client(multipart_repo, object_repo, storage_root):
+    bucket_repo = AsyncMock()
+    bucket_repo.get_bucket_by_name.return_value = BucketResponse(
+        id=1, bucket_name="bucket", owner_id=1, owner_name="user",
+        created_at=datetime.now(), updated_at=datetime.now()
+    )
+    user = UserResponse(id=1, username="user", email="user@example.com", created_at=datetime.now(), is_active=True)
+    app = get_app()
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_bucket_repository] = lambda: bucket_repo
+    app.dependency_overrides[get_object_repository] = lambda: object_repo
+    app.dependency_overrides[get_multipart_upload_repository] = lambda: multipart_repo
+    return TestClient(app)
+
+
+def upload_parts(client, upload_id, contents):
+    etags = {}
+    for number, content in contents.items():
+        response = client.put(f"/bucket/movie.mkv/uploads/{upload_id}/parts/{number}", content=content,
+                              headers={"Content-Type": "application/octet-stream"})
+        assert response.status_code == 200
+        etags[number] = response.json()["etag"]
+    return etags
+
+
+def test_multipart_upload_complete(client, object_repo, storage_root):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    etags = upload_parts(client, upload_id, {2: b"world", 1: b"hello "})
+
+    response = client.post(f"/bucket/movie.mkv/uploads/{upload_id}/complete",
+                           json={"parts": [{"part_number": n, "etag": etags[n]} for n in (1, 2)]})
+
+    assert response.status_code == 200
+    assert LocalStorageBackend(storage_root).path(object_storage_key("bucket", "movie.mkv")).read_bytes() == b"hello world"
+    args = object_repo.create_object.await_args.args
+    assert args[0] == 1 and args[5] == "mkv" and args[-1] == len(b"hello world")
+    assert not (storage_root / ".staging" / "multipart" / upload_id).exists()
+
+
+def test_multipart_upload_list_parts(client):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    upload_parts(client, upload_id, {1: b"abc"})
+
+    response = client.get(f"/bucket/movie.mkv/uploads/{upload_id}")
+
+    assert [(part["part_number"], part["size"]) for part in response.json()] == [(1, 3)]
+
+
+def test_multipart_upload_complete_with_wrong_etag(client, object_repo):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    upload_parts(client, upload_id, {1: b"abc"})
+
+    response = client.post(f"/bucket/movie.mkv/uploads/{upload_id}/complete",
+                           json={"parts": [{"part_number": 1, "etag": "bogus"}]})
+
+    assert response.status_code == 400
+    object_repo.create_object.assert_not_awaited()
+
+
+def test_multipart_upload_complete_with_unordered_parts(client):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    etags = upload_parts(client, upload_id, {1: b"a", 2: b"b"})
+
+    response = client.post(f"/bucket/movie.mkv/uploads/{upload_id}/complete",
+                           json={"parts": [{"part_number": n, "etag": etags[n]} for n in (2, 1)]})
+
+    assert response.status_code == 400
+
+
+def test_multipart_upload_abort(client, storage_root):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    upload_parts(client, upload_id, {1: b"abc"})
+
+    response = client.delete(f"/bucket/movie.mkv/uploads/{upload_id}")
+
+    assert response.status_code == 200
+    assert not (storage_root / ".staging" / "multipart" / upload_id).exists()
+    assert client.get(f"/bucket/movie.mkv/uploads/{upload_id}").status_code == 404
+
+
+def test_multipart_part_etag_is_md5_of_content(client):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+
+    etags = upload_parts(client, upload_id, {1: b"hello "})
+
+    assert etags[1] == hashlib.md5(b"hello ").hexdigest()
+
+
+def test_multipart_upload_complete_accepts_quoted_etags(client, object_repo):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    etags = upload_parts(client, upload_id, {1: b"hello"})
+
+    response = client.post(f"/bucket/movie.mkv/uploads/{upload_id}/complete",
+                           json={"parts": [{"part_number": 1, "etag": f'"{etags[1]}"'}]})
+
+    assert response.status_code == 200
+
+
+def test_multipart_part_row_keeps_matching_file_when_uploads_race(client, multipart_repo, storage_root):
+    upload_id = client.post("/bucket/movie.mkv/uploads").json()["upload_id"]
+    first = upload_parts(client, upload_id, {1: b"first"})
+    first_row = multipart_repo.parts[(1, 1)]
+    upload_parts(client, upload_id, {1: b"second"})
+    # запись первой загрузки попала в БД последней
+    multipart_repo.parts[(1, 1)] = first_row
+
+    response = client.post(f"/bucket/movie.mkv/uploads/{upload_id}/complete",
+                           json={"parts": [{"part_number": 1, "etag": first[1]}]})
+
+    assert response.status_code == 200
+    assert LocalStorageBackend(storage_root).path(object_storage_key("bucket", "movie.mkv")).read_bytes() == b"first"
@@ -0,0 +1,233 @@
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.query_stats import instrument_engine, track_request_queries
+from app.models.base_model import metadata
+from app.models.bucket import Bucket
+from app.models.object import Object
+from app.models.user import User
+from app.repositories.bucket_repository import BucketRepository
+from app.repositories.object_repository import ListMarker, ObjectRepository, build_object_upsert, prefix_upper_bound
+from app.repositories.user_repository import UserRepository
+
+
+def make_repository(existing_object):
+    session = AsyncMock()
+    session.add = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = existing_object
+    session.execute.return_value = result
+    user_repo = AsyncMock(spec=UserRepository)
+    bucket_repo = AsyncMock(spec=BucketRepository)
+    return ObjectRepository(session=session, user_repo=user_repo, bucket_repo=bucket_repo), session
+
+
+# upsert использует xmax и INSERT внутри CTE, поэтому проверяется только на настоящем PostgreSQL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+requires_postgres = pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL is not set")
+
+
+@asynccontextmanager
+async def postgres_object_repository():
+    """ObjectRepository поверх схемы во временной PostgreSQL-схеме с пользователем 1 и пустым бакетом 7."""
+    schema = f"test_{uuid4().hex}"
+    engine = create_async_engine(TEST_DATABASE_URL, connect_args={"server_settings": {"search_path": schema}})
+    instrument_engine(engine.sync_engine)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+            await connection.run_sync(metadata.create_all)
+        async with AsyncSession(engine) as session:
+            now = datetime.now()
+            session.add(User(id=1, username="testuser", hashed_password="x", email="test@example.com", created_at=now))
+            await session.flush()
+            session.add(Bucket(id=7, bucket_name="bucket", owner_name="testuser", owner_id=1, created_at=now))
+            await session.commit()
+            yield ObjectRepository(session, AsyncMock(spec=UserRepository), AsyncMock(spec=BucketRepository))
+    finally:
+        async with engine.begin() as connection:
+            await connection.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+        await engine.dispose()
+
+
+async def bucket_statistics(session) -> tuple[int, int]:
+    row = (await session.execute(select(Bucket.file_count, Bucket.total_size).where(Bucket.id == 7))).one()
+    return row.file_count, row.total_size
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_create_object_is_one_statement_and_one_commit():
+    async with postgres_object_repository() as repo:
+        with track_request_queries() as queries:
+            await repo.create_object(7, "bucket", "key", 1, "testuser", "txt", "/data/key.txt", "url", 10)
+
+        # BEGIN и COMMIT драйвер выполняет вне курсора, в счётчик попадает только сам upsert
+        assert queries.count == 1
+        repo.user_repo.get_user.assert_not_awaited()
+        repo.bucket_repo.read_bucket.assert_not_awaited()
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_create_object_increments_bucket_statistics():
+    async with postgres_object_repository() as repo:
+        await repo.create_object(7, "bucket", "key", 1, "testuser", "txt", "/data/key.txt", "url", 10)
+        await repo.create_object(7, "bucket", "other", 1, "testuser", "txt", "/data/other.txt", "url", 5)
+
+        assert await bucket_statistics(repo.session) == (2, 15)
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_create_object_overwrite_adjusts_bucket_size_only():
+    async with postgres_object_repository() as repo:
+        await repo.create_object(7, "bucket", "key", 1, "testuser", "txt", "/data/key.txt", "url", 4)
+        await repo.create_object(7, "bucket", "key", 1, "testuser", "bin", "/data/key.bin", "url", 10)
+
+        assert await bucket_statistics(repo.session) == (1, 10)
+        stored = (await repo.session.execute(select(Object).where(Object.object_key == "key"))).scalar_one()
+        assert (stored.size, stored.file_storage_path, stored.extension) == (10, "/data/key.bin", "bin")
+
+
+def test_object_upsert_updates_bucket_statistics_in_same_statement():
+    statement = build_object_upsert(7, "bucket", "key", 1, "testuser", "txt", "/data/key.txt", "url", 10)
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH ")
+    assert "ON CONFLICT (bucket_id, object_key) DO UPDATE" in sql
+    assert "RETURNING xmax = 0 AS inserted" in sql
+    assert "UPDATE bucket SET file_count=" in sql
+
+
+def executed_bucket_updates(session):
+    statements = [call.args[0] for call in session.execute.await_args_list]
+    return [statement.compile().params for statement in statements if statement.is_dml]
+
+
+@pytest.mark.asyncio
+async def test_delete_object_decrements_bucket_statistics():
+    existing = Object(id=3, bucket_id=7, object_key="key", size=4, file_storage_path="/old")
+    repo, session = make_repository(existing_object=existing)
+
+    assert await repo.delete_object("bucket", "key", "testuser") is True
+
+    [params] = executed_bucket_updates(session)
+    assert (params["file_count_1"], params["total_size_1"]) == (-1, -4)
+    session.delete.assert_awaited_once_with(existing)
+
+
+def stored_objects(*keys, bucket_id=7):
+    now = datetime.now()
+    return [
+        Object(id=i, bucket_id=bucket_id, bucket_name="bucket", object_key=key, owner_id=1, owner_name="testuser",
+               file_storage_path=f"/data/{key}", download_url="http://example.com/file", size=1, extension="txt",
+               created_at=now, updated_at=now)
+        for i, key in enumerate(keys, start=1)
+    ]
+
+
+def make_listing_repository(objects):
+    """Репозиторий, у которого выборка страницы идёт по списку в памяти с той же семантикой, что и SQL."""
+    repo, _ = make_repository(existing_object=None)
+    ordered = sorted(objects, key=lambda obj: (obj.bucket_id, obj.object_key))
+
+    async def fetch(username, bucket_id, prefix, marker, limit):
+        rows = [obj for obj in ordered if obj.object_key.startswith(prefix)]
+        if marker is not None:
+            if marker.skip_prefix:
+                upper = prefix_upper_bound(marker.object_key)
+                rows = [obj for obj in rows if (obj.bucket_id, obj.object_key) >= (marker.bucket_id, upper)]
+            else:
+                rows = [obj for obj in rows if (obj.bucket_id, obj.object_key) > tuple(marker[:2])]
+        return rows[:limit]
+
+    repo._fetch_objects_after = fetch
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_list_objects_paginates_with_keyset_marker():
+    repo = make_listing_repository(stored_objects("a", "b", "c", "d", "e"))
+
+    contents, prefixes, marker = await repo.list_objects("testuser", bucket_id=7, max_keys=2)
+    assert [obj.object_key for obj in contents] == ["a", "b"]
+    assert marker == ListMarker(7, "b")
+
+    contents, _, marker = await repo.list_objects("testuser", bucket_id=7, max_keys=2, marker=marker)
+    assert [obj.object_key for obj in contents] == ["c", "d"]
+
+    contents, _, marker = await repo.list_objects("testuser", bucket_id=7, max_keys=2, marker=marker)
+    assert [obj.object_key for obj in contents] == ["e"]
+    assert marker is None
+
+
+@pytest.mark.asyncio
+async def test_list_objects_groups_common_prefixes():
+    repo = make_listing_repository(stored_objects(
+        "docs/a.txt", "docs/b.txt", "docs/c.txt", "photos/2024/1.jpg", "photos/2025/1.jpg", "readme.md"
+    ))
+
+    contents, prefixes, marker = await repo.list_objects("testuser", bucket_id=7, delimiter="/", max_keys=2)
+    assert contents == []
+    assert prefixes == ["docs/", "photos/"]
+    assert marker == ListMarker(7, "photos/", skip_prefix=True)
+
+    contents, prefixes, marker = await repo.list_objects("testuser", bucket_id=7, delimiter="/", max_keys=2,
+                                                         marker=marker)
+    assert [obj.object_key for obj in contents] == ["readme.md"]
+    assert prefixes == []
+    assert marker is None
+
+
+@pytest.mark.asyncio
+async def test_list_objects_with_prefix_and_delimiter():
+    repo = make_listing_repository(stored_objects(
+        "photos/2024/1.jpg", "photos/2024/2.jpg", "photos/2025/1.jpg", "photos/cover.jpg", "readme.md"
+    ))
+
+    contents, prefixes, marker = await repo.list_objects("testuser", bucket_id=7, prefix="photos/", delimiter="/")
+
+    assert [obj.object_key for obj in contents] == ["photos/cover.jpg"]
+    assert prefixes == ["photos/2024/", "photos/2025/"]
+    assert marker is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_objects_after_uses_keyset_range():
+    repo, session = make_repository(existing_object=None)
+    session.execute.return_value.scalars.return_value.all.return_value = []
+
+    await repo._fetch_objects_after("testuser", 7, "photos/", ListMarker(7, "photos/2024/", skip_prefix=True), 11)
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "(object.bucket_id, object.object_key) >= (%(param_1)s, %(param_2)s)" in sql
+    assert "object.object_key >= %(object_key_1)s AND object.object_key < %(object_key_2)s" in sql
+    assert "ORDER BY object.bucket_id, object.object_key" in sql
+    assert "OFFSET" not in sql
+
+
+def test_list_marker_token_round_trip():
+    marker = ListMarker(7, "photos/2024/", skip_prefix=True)
+
+    assert ListMarker.from_token(marker.to_token()) == marker
+
+
+@pytest.mark.parametrize("token", ["not-base64!", "bm90IGpzb24=", "WzEsMl0=", "WyIxIiwiYSIsZmFsc2Vd"])
+def test_list_marker_rejects_invalid_tokens(token):
+    with pytest.raises(ValueError):
+        ListMarker.from_token(token)
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("photos/") == "photos0"
+    assert prefix_upper_bound("a\U0010ffff") == "b"
+    assert prefix_upper_bound("") is None
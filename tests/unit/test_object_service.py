@@ -0,0 +1,101 @@
+import errno
+import io
+from unittest.mock import patch
+
+import pytest
+from fastapi import UploadFile
+from starlette.requests import ClientDisconnect
+
+from app.services.object_service import append_request_stream
+from app.storage.files import save_upload_file, concatenate_files
+
+
+@pytest.mark.asyncio
+async def test_save_upload_file_writes_whole_content(tmp_path):
+    content = b"0123456789" * 1000
+    upload = UploadFile(file=io.BytesIO(content), filename="data.bin")
+    path = tmp_path / "data.bin"
+
+    size = await save_upload_file(upload, path, chunk_size=64)
+
+    assert size == len(content)
+    assert path.read_bytes() == content
+
+
+@pytest.mark.asyncio
+async def test_save_upload_file_reads_in_fixed_size_chunks(tmp_path):
+    content = b"x" * 1000
+    source = io.BytesIO(content)
+    upload = UploadFile(file=source, filename="data.bin")
+    read_sizes = []
+    original_read = source.read
+
+    def tracking_read(size=-1):
+        read_sizes.append(size)
+        return original_read(size)
+
+    with patch.object(source, "read", side_effect=tracking_read):
+        await save_upload_file(upload, tmp_path / "data.bin", chunk_size=128)
+
+    assert read_sizes and all(size == 128 for size in read_sizes)
+
+
+@pytest.mark.asyncio
+async def test_save_upload_file_rewinds_partially_read_upload(tmp_path):
+    upload = UploadFile(file=io.BytesIO(b"payload"), filename="data.bin")
+    await upload.read(3)
+
+    size = await save_upload_file(upload, tmp_path / "data.bin")
+
+    assert size == len(b"payload")
+    assert (tmp_path / "data.bin").read_bytes() == b"payload"
+
+
+@pytest.mark.asyncio
+async def test_concatenate_files_joins_parts_in_order(tmp_path):
+    parts = []
+    for number, content in enumerate([b"first-", b"second-", b"third"], start=1):
+        part = tmp_path / f"{number}.part"
+        part.write_bytes(content)
+        parts.append(part)
+    destination = tmp_path / "object.bin"
+
+    size = await concatenate_files(parts, destination)
+
+    assert size == len(b"first-second-third")
+    assert destination.read_bytes() == b"first-second-third"
+
+
+@pytest.mark.asyncio
+async def test_concatenate_files_falls_back_when_copy_file_range_is_unsupported(tmp_path):
+    part = tmp_path / "1.part"
+    part.write_bytes(b"payload" * 100)
+    destination = tmp_path / "object.bin"
+
+    with patch("os.copy_file_range", side_effect=OSError(errno.EXDEV, "cross-device"), create=True):
+        size = await concatenate_files([part, part], destination, chunk_size=16)
+
+    assert size == 1400
+    assert destination.read_bytes() == b"payload" * 200
+
+
+class DisconnectingRequest:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+        raise ClientDisconnect()
+
+
+@pytest.mark.asyncio
+async def test_append_request_stream_keeps_bytes_received_before_disconnect(tmp_path):
+    path = tmp_path / "upload.partial"
+    path.write_bytes(b"committed|garbage from a crashed write")
+
+    written, completed = await append_request_stream(DisconnectingRequest([b"more", b"data"]), path,
+                                                     offset=len(b"committed|"), limit=100)
+
+    assert (written, completed) == (8, False)
+    assert path.read_bytes() == b"committed|moredata"
@@ -0,0 +1,358 @@
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import objects_api
+from app.application import get_app
+from app.repositories.bucket_repository import get_bucket_repository
+from app.repositories.object_repository import ListMarker, ObjectRepository, get_object_repository
+from app.schemas import BucketResponse
+from app.schemas.user_schema import UserResponse
+from app.services.auth_service import get_current_user
+from app.storage import LocalStorageBackend, object_storage_key, provider
+from app.storage import local as local_storage
+
+
+@pytest.fixture
+def current_user():
+    return UserResponse(id=1, username="user", email="user@example.com", created_at=datetime.now(), is_active=True)
+
+
+@pytest.fixture
+def bucket_repo():
+    repo = AsyncMock()
+    repo.get_bucket_by_name.return_value = BucketResponse(
+        id=1, bucket_name="bucket", owner_id=1, owner_name="user",
+        created_at=datetime.now(), updated_at=datetime.now()
+    )
+    return repo
+
+
+@pytest.fixture
+def object_repo():
+    repo = AsyncMock()
+    # file_storage_path записей объектов по (bucket_id, object_key), как в таблице object
+    repo.storage_paths = {}
+
+    async def create_object(bucket_id, bucket_name, object_key, owner_id, owner_name, extension, path, url, size):
+        repo.storage_paths[(bucket_id, object_key)] = path
+
+    async def get_storage_path(bucket_id, object_key):
+        return repo.storage_paths.get((bucket_id, object_key))
+
+    repo.create_object.side_effect = create_object
+    repo.get_storage_path.side_effect = get_storage_path
+    return repo
+
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(provider, "_backend", LocalStorageBackend(tmp_path))
+    return tmp_path
+
+
+def object_path(storage_root, bucket_name, object_key):
+    return LocalStorageBackend(storage_root).path(object_storage_key(bucket_name, object_key))
+
+
+@pytest.fixture
+def client(current_user, bucket_repo, object_repo, storage_root):
+    app = get_app()
+    app.dependency_overrides[get_current_user] = lambda: current_user
+    app.dependency_overrides[get_bucket_repository] = lambda: bucket_repo
+    app.dependency_overrides[get_object_repository] = lambda: object_repo
+    return TestClient(app)
+
+
+def test_upload_object_multipart(client, object_repo, storage_root):
+    response = client.put("/bucket/report.txt", files={"file": ("report.txt", b"multipart body")})
+
+    assert response.status_code == 200
+    path = object_path(storage_root, "bucket", "report.txt")
+    assert path.read_bytes() == b"multipart body"
+    assert path.parent == storage_root / ".objects" / path.name[:2] / path.name[2:4]
+    args = object_repo.create_object.await_args.args
+    assert args[:5] == (1, "bucket", "report.txt", 1, "user")
+    assert args[5] == "txt"
+    assert args[6] == object_storage_key("bucket", "report.txt")
+    assert args[-1] == len(b"multipart body")
+
+
+def test_upload_object_raw_body(client, object_repo, storage_root):
+    content = b"raw body " * 10000
+    response = client.put("/bucket/archive.tar", content=content,
+                          headers={"Content-Type": "application/octet-stream"})
+
+    assert response.status_code == 200
+    path = object_path(storage_root, "bucket", "archive.tar")
+    assert path.read_bytes() == content
+    args = object_repo.create_object.await_args.args
+    assert args[5] == "tar"
+    assert args[-1] == len(content)
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+
+def test_upload_object_raw_body_overwrites_existing_object(client, storage_root):
+    client.put("/bucket/data.bin", content=b"old", headers={"Content-Type": "application/octet-stream"})
+    client.put("/bucket/data.bin", content=b"new", headers={"Content-Type": "application/octet-stream"})
+
+    assert object_path(storage_root, "bucket", "data.bin").read_bytes() == b"new"
+
+
+def test_upload_object_overwrite_removes_legacy_copy(client, storage_root):
+    legacy_path = storage_root / "bucket" / "data.bin"
+    legacy_path.parent.mkdir()
+    legacy_path.write_bytes(b"old")
+
+    client.put("/bucket/data.bin", content=b"new", headers={"Content-Type": "application/octet-stream"})
+
+    assert not legacy_path.exists()
+    assert client.get("/bucket/data.bin").content == b"new"
+
+
+def test_upload_object_multipart_without_file(client):
+    response = client.put("/bucket/report.txt", files={"other": ("report.txt", b"body")})
+
+    assert response.status_code == 400
+
+
+def test_upload_object_rejects_urlencoded_form(client, object_repo):
+    response = client.put("/bucket/data.bin", content=b"a=1",
+                          headers={"Content-Type": "application/x-www-form-urlencoded"})
+
+    assert response.status_code == 415
+    object_repo.create_object.assert_not_awaited()
+
+
+def test_upload_object_raw_body_without_content_type(client, storage_root):
+    response = client.put("/bucket/data.bin", content=b"body")
+
+    assert response.status_code == 200
+    assert object_path(storage_root, "bucket", "data.bin").read_bytes() == b"body"
+
+
+def test_upload_object_to_foreign_bucket(client, bucket_repo, object_repo):
+    bucket_repo.get_bucket_by_name.return_value.owner_name = "someone-else"
+
+    response = client.put("/bucket/data.bin", content=b"body", headers={"Content-Type": "application/octet-stream"})
+
+    assert response.status_code == 403
+    object_repo.create_object.assert_not_awaited()
+
+
+def test_upload_object_database_round_trips(client, bucket_repo, storage_root):
+    session = AsyncMock()
+    client.app.dependency_overrides[get_object_repository] = lambda: ObjectRepository(
+        session=session, user_repo=AsyncMock(), bucket_repo=AsyncMock()
+    )
+
+    response = client.put("/bucket/data.bin", content=b"body", headers={"Content-Type": "application/octet-stream"})
+
+    assert response.status_code == 200
+    # одна выборка бакета для проверки владельца и один upsert объекта с одним коммитом
+    bucket_repo.get_bucket_by_name.assert_awaited_once()
+    assert session.execute.await_count == 1
+    assert session.commit.await_count == 1
+
+
+@pytest.fixture
+def stored_object(storage_root, object_repo):
+    # объект, сохранённый до появления хранилищ: в записи абсолютный путь root/bucket/key
+    path = storage_root / "bucket" / "video.mp4"
+    path.parent.mkdir()
+    path.write_bytes(bytes(range(256)) * 4)
+    object_repo.storage_paths[(1, "video.mp4")] = str(path)
+    return path
+
+
+def test_download_object_full(client, stored_object):
+    response = client.get("/bucket/video.mp4")
+
+    assert response.status_code == 200
+    assert response.content == stored_object.read_bytes()
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "etag" in response.headers and "last-modified" in response.headers
+
+
+def test_download_object_missing(client, storage_root):
+    response = client.get("/bucket/missing.bin")
+
+    assert response.status_code == 404
+
+
+def test_download_object_resolves_content_through_database_record(client, object_repo, storage_root):
+    client.put("/bucket/data.bin", content=b"body", headers={"Content-Type": "application/octet-stream"})
+
+    assert client.get("/bucket/data.bin").content == b"body"
+    object_repo.get_storage_path.assert_awaited_with(1, "data.bin")
+    # без записи в БД файл в хранилище не отдаётся
+    object_repo.storage_paths.clear()
+    assert client.get("/bucket/data.bin").status_code == 404
+
+
+def test_download_object_single_range(client, stored_object):
+    response = client.get("/bucket/video.mp4", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == stored_object.read_bytes()[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/1024"
+
+
+def test_download_object_multiple_ranges(client, stored_object):
+    response = client.get("/bucket/video.mp4", headers={"Range": "bytes=0-3,100-103"})
+
+    assert response.status_code == 206
+    assert response.headers["content-type"].startswith("multipart/byteranges")
+    assert stored_object.read_bytes()[100:104] in response.content
+
+
+def test_download_object_if_none_match(client, stored_object):
+    etag = client.get("/bucket/video.mp4").headers["etag"]
+
+    response = client.get("/bucket/video.mp4", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_download_object_if_modified_since(client, stored_object):
+    last_modified = client.get("/bucket/video.mp4").headers["last-modified"]
+
+    response = client.get("/bucket/video.mp4", headers={"If-Modified-Since": last_modified})
+
+    assert response.status_code == 304
+
+
+def test_download_object_if_none_match_takes_precedence(client, stored_object):
+    last_modified = client.get("/bucket/video.mp4").headers["last-modified"]
+
+    response = client.get("/bucket/video.mp4", headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+
+    assert response.status_code == 200
+
+
+def test_download_object_if_range_mismatch_returns_full_object(client, stored_object):
+    response = client.get("/bucket/video.mp4", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+
+    assert response.status_code == 200
+    assert len(response.content) == 1024
+
+
+def test_list_objects_returns_page(client, object_repo):
+    object_repo.list_objects.return_value = ([], ["docs/"], ListMarker(1, "docs/", skip_prefix=True))
+
+    response = client.get("/bucket", params={"delimiter": "/", "max-keys": 1})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["common_prefixes"] == ["docs/"]
+    assert body["key_count"] == 1
+    assert body["is_truncated"] is True
+    assert ListMarker.from_token(body["next_continuation_token"]) == ListMarker(1, "docs/", skip_prefix=True)
+    assert object_repo.list_objects.await_args.kwargs == {
+        "bucket_id": 1, "prefix": "", "delimiter": "/", "max_keys": 1, "marker": None
+    }
+
+
+def test_list_objects_passes_continuation_token(client, object_repo):
+    object_repo.list_objects.return_value = ([], [], None)
+
+    response = client.get("/bucket",
+                          params={"continuation-token": ListMarker(1, "b").to_token()})
+
+    assert response.status_code == 200
+    assert response.json()["is_truncated"] is False
+    assert object_repo.list_objects.await_args.kwargs["marker"] == ListMarker(1, "b")
+
+
+def test_list_objects_rejects_invalid_token(client, object_repo):
+    response = client.get("/bucket", params={"continuation-token": "garbage"})
+
+    assert response.status_code == 400
+    object_repo.list_objects.assert_not_awaited()
+
+
+def test_list_objects_in_foreign_bucket(client, bucket_repo):
+    bucket_repo.get_bucket_by_name.return_value.owner_name = "someone-else"
+
+    assert client.get("/bucket").status_code == 403
+
+
+@pytest.fixture
+def streamed_rows(monkeypatch):
+    calls = []
+    created = datetime(2026, 1, 2, 3, 4, 5)
+
+    async def fake_stream_object_rows(username, bucket_id=None, prefix="", batch_size=1000):
+        calls.append((username, bucket_id, prefix))
+        yield [{"object_key": "a", "size": 1, "created_at": created}, {"object_key": "b", "size": 2, "created_at": created}]
+        yield [{"object_key": "c", "size": 3, "created_at": created}]
+
+    monkeypatch.setattr(objects_api, "stream_object_rows", fake_stream_object_rows)
+    return calls
+
+
+def test_list_objects_stream_ndjson(client, object_repo, streamed_rows):
+    response = client.get("/bucket", params={"stream": "ndjson", "prefix": "p"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["object_key"] for line in lines] == ["a", "b", "c"]
+    assert lines[0]["created_at"] == "2026-01-02T03:04:05"
+    assert streamed_rows == [("user", 1, "p")]
+    object_repo.list_objects.assert_not_awaited()
+
+
+def test_list_objects_stream_json_array(client, streamed_rows):
+    response = client.get("/bucket", params={"stream": "json"})
+
+    assert response.status_code == 200
+    assert [item["size"] for item in response.json()] == [1, 2, 3]
+
+
+def test_list_objects_stream_rejects_pagination_params(client, streamed_rows):
+    response = client.get("/bucket", params={"stream": "ndjson", "delimiter": "/"})
+
+    assert response.status_code == 400
+    assert streamed_rows == []
+
+
+def test_object_metadata_uses_single_stat(client, storage_root, object_repo, monkeypatch):
+    path = object_path(storage_root, "bucket", "video.mp4")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(bytes(1024))
+    object_repo.storage_paths[(1, "video.mp4")] = object_storage_key("bucket", "video.mp4")
+    stat_calls = []
+    original_stat = local_storage.stat_object_file
+
+    async def counting_stat(path):
+        stat_calls.append(path)
+        return await original_stat(path)
+
+    monkeypatch.setattr(local_storage, "stat_object_file", counting_stat)
+
+    response = client.head("/bucket/video.mp4/metadata")
+
+    assert response.status_code == 200
+    assert response.headers["x-file-name"] == "video.mp4"
+    assert response.headers["x-file-size-kb"] == "1024"
+    assert stat_calls == [path]
+
+
+def test_object_metadata_missing(client, storage_root):
+    assert client.head("/bucket/missing.bin/metadata").status_code == 404
+
+
+def test_delete_object_removes_file(client, object_repo, stored_object):
+    # объект, сохранённый до появления хранилищ, хранит в записи абсолютный путь
+    object_repo.read_object.return_value.file_storage_path = str(stored_object)
+
+    response = client.delete("/bucket/video.mp4")
+
+    assert response.status_code == 200
+    assert not stored_object.exists()
@@ -0,0 +1,123 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import ForeignKey, create_engine, select, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship, selectinload
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERY_DURATION
+from app.core.query_stats import (QueryStatsMiddleware, instrument_engine, statement_fingerprint,
+                                   track_request_queries)
+from app.exceptions.query_error import LazyLoadError, QueryBudgetExceededError
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Parent(Base):
+    __tablename__ = "parent"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    children: Mapped[list["Child"]] = relationship(back_populates="parent")
+
+
+class Child(Base):
+    __tablename__ = "child"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("parent.id"))
+    parent: Mapped[Parent] = relationship(back_populates="children")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Parent(id=1, children=[Child(id=1), Child(id=2)]))
+        session.commit()
+    return engine
+
+
+def test_fingerprint_ignores_parameter_values():
+    first = statement_fingerprint("SELECT bucket.id FROM bucket WHERE bucket.bucket_name = $1 LIMIT 10")
+    second = statement_fingerprint("SELECT bucket.id\n  FROM bucket WHERE bucket.bucket_name = $2 LIMIT 20")
+
+    assert first == second
+    assert first.startswith("SELECT bucket ")
+    assert statement_fingerprint("SELECT 1 FROM t WHERE id IN ($1, $2)") == \
+        statement_fingerprint("SELECT 1 FROM t WHERE id IN ($1, $2, $3)")
+
+
+def test_counts_queries_and_time_per_request(engine):
+    with track_request_queries() as queries, engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+
+    assert queries.count == 2
+    assert queries.duration > 0
+    fingerprint = statement_fingerprint("SELECT 1")
+    assert DB_QUERY_DURATION.labels(fingerprint=fingerprint)._sum.get() > 0
+
+
+def test_query_budget_raises_in_debug_mode(engine, monkeypatch):
+    monkeypatch.setattr(settings.db, "query_debug", "raise")
+    monkeypatch.setattr(settings.db, "max_queries_per_request", 2)
+
+    with track_request_queries(), engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(QueryBudgetExceededError):
+            connection.execute(text("SELECT 1"))
+
+
+def test_query_budget_is_ignored_when_debug_is_off(engine, monkeypatch):
+    monkeypatch.setattr(settings.db, "max_queries_per_request", 1)
+
+    with track_request_queries() as queries, engine.connect() as connection:
+        for _ in range(3):
+            connection.execute(text("SELECT 1"))
+
+    assert queries.count == 3
+
+
+def test_lazy_relationship_load_is_reported(engine, monkeypatch):
+    monkeypatch.setattr(settings.db, "query_debug", "raise")
+
+    with Session(engine) as session:
+        parent = session.scalars(select(Parent)).one()
+        with pytest.raises(LazyLoadError, match="Parent.children"):
+            parent.children
+
+
+def test_eager_relationship_load_is_not_reported(engine, monkeypatch):
+    monkeypatch.setattr(settings.db, "query_debug", "raise")
+
+    with Session(engine) as session:
+        parent = session.scalars(select(Parent).options(selectinload(Parent.children))).one()
+
+        assert len(parent.children) == 2
+
+
+def test_middleware_records_queries_per_route(engine):
+    api = FastAPI()
+
+    @api.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return {}
+
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    app.mount("/api", api)
+    labels = {"method": "GET", "endpoint": "/api/items/{item_id}"}
+    count_before = REGISTRY.get_sample_value("app_db_queries_per_request_count", labels) or 0
+    sum_before = REGISTRY.get_sample_value("app_db_queries_per_request_sum", labels) or 0
+
+    TestClient(app).get("/api/items/1")
+
+    assert REGISTRY.get_sample_value("app_db_queries_per_request_count", labels) == count_before + 1
+    assert REGISTRY.get_sample_value("app_db_queries_per_request_sum", labels) == sum_before + 2
@@ -0,0 +1,132 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.responses import ObjectFileResponse, ZEROCOPY_SEND_EXTENSION, parse_byte_ranges
+
+
+def make_scope(headers=None, zerocopy=True):
+    return {
+        "type": "http",
+        "method": "GET",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+        "extensions": {ZEROCOPY_SEND_EXTENSION: {}} if zerocopy else {},
+    }
+
+
+async def collect(response, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        if message["type"] == ZEROCOPY_SEND_EXTENSION:
+            message = dict(message, data=message["file"].read())
+        messages.append(message)
+
+    await response(scope, receive, send)
+    return messages
+
+
+@pytest.fixture
+def object_file(tmp_path):
+    path = tmp_path / "object.bin"
+    path.write_bytes(b"abcdefghijklmnopqrstuvwxyz")
+    return path
+
+
+@pytest.mark.asyncio
+async def test_zerocopy_send_whole_file(object_file):
+    messages = await collect(ObjectFileResponse(object_file), make_scope())
+
+    assert messages[0]["status"] == 200
+    assert messages[1]["type"] == ZEROCOPY_SEND_EXTENSION
+    assert (messages[1]["offset"], messages[1]["count"]) == (0, 26)
+
+
+@pytest.mark.asyncio
+async def test_zerocopy_send_single_range(object_file):
+    messages = await collect(ObjectFileResponse(object_file), make_scope({"Range": "bytes=5-9"}))
+
+    assert messages[0]["status"] == 206
+    assert (messages[1]["offset"], messages[1]["count"]) == (5, 5)
+
+
+@pytest.mark.asyncio
+async def test_without_zerocopy_extension_body_is_read(object_file):
+    messages = await collect(ObjectFileResponse(object_file), make_scope({"Range": "bytes=5-9"}, zerocopy=False))
+
+    assert messages[0]["status"] == 206
+    assert messages[1]["type"] == "http.response.body"
+    assert messages[1]["body"] == b"fghij"
+
+
+@pytest.mark.asyncio
+async def test_weak_etag_matches_if_none_match(object_file):
+    etag = (await collect(ObjectFileResponse(object_file), make_scope()))[0]["headers"]
+    etag = dict(etag)[b"etag"].decode()
+
+    messages = await collect(ObjectFileResponse(object_file), make_scope({"If-None-Match": f"W/{etag}"}))
+
+    assert messages[0]["status"] == 304
+
+
+@pytest.mark.asyncio
+async def test_multiple_ranges_use_multipart_content_type(object_file):
+    messages = await collect(ObjectFileResponse(object_file), make_scope({"Range": "bytes=0-1,10-11"}, zerocopy=False))
+    headers = dict(messages[0]["headers"])
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+
+    assert messages[0]["status"] == 206
+    assert headers[b"content-type"].startswith(b"multipart/byteranges; boundary=")
+    assert b"content-range" not in headers
+    assert int(headers[b"content-length"]) == len(body)
+    assert b"ab" in body and b"kl" in body
+
+
+@pytest.mark.asyncio
+async def test_multiple_ranges_stop_at_eof_of_truncated_file(object_file):
+    response = ObjectFileResponse(object_file, stat_result=os.stat(object_file))
+    object_file.write_bytes(b"abc")
+
+    messages = await asyncio.wait_for(
+        collect(response, make_scope({"Range": "bytes=0-1,10-11"}, zerocopy=False)), timeout=1)
+
+    assert messages[-1]["more_body"] is False
+    assert all(message["body"] for message in messages[1:-1])
+
+
+@pytest.mark.parametrize("http_range, expected", [
+    ("bytes=5-9", [(5, 10)]),
+    ("bytes=-3", [(23, 26)]),
+    ("bytes=20-", [(20, 26)]),
+    ("bytes=10-11,0-1,1-3", [(0, 4), (10, 12)]),
+    ("bytes=30-40", []),
+])
+def test_parse_byte_ranges(http_range, expected):
+    assert parse_byte_ranges(http_range, 26) == expected
+
+
+@pytest.mark.parametrize("http_range", ["items=0-1", "bytes=", "bytes=5-2", "bytes=a-b"])
+def test_parse_byte_ranges_rejects_malformed_header(http_range):
+    with pytest.raises(ValueError):
+        parse_byte_ranges(http_range, 26)
+
+
+@pytest.mark.asyncio
+async def test_unsatisfiable_range_returns_416(object_file):
+    messages = await collect(ObjectFileResponse(object_file), make_scope({"Range": "bytes=30-40"}))
+
+    assert messages[0]["status"] == 416
+    assert dict(messages[0]["headers"])[b"content-range"] == b"bytes */26"
+
+
+@pytest.mark.asyncio
+async def test_stale_if_range_returns_whole_file(object_file):
+    messages = await collect(ObjectFileResponse(object_file),
+                             make_scope({"Range": "bytes=5-9", "If-Range": '"stale"'}, zerocopy=False))
+
+    assert messages[0]["status"] == 200
+    assert b"".join(message["body"] for message in messages[1:]) == b"abcdefghijklmnopqrstuvwxyz"
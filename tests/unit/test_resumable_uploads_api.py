@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.application import get_app
+from app.exceptions.sql_error import SqlError
+from app.repositories.bucket_repository import get_bucket_repository
+from app.repositories.object_repository import get_object_repository
+from app.repositories.upload_session_repository import get_upload_session_repository
+from app.schemas import BucketResponse
+from app.schemas.upload_session_schema import UploadSessionResponse
+from app.schemas.user_schema import UserResponse
+from app.services import object_service
+from app.services.auth_service import get_current_user
+from app.storage import LocalStorageBackend, object_storage_key, provider
+
+PATCH_HEADERS = {"Content-Type": "application/offset+octet-stream"}
+
+
+class FakeUploadSessionRepository:
+    def __init__(self):
+        self.sessions = {}
+
+    async def create_session(self, session_id, bucket_id, bucket_name, object_key, owner_id, owner_name, extension,
+                             upload_length, path, expires_at):
+        upload_session = SimpleNamespace(id=len(self.sessions) + 1, session_id=session_id, bucket_id=bucket_id,
+                                         bucket_name=bucket_name,
+                                         object_key=object_key, owner_name=owner_name, extension=extension,
+                                         upload_length=upload_length, upload_offset=0, file_storage_path=path,
+                                         expires_at=expires_at)
+        self.sessions[session_id] = upload_session
+        return UploadSessionResponse.model_validate(upload_session)
+
+    async def get_session(self, session_id, bucket_name, object_key, owner_name):
+        return self.sessions.get(session_id)
+
+    async def update_offset(self, session_pk, expected_offset, upload_offset, expires_at):
+        for upload_session in self.sessions.values():
+            if upload_session.id == session_pk and upload_session.upload_offset == expected_offset:
+                upload_session.upload_offset = upload_offset
+                upload_session.expires_at = expires_at
+                return True
+        return False
+
+    async def delete_session(self, session_pk):
+        self.sessions = {key: value for key, value in self.sessions.items() if value.id != session_pk}
+
+
+@pytest.fixture
+def session_repo():
+    return FakeUploadSessionRepository()
+
+
+@pytest.fixture
+def object_repo():
+    return AsyncMock()
+
+
+@pytest.fixture
+def storage_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(provider, "_backend", LocalStorageBackend(tmp_path))
+    monkeypatch.setattr(object_service, "STAGING_ROOT", tmp_path / ".staging")
+    return tmp_path
+
+
+@pytest.fixture
+def client(session_repo, object_repo, storage_root):
+    bucket_repo = AsyncMock()
+    bucket_repo.get_bucket_by_name.return_value = BucketResponse(
+        id=1, bucket_name="bucket", owner_id=1, owner_name="user",
+        created_at=datetime.now(), updated_at=datetime.now()
+    )
+    user = UserResponse(id=1, username="user", email="user@example.com", created_at=datetime.now(), is_active=True)
+    app = get_app()
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_bucket_repository] = lambda: bucket_repo
+    app.dependency_overrides[get_object_repository] = lambda: object_repo
+    app.dependency_overrides[get_upload_session_repository] = lambda: session_repo
+    return TestClient(app)
+
+
+def create_session(client, length):
+    response = client.post("/bucket/backup.zip/resumable", headers={"Upload-Length": str(length)})
+    assert response.status_code == 201
+    return response.json()["session_id"]
+
+
+def test_resumable_upload_in_two_requests(client, object_repo, storage_root):
+    session_id = create_session(client, 10)
+    url = f"/bucket/backup.zip/resumable/{session_id}"
+
+    first = client.patch(url, content=b"01234", headers={**PATCH_HEADERS, "Upload-Offset": "0"})
+    offset = client.head(url).headers["Upload-Offset"]
+    second = client.patch(url, content=b"56789", headers={**PATCH_HEADERS, "Upload-Offset": offset})
+
+    assert first.status_code == 204 and first.headers["Upload-Offset"] == "5"
+    assert offset == "5"
+    assert second.status_code == 204 and second.headers["Upload-Offset"] == "10"
+    assert LocalStorageBackend(storage_root).path(object_storage_key("bucket", "backup.zip")).read_bytes() == b"0123456789"
+    assert object_repo.create_object.await_args.args[-1] == 10
+    assert client.head(url).status_code == 404
+
+
+def test_resumable_upload_can_be_finished_again_after_database_error(client, object_repo, storage_root):
+    session_id = create_session(client, 4)
+    url = f"/bucket/backup.zip/resumable/{session_id}"
+    object_repo.create_object.side_effect = SqlError("connection lost")
+
+    with pytest.raises(SqlError):
+        client.patch(url, content=b"data", headers={**PATCH_HEADERS, "Upload-Offset": "0"})
+
+    assert client.head(url).headers["Upload-Offset"] == "4"
+    object_repo.create_object.side_effect = None
+    response = client.patch(url, content=b"", headers={**PATCH_HEADERS, "Upload-Offset": "4"})
+
+    assert response.status_code == 204
+    assert LocalStorageBackend(storage_root).path(object_storage_key("bucket", "backup.zip")).read_bytes() == b"data"
+    assert client.head(url).status_code == 404
+
+
+def test_resumable_upload_rejects_wrong_offset(client):
+    session_id = create_session(client, 10)
+
+    response = client.patch(f"/bucket/backup.zip/resumable/{session_id}", content=b"56789",
+                            headers={**PATCH_HEADERS, "Upload-Offset": "5"})
+
+    assert response.status_code == 409
+
+
+def test_resumable_upload_rejects_body_over_declared_length(client):
+    session_id = create_session(client, 3)
+
+    response = client.patch(f"/bucket/backup.zip/resumable/{session_id}", content=b"too long",
+                            headers={**PATCH_HEADERS, "Upload-Offset": "0"})
+
+    assert response.status_code == 413
+    assert client.head(f"/bucket/backup.zip/resumable/{session_id}").headers["Upload-Offset"] == "0"
+
+
+def test_resumable_upload_expired_session(client, session_repo):
+    session_id = create_session(client, 10)
+    session_repo.sessions[session_id].expires_at = datetime.now() - timedelta(seconds=1)
+
+    response = client.head(f"/bucket/backup.zip/resumable/{session_id}")
+
+    assert response.status_code == 410
+
+
+def test_resumable_upload_terminate(client, session_repo, storage_root):
+    session_id = create_session(client, 10)
+    partial = storage_root / ".staging" / "resumable" / f"{session_id}.partial"
+    assert partial.exists()
+
+    response = client.delete(f"/bucket/backup.zip/resumable/{session_id}")
+
+    assert response.status_code == 204
+    assert not partial.exists()
+    assert session_id not in session_repo.sessions
+
+
+def test_resumable_upload_rejects_patch_while_another_is_in_progress(client, storage_root):
+    fcntl = pytest.importorskip("fcntl")
+    session_id = create_session(client, 10)
+    partial = storage_root / ".staging" / "resumable" / f"{session_id}.partial"
+
+    with open(partial, "rb") as locked:
+        fcntl.flock(locked.fileno(), fcntl.LOCK_EX)
+        response = client.patch(f"/bucket/backup.zip/resumable/{session_id}", content=b"01234",
+                                headers={**PATCH_HEADERS, "Upload-Offset": "0"})
+
+    assert response.status_code == 409
+    assert client.head(f"/bucket/backup.zip/resumable/{session_id}").headers["Upload-Offset"] == "0"
+
+
+def test_resumable_upload_rejects_offset_committed_concurrently(client, session_repo):
+    session_id = create_session(client, 10)
+    original_update = session_repo.update_offset
+
+    async def racing_update(session_pk, expected_offset, upload_offset, expires_at):
+        # другой запрос успел зафиксировать своё смещение
+        session_repo.sessions[session_id].upload_offset = 3
+        return await original_update(session_pk, expected_offset, upload_offset, expires_at)
+
+    session_repo.update_offset = racing_update
+    response = client.patch(f"/bucket/backup.zip/resumable/{session_id}", content=b"01234",
+                            headers={**PATCH_HEADERS, "Upload-Offset": "0"})
+
+    assert response.status_code == 409
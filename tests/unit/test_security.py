@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import security
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_TIME
+
+
+def observation_count(histogram, operation):
+    return next(sample.value for sample in histogram.collect()[0].samples
+                if sample.name.endswith("_count") and sample.labels["operation"] == operation)
+
+
+@pytest.mark.asyncio
+async def test_password_hash_round_trip():
+    hashed = await security.get_password_hash_async("secret-password")
+
+    assert await security.verify_password_async("secret-password", hashed) is True
+    assert await security.verify_password_async("wrong-password", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_password_operations_record_queue_time_and_duration():
+    hash_count = observation_count(PASSWORD_HASH_DURATION, "hash")
+    queue_count = observation_count(PASSWORD_HASH_QUEUE_TIME, "hash")
+
+    await security.get_password_hash_async("secret-password")
+
+    assert observation_count(PASSWORD_HASH_DURATION, "hash") == hash_count + 1
+    assert observation_count(PASSWORD_HASH_QUEUE_TIME, "hash") == queue_count + 1
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop(monkeypatch):
+    def slow_hash(password):
+        time.sleep(0.2)
+        return "hashed"
+
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    hashes = await asyncio.gather(*(security.get_password_hash_async("p") for _ in range(4)))
+    ticker_task.cancel()
+
+    assert hashes == ["hashed"] * 4
+    # четыре операции по 0.2 с в двух потоках: ~0.4 с, за это время loop продолжал работать
+    assert ticks >= 10
@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app import db
+from app.application import get_app
+from app.core import query_stats, slow_queries
+from app.core.config import settings
+from app.core.query_stats import instrument_engine
+from app.schemas.user_schema import UserResponse
+from app.services.auth_service import get_current_user
+
+
+@pytest.fixture(autouse=True)
+def empty_log():
+    slow_queries.clear_slow_queries()
+    yield
+    slow_queries.clear_slow_queries()
+
+
+def test_redacts_non_numeric_parameters():
+    assert slow_queries.redact_parameters(("secret-bucket", 42, None, b"xyz"), executemany=False) == \
+        ["<str len=13>", 42, None, "<bytes len=3>"]
+    assert slow_queries.redact_parameters([(1,), (2,)], executemany=True) == ["<2 parameter sets>"]
+
+
+def test_queries_over_threshold_are_captured(monkeypatch):
+    monkeypatch.setattr(query_stats, "SLOW_QUERY_THRESHOLD_SECONDS", 1e-9)
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT :name"), {"name": "private"})
+
+    entry = slow_queries.get_slow_queries()[0]
+    assert entry["statement"] == "SELECT ?"
+    assert entry["parameters"] == ["<str len=7>"]
+    assert entry["plan"] is None
+
+
+@pytest.mark.asyncio
+async def test_capture_schedules_one_explain_per_fingerprint(monkeypatch):
+    explain = AsyncMock()
+    monkeypatch.setattr(slow_queries, "explain_slow_query", explain)
+
+    slow_queries.capture_slow_query("SELECT object 1", "SELECT 1", (), False, 1.0)
+    slow_queries.capture_slow_query("SELECT object 1", "SELECT 1", (), False, 1.0)
+    await asyncio.sleep(0)
+
+    assert len(slow_queries.get_slow_queries()) == 2
+    explain.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_explain_does_not_count_towards_originating_request(monkeypatch):
+    seen = []
+
+    async def explain(entry, statement, parameters):
+        seen.append(query_stats._request_queries.get())
+
+    monkeypatch.setattr(slow_queries, "explain_slow_query", explain)
+
+    with query_stats.track_request_queries():
+        slow_queries.capture_slow_query("SELECT object 1", "SELECT 1", (), False, 1.0)
+    await asyncio.sleep(0)
+
+    assert seen == [None]
+
+
+def fake_engine(rows):
+    connection = MagicMock()
+    connection.exec_driver_sql = AsyncMock(side_effect=[None, [(row,) for row in rows]])
+    connection.rollback = AsyncMock()
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=connection)
+    context.__aexit__ = AsyncMock(return_value=False)
+    engine = MagicMock()
+    engine.connect.return_value = context
+    return engine, connection
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("statement, analyze", [
+    ("SELECT object.id FROM object WHERE object.owner_name = $1", True),
+    ("SELECT bucket.id FROM bucket WHERE bucket.id = $1 FOR UPDATE", False),
+    ("UPDATE bucket SET file_count = $1", False),
+])
+async def test_explain_analyzes_only_read_only_selects(monkeypatch, statement, analyze):
+    engine, connection = fake_engine(["Seq Scan on object", "Execution Time: 1.0 ms"])
+    monkeypatch.setattr(db, "engine", engine)
+    entry = {"fingerprint": "x", "plan": None, "plan_error": None}
+
+    await slow_queries.explain_slow_query(entry, statement, ["alice"])
+
+    explain_sql, parameters = connection.exec_driver_sql.await_args_list[1].args
+    assert explain_sql.startswith("EXPLAIN (ANALYZE, BUFFERS) ") is analyze
+    assert parameters == ("alice",)
+    assert entry["plan"] == "Seq Scan on object\nExecution Time: 1.0 ms"
+    connection.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_explain_plan_does_not_leak_parameter_values(monkeypatch):
+    engine, _ = fake_engine(["Index Scan using ix_object_owner on object",
+                             "  Index Cond: ((owner_name)::text = 'alice'::text)",
+                             "  Filter: (object_key ~~ 'it''s%'::text AND size > 10)"])
+    monkeypatch.setattr(db, "engine", engine)
+    entry = {"fingerprint": "x", "plan": None, "plan_error": None}
+
+    await slow_queries.explain_slow_query(entry, "SELECT object.id FROM object WHERE owner_name = $1", ["alice"])
+
+    assert "alice" not in entry["plan"] and "it''s" not in entry["plan"]
+    assert "'<redacted>'::text" in entry["plan"] and "size > 10" in entry["plan"]
+
+
+def admin_client(username):
+    app = get_app()
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(
+        id=1, username=username, email=f"{username}@example.com", is_active=True, created_at="2024-01-01T00:00:00")
+    return TestClient(app)
+
+
+def test_slow_query_endpoint_requires_admin(monkeypatch):
+    monkeypatch.setattr(settings.app, "admin_usernames", ["root"])
+    slow_queries.capture_slow_query("SELECT object 1", "SELECT 1", (), True, 0.75)
+
+    assert admin_client("alice").get("/admin/slow-queries").status_code == 403
+    response = admin_client("root").get("/admin/slow-queries")
+
+    assert response.status_code == 200
+    assert response.json()[0]["fingerprint"] == "SELECT object 1"
@@ -0,0 +1,125 @@
+import pathlib
+
+import pytest
+
+from app.core.config import settings
+from app.storage import (LocalStorageBackend, MemoryStorageBackend, create_storage_backend, delete_legacy_copy,
+                         object_storage_key, provider)
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def test_object_storage_key_is_stable_and_bucket_scoped():
+    key = object_storage_key("bucket", "a/b.txt")
+
+    assert key == object_storage_key("bucket", "a/b.txt")
+    assert key != object_storage_key("other", "a/b.txt")
+    assert len(key) == 64
+
+
+def test_create_storage_backend_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        create_storage_backend("s3")
+
+
+@pytest.mark.asyncio
+async def test_local_backend_uses_sharded_layout(tmp_path):
+    backend = LocalStorageBackend(tmp_path)
+    key = object_storage_key("bucket", "report.txt")
+
+    size = await backend.put(key, chunks(b"hello ", b"world"))
+
+    assert size == 11
+    assert (tmp_path / ".objects" / key[:2] / key[2:4] / key).read_bytes() == b"hello world"
+    assert (await backend.stat(key)).st_size == 11
+    assert await backend.get(key) == b"hello world"
+
+
+@pytest.mark.asyncio
+async def test_local_backend_delete_and_missing_object(tmp_path):
+    backend = LocalStorageBackend(tmp_path)
+    key = object_storage_key("bucket", "report.txt")
+    await backend.put(key, chunks(b"body"))
+
+    await backend.delete(key)
+    await backend.delete(key)
+
+    assert await backend.stat(key) is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_round_trip(tmp_path):
+    backend = MemoryStorageBackend()
+    staged = tmp_path / "upload.partial"
+    staged.write_bytes(b"staged")
+
+    await backend.put("a", chunks(b"x" * 10, b"y" * 5))
+    await backend.put_staged_file("b", staged)
+
+    assert (await backend.stat("a")).st_size == 15
+    assert [chunk async for chunk in backend.stream("a", chunk_size=4)] == [b"xxxx", b"xxxx", b"xxyy", b"yyy"]
+    assert await backend.get("b") == b"staged"
+    assert not staged.exists()
+    await backend.delete("a")
+    assert await backend.stat("a") is None
+    assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_local_backend_reads_legacy_absolute_paths(tmp_path):
+    backend = LocalStorageBackend(tmp_path)
+    legacy_path = tmp_path / "bucket" / "data.bin"
+    legacy_path.parent.mkdir()
+    legacy_path.write_bytes(b"old")
+
+    assert (await backend.stat(str(legacy_path))).st_size == 3
+    assert await backend.get(str(legacy_path)) == b"old"
+
+
+@pytest.mark.asyncio
+async def test_local_backend_with_relative_root_keeps_legacy_keys_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = LocalStorageBackend(pathlib.Path("storage"))
+    legacy_path = tmp_path / "storage" / "bucket" / "data.bin"
+    legacy_path.parent.mkdir(parents=True)
+    legacy_path.write_bytes(b"old")
+
+    legacy_key = backend.legacy_key("bucket", "data.bin")
+
+    assert legacy_key == str(legacy_path)
+    assert await backend.get(legacy_key) == b"old"
+    assert backend.path(object_storage_key("bucket", "data.bin")).is_absolute()
+
+
+@pytest.mark.asyncio
+async def test_delete_legacy_copy_keeps_object_under_storage_key(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(tmp_path)
+    monkeypatch.setattr(provider, "_backend", backend)
+    legacy_path = tmp_path / "bucket" / "data.bin"
+    legacy_path.parent.mkdir()
+    legacy_path.write_bytes(b"old")
+    key = object_storage_key("bucket", "data.bin")
+    await backend.put(key, chunks(b"new!"))
+
+    await delete_legacy_copy("bucket", "data.bin")
+    await delete_legacy_copy("bucket", "missing.bin")
+
+    assert not legacy_path.exists()
+    assert await backend.get(key) == b"new!"
+
+
+@pytest.mark.asyncio
+async def test_delete_legacy_copy_is_skipped_when_disabled(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(tmp_path)
+    monkeypatch.setattr(provider, "_backend", backend)
+    monkeypatch.setattr(settings.fileStorage, "delete_legacy_copies", False)
+    legacy_path = tmp_path / "bucket" / "data.bin"
+    legacy_path.parent.mkdir()
+    legacy_path.write_bytes(b"old")
+
+    await delete_legacy_copy("bucket", "data.bin")
+
+    assert legacy_path.exists()
@@ -0,0 +1,85 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import timing
+from app.core.metrics import REQUEST_STAGE_DURATION
+from app.core.responses import TimedJSONResponse
+from app.core.timing import RequestTimingMiddleware, format_server_timing, span, timed_methods
+
+
+def stage_observations(stage):
+    return sum(bucket.get() for bucket in REQUEST_STAGE_DURATION.labels(stage=stage)._buckets)
+
+
+@timed_methods("db")
+class FakeRepository:
+    async def get(self):
+        await asyncio.sleep(0)
+        return await self.nested()
+
+    async def nested(self):
+        return "value"
+
+
+def create_app(expose_header):
+    app = FastAPI(default_response_class=TimedJSONResponse)
+
+    @app.get("/item")
+    async def item():
+        with span("auth"):
+            pass
+        return {"value": await FakeRepository().get()}
+
+    app.add_middleware(RequestTimingMiddleware, expose_header=expose_header)
+    return app
+
+
+def test_span_is_noop_outside_request():
+    with span("db"):
+        pass
+
+    assert timing._request_timings.get() is None
+
+
+def test_nested_spans_of_same_stage_are_counted_once():
+    timings = {}
+    token = timing._request_timings.set(timings)
+    try:
+        with span("db"):
+            with span("db"):
+                pass
+            with span("fs"):
+                pass
+    finally:
+        timing._request_timings.reset(token)
+
+    assert set(timings) == {"db", "fs"}
+    assert timings["db"] >= timings["fs"]
+
+
+def test_server_timing_header_lists_stages():
+    client = TestClient(create_app(expose_header=True))
+    db_before = stage_observations("db")
+
+    response = client.get("/item")
+
+    assert response.json() == {"value": "value"}
+    entries = [entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")]
+    assert entries == ["auth", "db", "serialize", "total"]
+    assert stage_observations("db") == db_before + 1
+
+
+def test_server_timing_header_is_opt_in():
+    client = TestClient(create_app(expose_header=False))
+    serialize_before = stage_observations("serialize")
+
+    response = client.get("/item")
+
+    assert "server-timing" not in response.headers
+    assert stage_observations("serialize") == serialize_before + 1
+
+
+def test_format_server_timing_uses_milliseconds():
+    assert format_server_timing({"db": 0.0125}, 0.02) == "db;dur=12.50, total;dur=20.00"
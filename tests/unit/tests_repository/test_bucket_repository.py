@@ -12,7 +12,7 @@ from app.core.config import settings
 from app.models.bucket import Bucket
 from app.models.object import Object
 from app.models.user import User
-from app.repositories.bucket_repository import BucketRepository, count_files_recursive, get_directory_size
+from app.repositories.bucket_repository import BucketRepository
 from app.repositories.user_repository import UserRepository
 from app.schemas.bucket_schema import BucketCreate
 from app.schemas.object_schema import ObjectCreate
@@ -301,36 +301,3 @@ async def test_get_buckets_by_owner_exception(mock_session, mock_user_repo):
         await repo.get_buckets_by_owner("user1")
 
     mock_session.rollback.assert_called_once()
-
-def test_count_files_recursive():
-    # Arrange
-    with patch("os.walk") as mock_walk:
-        mock_walk.return_value = [
-            ("/root", ["dir1"], ["file1.txt", "file2.txt"]),
-            ("/root/dir1", [], ["file3.txt"]),
-        ]
-
-        # Act
-        count = count_files_recursive("/root")
-
-        # Assert
-        assert count == 3
-        mock_walk.assert_called_once_with("/root")
-
-def test_get_directory_size():
-    # Arrange
-    with patch("os.walk") as mock_walk, patch(
-        "os.path.getsize", side_effect=[100, 200, 300]
-    ) as mock_getsize:
-        mock_walk.return_value = [
-            ("/root", ["dir1"], ["file1.txt", "file2.txt"]),
-            ("/root/dir1", [], ["file3.txt"]),
-        ]
-
-        # Act
-        size = get_directory_size("/root")
-
-        # Assert
-        assert size == 600
-        mock_walk.assert_called_once_with("/root")
-        assert mock_getsize.call_count == 3
\ No newline at end of file